@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark de throughput HTTP do GitHubAPIClient contra um servidor stub local.
+
+Compara requisições/segundo de:
+  - baseline: `requests.get` de módulo (nova conexão TCP a cada chamada)
+  - pooled:   `GitHubAPIClient.session` (keep-alive com pool de conexões)
+
+O stub é HTTP puro em loopback, então o ganho medido aqui é só o do reuso de
+conexões TCP; contra api.github.com cada conexão nova ainda paga o handshake TLS.
+
+Uso:
+    python benchmark_http_session.py --requests 2000 --workers 5
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.github_api import GitHubAPIClient
+
+
+class StubGitHubHandler(BaseHTTPRequestHandler):
+    """Responde como a API REST do GitHub, mantendo a conexão aberta (HTTP/1.1)."""
+
+    protocol_version = "HTTP/1.1"
+    # Buffer headers + body into a single write so keep-alive connections are
+    # not penalised by Nagle/delayed-ACK stalls on the loopback interface.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    body = json.dumps({"sha": "0" * 40, "stats": {"additions": 1, "deletions": 1}}).encode()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.send_header("X-RateLimit-Remaining", "5000")
+        self.send_header("X-RateLimit-Limit", "5000")
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_benchmark(label: str, fetch, total: int, workers: int) -> float:
+    """Executa `total` chamadas de `fetch` com `workers` threads e retorna req/s."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(fetch, range(total)))
+    elapsed = time.perf_counter() - start
+    rps = total / elapsed if elapsed > 0 else 0.0
+    print(f"{label:<10} {total} requests in {elapsed:.2f}s -> {rps:,.0f} req/s")
+    return rps
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pooled vs. unpooled HTTP for GitHubAPIClient')
+    parser.add_argument('--requests', type=int, default=2000, help='Number of requests per scenario (default: 2000)')
+    parser.add_argument('--workers', type=int, default=5, help='Concurrent workers / pool size (default: 5)')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGitHubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/repos/owner/repo/commits"
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        client = GitHubAPIClient("benchmark-token", cache_dir=cache_dir, pool_size=args.workers)
+
+        def fetch_unpooled(i: int):
+            return requests.get(f"{base_url}/{i}", headers=client.headers, timeout=35).json()
+
+        def fetch_pooled(i: int):
+            return client.get_with_cache(f"{base_url}/{i}", use_cache=False, silent=True)
+
+        print(f"Stub server: {base_url} | workers: {args.workers}")
+        before = run_benchmark("before", fetch_unpooled, args.requests, args.workers)
+        after = run_benchmark("after", fetch_pooled, args.requests, args.workers)
+        client.close()
+
+    server.shutdown()
+    if before > 0:
+        print(f"Speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ from pathlib import Path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from bronze.repository_structure import extract_repository_structure
-from utils.github_api import load_json_data, GitHubAPIClient
+from utils.github_api import load_json_data, GitHubAPIClient, OrganizationConfig
 
 def main():
     parser = argparse.ArgumentParser(description='Extract repository structures only')
@@ -49,40 +49,19 @@ def main():
     # Filter out metadata objects
     repositories = [r for r in repos_data if 'name' in r and 'owner' in r]
     total = len(repositories)
+    owner = repositories[0].get('owner', {}).get('login', 'unb-mds') if repositories else 'unb-mds'
     
-    print(f"📊 Found {total} repositories to process\n")
+    print(f"📊 Found {total} repositories to process")
+    print("   Existing structures are refreshed only when the default branch head moved\n")
     
-    success_count = 0
-    error_count = 0
+    try:
+        structure_files = extract_repository_structure(github_api, OrganizationConfig(owner), use_cache=True)
+    except Exception as e:
+        print(f"  ❌ Error: {str(e)}")
+        structure_files = []
     
-    for idx, repo in enumerate(repositories, 1):
-        repo_name = repo.get('name')
-        owner = repo.get('owner', {}).get('login', 'unb-mds')
-        
-        # Check if structure already exists
-        expected_file = f"data/bronze/structure_{repo_name}.json"
-        if os.path.exists(expected_file):
-            print(f"[{idx}/{total}] ⏭️  Skipping {repo_name} (already exists)")
-            success_count += 1
-            continue
-        
-        print(f"[{idx}/{total}] Extracting structure: {repo_name}...")
-        
-        try:
-            structure_file = extract_repository_structure(github_api, owner, repo_name)
-            
-            if structure_file and os.path.exists(structure_file):
-                print(f"  ✅ Structure saved: {structure_file}")
-                success_count += 1
-            else:
-                print(f"  ⚠️  Structure extraction returned None or file not found")
-                error_count += 1
-                
-        except Exception as e:
-            print(f"  ❌ Error: {str(e)}")
-            error_count += 1
-        
-        print()
+    success_count = len(structure_files)
+    error_count = total - success_count
     
     print("=" * 60)
     print(f"✅ Structure extraction completed!")
@@ -1,6 +1,15 @@
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from utils.github_api import GitHubAPIClient, OrganizationConfig, save_json_data, load_json_data
+from utils.extraction_state import DEFAULT_STATE_DIR, ExtractionState, load_records, merge_records
+from utils.scheduler import RepoScheduler
+
+
+def _rest_commit_date(commit: Dict[str, Any]) -> Optional[str]:
+    """Committer date of a REST commit (what `since` filters on), author date as fallback."""
+    details = commit.get('commit') or {}
+    return (details.get('committer') or {}).get('date') or (details.get('author') or {}).get('date')
+
 
 def extract_commits(
     client: GitHubAPIClient,
@@ -14,7 +23,28 @@ def extract_commits(
     include_active_branches: bool = False,
     active_days: int = 30,
     time_chunks: int = 3,
+    resume: bool = False,
+    checkpoint_dir: Optional[str] = None,
+    incremental: bool = False,
+    state_dir: str = DEFAULT_STATE_DIR,
+    scheduler: Optional[RepoScheduler] = None,
 ) -> List[str]:
+    """
+    Extract commits of every filtered repository to data/bronze/commits_{repo}.json
+    and commits_all.json.
+
+    With resume=True (GraphQL method) each repository's history walk is checkpointed
+    after every page in checkpoint_dir (default: <client cache dir>/checkpoints), and a
+    rerun after a crash continues from the saved position instead of the first page.
+
+    With incremental=True the newest commit (SHA and committedDate) of every repository
+    and branch is kept in <state_dir>/commits.json. Later runs only ask for commits newer
+    than that mark, stop at the first SHA already in commits_{repo}.json, and merge the
+    new commits into the existing files.
+
+    Repositories run as tasks of `scheduler` (default: one at a time, in order); the
+    batched GraphQL prefetch still happens up front for all of them.
+    """
     
     # Load filtered repositories
     filtered_repos = load_json_data("data/bronze/repositories_filtered.json")
@@ -29,11 +59,59 @@ def extract_commits(
     if isinstance(filtered_repos, list) and len(filtered_repos) > 0 and isinstance(filtered_repos[0], dict) and '_metadata' in filtered_repos[0]:
         filtered_repos = filtered_repos[1:]
     
+    # Incremental: per-repository high-water marks ({branch: {sha, committed_date}}, "" = default
+    # branch). A mark is only trusted while the commits file it describes still exists.
+    state: Optional[ExtractionState] = None
+    if incremental:
+        if until:
+            print("[INCREMENTAL] --until given: running a full extraction of the window instead")
+        else:
+            state = ExtractionState(os.path.join(state_dir, "commits.json"))
+    
+    def repo_marks(repo: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+        if state is None or not os.path.exists(f"data/bronze/commits_{repo.get('name', 'unknown')}.json"):
+            return {}
+        return state.get(repo.get('full_name') or repo.get('name', 'unknown')) or {}
+    
+    # GraphQL: fetch small repositories together, several per request (aliased queries).
+    # Repositories whose part fails or whose history is longer than a few pages (None)
+    # go through the per-repository path below (time splitting, REST fallback, checkpoints).
+    batched_branches: Dict[Tuple[str, str], Optional[List[str]]] = {}
+    batched_history: Dict[Tuple[str, str], Optional[List[Dict[str, Any]]]] = {}
+    if method.lower() == "graphql":
+        repo_keys = [
+            tuple(repo['full_name'].split('/', 1))
+            for repo in filtered_repos
+            if isinstance(repo, dict) and '/' in (repo.get('full_name') or '')
+        ]
+        if repo_keys:
+            if include_active_branches:
+                print(f"Finding active unmerged branches (last {active_days} days) for {len(repo_keys)} repositories...")
+                batched_branches = client.get_active_unmerged_branches_batch(repo_keys, days=active_days, use_cache=use_cache)
+            since_by_repo = {}
+            for repo in filtered_repos:
+                default_mark = repo_marks(repo).get("") if isinstance(repo, dict) else None
+                if default_mark and '/' in (repo.get('full_name') or ''):
+                    since_by_repo[tuple(repo['full_name'].split('/', 1))] = max(since or '', default_mark['committed_date'])
+            batched_history = client.graphql_commit_history_batch(
+                repo_keys,
+                page_size=page_size,
+                max_commits=max_commits_per_repo,
+                since=since,
+                until=until,
+                use_cache=use_cache,
+                max_pages=3,
+                since_by_repo=since_by_repo or None,
+            )
+    if resume and checkpoint_dir is None:
+        checkpoint_dir = os.path.join(client.cache_dir, "checkpoints")
+
     # Extract commits from each repository
-    for repo in filtered_repos:
+    def extract_repo(repo: Any) -> Optional[Dict[str, Any]]:
+        """Extract and save one repository's commits (runs on a scheduler worker)."""
         if not repo or not isinstance(repo, dict):
             print(f"Skipping invalid repo entry: {repo}")
-            continue
+            return None
             
         repo_name = repo.get('name', 'unknown')
         full_name = repo.get('full_name', repo_name)
@@ -45,36 +123,61 @@ def extract_commits(
         # Determine which branches to extract
         branches_to_extract = None
         if include_active_branches and method.lower() == "graphql":
-            print(f"  Finding active unmerged branches (last {active_days} days)...")
-            branches_to_extract = client.get_active_unmerged_branches(
-                owner=owner,
-                repo=name_only,
-                days=active_days,
-                use_cache=use_cache,
-            )
+            branches_to_extract = batched_branches.get((owner, name_only))
+            if not isinstance(branches_to_extract, list):
+                print(f"  Finding active unmerged branches (last {active_days} days)...")
+                branches_to_extract = client.get_active_unmerged_branches(
+                    owner=owner,
+                    repo=name_only,
+                    days=active_days,
+                    use_cache=use_cache,
+                )
             if branches_to_extract:
                 print(f"  Found {len(branches_to_extract)} unmerged branches to extract")
             else:
                 print(f"  No active unmerged branches found")
         
+        # Incremental: start at the high-water mark and skip commits already extracted.
+        # The mark's time filter is used only when every branch walked has a mark;
+        # otherwise the walk relies on stopping at known SHAs.
+        marks = repo_marks(repo)
+        repo_file = f"data/bronze/commits_{repo_name}.json"
+        existing = load_records(repo_file) if marks else []
+        known_shas = {c.get('sha') for c in existing if c.get('sha')}
+        walked_branches = [""] + (branches_to_extract or [])
+        repo_since = since
+        if marks and all(branch in marks for branch in walked_branches):
+            repo_since = max(since or '', min(marks[branch]['committed_date'] for branch in walked_branches))
+            print(f"  [INCREMENTAL] Fetching commits since {repo_since} ({len(existing)} already extracted)")
+        heads: Dict[str, Dict[str, Any]] = {}
+        
         # Choose extraction method
         data_commits: List[Dict[str, Any]] = []
         if method.lower() == "graphql":
             if not owner:
                 print(f"[WARN] Skipping {full_name}: cannot determine owner/name for GraphQL")
-                continue
-            nodes, meta = client.graphql_commit_history(
-                owner=owner,
-                repo=name_only,
-                branches=branches_to_extract,
-                split_large_extractions=True,  # Enable time-based splitting
-                time_chunks=3,  # Split into 3 time periods
-                page_size=page_size,
-                max_commits=max_commits_per_repo,
-                since=since,
-                until=until,
-                use_cache=use_cache,
-            )
+                return None
+            nodes = batched_history.get((owner, name_only))
+            if branches_to_extract or not isinstance(nodes, list):
+                nodes, meta = client.graphql_commit_history(
+                    owner=owner,
+                    repo=name_only,
+                    branches=branches_to_extract,
+                    split_large_extractions=not marks,  # Time-based splitting (not needed past a mark)
+                    time_chunks=time_chunks,  # Initial slices, bisected further where commits are dense
+                    page_size=page_size,
+                    max_commits=max_commits_per_repo,
+                    since=repo_since,
+                    until=until,
+                    use_cache=use_cache,
+                    checkpoint_path=os.path.join(checkpoint_dir, f"commits_{repo_name}.jsonl") if resume else None,
+                    stop_at=known_shas or None,
+                    heads=heads,
+                )
+            else:
+                nodes = [n for n in nodes if n.get('oid') not in known_shas]
+                if nodes:
+                    heads[""] = max(nodes, key=lambda n: n.get('committedDate') or '')
 
             for n in nodes:
                 # Map GraphQL fields to a REST-like structure to preserve downstream compatibility
@@ -104,7 +207,9 @@ def extract_commits(
                     'repo_name': repo_name,
                 })
 
-            if not nodes:
+            if not nodes and marks:
+                print(f"No new commits in {repo_name}")
+            elif not nodes:
                 print(f"[WARN] GraphQL returned no commits for {repo_name}. Falling back to REST.")
                 # Fallback to REST list + details to avoid data gaps
                 commits_base = f"https://api.github.com/repos/{full_name}/commits"
@@ -115,27 +220,30 @@ def extract_commits(
                         sep = '&'
                     if until:
                         commits_base = f"{commits_base}{sep}until={until}"
-                commits = client.get_paginated(commits_base, use_cache=use_cache, per_page=100)
+                commits = client.get_paginated(commits_base, use_cache=use_cache, per_page=100, parallel=True)
+                if commits and state is not None:
+                    newest = max(commits, key=lambda c: _rest_commit_date(c) or '')
+                    heads[""] = {'oid': newest.get('sha'), 'committedDate': _rest_commit_date(newest)}
+                # Stats for every SHA in batched GraphQL lookups, REST only for the ones that fail
+                commit_stats = client.get_commit_stats(
+                    owner, name_only, [c.get('sha') for c in commits or []], use_cache=use_cache
+                )
                 for commit in commits or []:
-                    sha = commit.get('sha')
-                    additions = None
-                    deletions = None
-                    total_changes = None
-                    if sha:
-                        details_url = f"https://api.github.com/repos/{full_name}/commits/{sha}"
-                        details = client.get_with_cache(details_url, use_cache)
-                        if details and isinstance(details, dict):
-                            stats = details.get('stats') or {}
-                            additions = stats.get('additions')
-                            deletions = stats.get('deletions')
-                            total_changes = stats.get('total')
+                    stats = commit_stats.get(commit.get('sha')) or {}
+                    additions = stats.get('additions')
+                    deletions = stats.get('deletions')
+                    total_changes = stats.get('total')
                     
                     # Ensure commit.commit.author.login is populated from commit.author.login if available
                     commit_data = {**commit}
                     if 'commit' in commit_data and 'author' in commit_data['commit']:
                         # If commit.author.login exists at root level, copy it to commit.commit.author.login
                         if 'author' in commit_data and isinstance(commit_data['author'], dict) and 'login' in commit_data['author']:
-                            commit_data['commit']['author']['login'] = commit_data['author']['login']
+                            # Copy the nested dicts instead of editing them: responses are shared with the client cache
+                            commit_data['commit'] = {
+                                **commit_data['commit'],
+                                'author': {**commit_data['commit']['author'], 'login': commit_data['author']['login']},
+                            }
                     
                     data_commits.append({
                         **commit_data,
@@ -148,38 +256,45 @@ def extract_commits(
             else:
                 print(f"Found {len(nodes)} commits in {repo_name} via GraphQL")
         else:
-            # REST fallback (existing behavior): list commits, then fetch details per commit to get stats
+            # REST fallback (existing behavior): list commits, then fetch their stats in batches
             commits_base = f"https://api.github.com/repos/{full_name}/commits"
             # Apply since/until filters when available to reduce pages
-            if since or until:
+            if repo_since or until:
                 sep = '&' if ('?' in commits_base) else '?'
-                if since:
-                    commits_base = f"{commits_base}{sep}since={since}"
+                if repo_since:
+                    commits_base = f"{commits_base}{sep}since={repo_since}"
                     sep = '&'
                 if until:
                     commits_base = f"{commits_base}{sep}until={until}"
-            commits = client.get_paginated(commits_base, use_cache=use_cache, per_page=page_size)
+            commits = client.get_paginated(commits_base, use_cache=use_cache, per_page=page_size, parallel=True)
+            if commits and known_shas:
+                commits = [c for c in commits if c.get('sha') not in known_shas]
+                if not commits:
+                    print(f"No new commits in {repo_name}")
+            if commits and state is not None:
+                newest = max(commits, key=lambda c: _rest_commit_date(c) or '')
+                heads[""] = {'oid': newest.get('sha'), 'committedDate': _rest_commit_date(newest)}
             if commits:
+                # Stats for every SHA in batched GraphQL lookups, REST only for the ones that fail
+                commit_stats = client.get_commit_stats(
+                    owner, name_only, [c.get('sha') for c in commits], use_cache=use_cache
+                )
                 for commit in commits:
-                    sha = commit.get('sha')
-                    additions = None
-                    deletions = None
-                    total_changes = None
-                    if sha:
-                        details_url = f"https://api.github.com/repos/{full_name}/commits/{sha}"
-                        details = client.get_with_cache(details_url, use_cache)
-                        if details and isinstance(details, dict):
-                            stats = details.get('stats') or {}
-                            additions = stats.get('additions')
-                            deletions = stats.get('deletions')
-                            total_changes = stats.get('total')
+                    stats = commit_stats.get(commit.get('sha')) or {}
+                    additions = stats.get('additions')
+                    deletions = stats.get('deletions')
+                    total_changes = stats.get('total')
                     
                     # Ensure commit.commit.author.login is populated from commit.author.login if available
                     commit_data = {**commit}
                     if 'commit' in commit_data and 'author' in commit_data['commit']:
                         # If commit.author.login exists at root level, copy it to commit.commit.author.login
                         if 'author' in commit_data and isinstance(commit_data['author'], dict) and 'login' in commit_data['author']:
-                            commit_data['commit']['author']['login'] = commit_data['author']['login']
+                            # Copy the nested dicts instead of editing them: responses are shared with the client cache
+                            commit_data['commit'] = {
+                                **commit_data['commit'],
+                                'author': {**commit_data['commit']['author'], 'login': commit_data['author']['login']},
+                            }
                     
                     # Merge original commit with stats and repo context
                     data_commits.append({
@@ -192,16 +307,46 @@ def extract_commits(
 
                 print(f"Found {len(commits)} commits in {repo_name} via REST")
 
-        if data_commits:
-            # Add to global list
-            all_commits.extend(data_commits)
+        result = {'full_name': full_name, 'commits': data_commits, 'file': None, 'marks': None}
+        if state is not None:
+            # Merge the new commits into the ones already extracted and move the marks forward
+            new_count = len(data_commits)
+            data_commits = merge_records(existing, data_commits, key='sha')
+            updated_marks = dict(marks)
+            for branch, node in heads.items():
+                if node.get('oid') and node.get('committedDate') and (
+                    branch not in updated_marks or node['committedDate'] >= updated_marks[branch]['committed_date']
+                ):
+                    updated_marks[branch] = {'sha': node['oid'], 'committed_date': node['committedDate']}
+            result.update(commits=data_commits, marks=updated_marks or None)
+            if existing and not new_count:
+                # Unchanged: keep the file as it is
+                result['file'] = repo_file
+                return result
+            if existing:
+                print(f"  [INCREMENTAL] {new_count} new commits merged into {len(existing)} existing")
 
+        if data_commits:
             # Save per-repo commits
-            repo_commits_file = save_json_data(
+            result['file'] = save_json_data(
                 data_commits,
                 f"data/bronze/commits_{repo_name}.json"
             )
-            generated_files.append(repo_commits_file)
+        return result
+
+    if scheduler is None:
+        scheduler = RepoScheduler(max_workers=1)
+
+    # Repositories are extracted concurrently; aggregation and state updates stay on this thread
+    for result in scheduler.map(extract_repo, filtered_repos):
+        if result is None:
+            continue
+        all_commits.extend(result['commits'])
+        if result['file']:
+            generated_files.append(result['file'])
+        if state is not None and result['marks']:
+            state.set(result['full_name'], result['marks'])
+            state.save()
     
     # Save all commits (always save, even if empty, to ensure files exist)
     all_commits_file = save_json_data(
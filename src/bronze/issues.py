@@ -1,9 +1,19 @@
 
 import os
-from typing import List
-from utils.github_api import GitHubAPIClient, OrganizationConfig, save_json_data, load_json_data
+from contextlib import ExitStack
+from typing import Any, Dict, List, Optional, Tuple
+from utils.github_api import GitHubAPIClient, OrganizationConfig, JsonSpool, save_json_data, load_json_data
+from utils.extraction_state import DEFAULT_STATE_DIR, ExtractionState, load_records, merge_records
+from utils.scheduler import RepoScheduler
 
-def extract_issues(client: GitHubAPIClient, config: OrganizationConfig, use_cache: bool = True) -> List[str]:
+def extract_issues(
+    client: GitHubAPIClient,
+    config: OrganizationConfig,
+    use_cache: bool = True,
+    incremental: bool = False,
+    state_dir: str = DEFAULT_STATE_DIR,
+    scheduler: Optional[RepoScheduler] = None,
+) -> List[str]:
     """
     Extract issues, pull requests, and issue events from GitHub repositories.
     
@@ -14,6 +24,17 @@ def extract_issues(client: GitHubAPIClient, config: OrganizationConfig, use_cach
     
     The Silver layer only uses these specific fields, so filtering at Bronze layer
     prevents unnecessary data storage and processing overhead.
+    
+    Pages are streamed with iter_paginated and records are spooled to temporary
+    files (JsonSpool), so peak memory stays around one page regardless of how many
+    issues and events the organization has.
+    
+    With incremental=True the latest `updated_at` of the issues/PRs and the newest event
+    id of every repository are kept in <state_dir>/issues.json. Later runs ask only for
+    issues updated since that mark (`?since=`), stop paging events at the first known
+    event, and upsert the changes by `id` into the existing per-repo and `_all` files.
+    
+    Repositories run as tasks of `scheduler` (default: one at a time, in order).
     """
     # Load filtered repositories
     filtered_repos = load_json_data("data/bronze/repositories_filtered.json")
@@ -22,66 +43,87 @@ def extract_issues(client: GitHubAPIClient, config: OrganizationConfig, use_cach
         return []
     
     generated_files = []
-    all_issues = []
-    all_prs = []
-    all_issue_events = []
     
     # Skip metadata if present
     if isinstance(filtered_repos, list) and len(filtered_repos) > 0 and isinstance(filtered_repos[0], dict) and '_metadata' in filtered_repos[0]:
         filtered_repos = filtered_repos[1:]
     
-    # Extract issues from each repository
-    for repo in filtered_repos:
+    # Incremental: per-repository marks ({updated_at, event_id}). Each one is only trusted
+    # while the files it describes still exist.
+    state: Optional[ExtractionState] = None
+    if incremental:
+        state = ExtractionState(os.path.join(state_dir, "issues.json"))
+    
+    def save_repo_records(records: Any, existing: List[Dict[str, Any]], filepath: str) -> Tuple[Any, Optional[str], int]:
+        """Save one per-repo file, upserted into `existing`; returns (records, file, new/changed count)."""
+        new_count = len(records)
+        if existing:
+            if not new_count:
+                # Unchanged: keep the file as it is
+                return existing, filepath, 0
+            records = merge_records(existing, records, key='id')
+        if records:
+            return records, save_json_data(records, filepath), new_count
+        return records, None, new_count
+    
+    def extract_repo(repo: Any) -> Optional[Dict[str, Any]]:
+        """Fetch and save one repository's issues, PRs and events (runs on a scheduler worker)."""
         if not repo or not isinstance(repo, dict):
             print(f"Skipping invalid repo entry: {repo}")
-            continue
+            return None
             
         repo_name = repo.get('name', 'unknown')
         full_name = repo.get('full_name', repo_name)
         
         print(f"Processing issues for: {repo_name}")
         
-        # Get issues (includes PRs)
-        issues_base = f"https://api.github.com/repos/{full_name}/issues?state=all"
-        issues = client.get_paginated(issues_base, use_cache=use_cache, per_page=300)
+        issues_path = f"data/bronze/issues_{repo_name}.json"
+        prs_path = f"data/bronze/prs_{repo_name}.json"
+        events_path = f"data/bronze/issue_events_{repo_name}.json"
+        marks: Dict[str, Any] = (state.get(full_name) or {}) if state is not None else {}
+        updated_since = marks.get('updated_at') if (os.path.exists(issues_path) or os.path.exists(prs_path)) else None
+        known_events = (
+            {e.get('id') for e in load_records(events_path)}
+            if marks.get('event_id') is not None and os.path.exists(events_path) else set()
+        )
         
-        if issues:
-            # Separate issues from PRs
-            repo_issues = []
-            repo_prs = []
+        # Get issues (includes PRs), separating issues from PRs as pages stream in
+        issues_base = f"https://api.github.com/repos/{full_name}/issues?state=all"
+        if updated_since:
+            # Only issues/PRs created or changed since the last run (updated_at >= since)
+            issues_base = f"{issues_base}&since={updated_since}"
+        # Spools are closed here if the repository fails, by the caller otherwise
+        with ExitStack() as spools:
+            repo_issues = spools.enter_context(JsonSpool())
+            repo_prs = spools.enter_context(JsonSpool())
+            latest_update = updated_since
             
-            for issue in issues:
+            for issue in client.iter_paginated(issues_base, use_cache=use_cache, per_page=300):
+                record = {**issue, 'repo_name': repo_name}
+                if issue.get('updated_at') and (latest_update is None or issue['updated_at'] > latest_update):
+                    latest_update = issue['updated_at']
                 if issue.get('pull_request'):
-                    repo_prs.append({**issue, 'repo_name': repo_name})
+                    repo_prs.append(record)
                 else:
-                    repo_issues.append({**issue, 'repo_name': repo_name})
-            
-            all_issues.extend(repo_issues)
-            all_prs.extend(repo_prs)
+                    repo_issues.append(record)
             
             # Save per-repo files
-            if repo_issues:
-                repo_issues_file = save_json_data(
-                    repo_issues,
-                    f"data/bronze/issues_{repo_name}.json"
-                )
-                generated_files.append(repo_issues_file)
+            existing_issues = load_records(issues_path) if updated_since else []
+            existing_prs = load_records(prs_path) if updated_since else []
+            issues, issues_file, changed = save_repo_records(repo_issues, existing_issues, issues_path)
+            prs, prs_file, changed_prs = save_repo_records(repo_prs, existing_prs, prs_path)
+            if updated_since:
+                print(f"  [INCREMENTAL] {changed + changed_prs} issues/PRs updated since {updated_since}")
             
-            if repo_prs:
-                repo_prs_file = save_json_data(
-                    repo_prs,
-                    f"data/bronze/prs_{repo_name}.json"
-                )
-                generated_files.append(repo_prs_file)
-        
-        # Get issue events (filter to keep only essential fields to reduce file size)
-        events_base = f"https://api.github.com/repos/{full_name}/issues/events"
-        events = client.get_paginated(events_base, use_cache=use_cache, per_page=300)
-        
-        if events:
-            # Extract only essential fields to drastically reduce file size
-            repo_events = []
-            for event in events:
+            # Get issue events (filter to keep only essential fields to reduce file size)
+            events_base = f"https://api.github.com/repos/{full_name}/issues/events"
+            repo_events = spools.enter_context(JsonSpool())
+            
+            # Events are listed newest first: once a known id shows up, the rest is already saved
+            for event in client.iter_paginated(events_base, use_cache=use_cache, per_page=300):
+                if event.get('id') in known_events:
+                    break
+                # Extract only essential fields to drastically reduce file size
                 filtered_event = {
                     'id': event.get('id'),
                     'event': event.get('event'),
@@ -96,34 +138,60 @@ def extract_issues(client: GitHubAPIClient, config: OrganizationConfig, use_cach
                 }
                 repo_events.append(filtered_event)
             
-            all_issue_events.extend(repo_events)
+            existing_events = load_records(events_path) if known_events else []
+            events, events_file, new_events = save_repo_records(repo_events, existing_events, events_path)
+            if known_events:
+                print(f"  [INCREMENTAL] {new_events} new events")
             
-            # Save per-repo events
-            events_file = save_json_data(
-                repo_events,
-                f"data/bronze/issue_events_{repo_name}.json"
-            )
-            generated_files.append(events_file)
-    
-    # Save aggregated files (always save, even if empty, to ensure files exist)
-    all_issues_file = save_json_data(
-        all_issues,
-        "data/bronze/issues_all.json"
-    )
-    generated_files.append(all_issues_file)
-    
-    all_prs_file = save_json_data(
-        all_prs,
-        "data/bronze/prs_all.json"
-    )
-    generated_files.append(all_prs_file)
+            newest_event = repo_events[0].get('id') if repo_events else marks.get('event_id')
+            return {
+                'full_name': full_name,
+                'issues': issues,
+                'prs': prs,
+                'events': events,
+                'files': [f for f in (issues_file, prs_file, events_file) if f],
+                'marks': {'updated_at': latest_update, 'event_id': newest_event} if (latest_update or newest_event is not None) else None,
+                # The records may still live in the spools: the caller closes them once aggregated
+                'spools': spools.pop_all(),
+            }
     
-    all_events_file = save_json_data(
-        all_issue_events,
-        "data/bronze/issue_events_all.json"
-    )
-    generated_files.append(all_events_file)
+    if scheduler is None:
+        scheduler = RepoScheduler(max_workers=1)
     
-    print(f"Extracted {len(all_issues)} issues, {len(all_prs)} PRs, {len(all_issue_events)} events")
+    with JsonSpool() as all_issues, JsonSpool() as all_prs, JsonSpool() as all_issue_events:
+        # Repositories are fetched concurrently; aggregation and state updates stay on this thread.
+        # Each pending result keeps its spools open, so only a window of them is in flight.
+        for result in scheduler.map(extract_repo, filtered_repos, window=2 * scheduler.max_workers):
+            if result is None:
+                continue
+            with result['spools']:
+                all_issues.extend(result['issues'])
+                all_prs.extend(result['prs'])
+                all_issue_events.extend(result['events'])
+            generated_files.extend(result['files'])
+            if state is not None and result['marks']:
+                state.set(result['full_name'], result['marks'])
+                state.save()
+        
+        # Save aggregated files (always save, even if empty, to ensure files exist)
+        all_issues_file = save_json_data(
+            all_issues,
+            "data/bronze/issues_all.json"
+        )
+        generated_files.append(all_issues_file)
+        
+        all_prs_file = save_json_data(
+            all_prs,
+            "data/bronze/prs_all.json"
+        )
+        generated_files.append(all_prs_file)
+        
+        all_events_file = save_json_data(
+            all_issue_events,
+            "data/bronze/issue_events_all.json"
+        )
+        generated_files.append(all_events_file)
+        
+        print(f"Extracted {len(all_issues)} issues, {len(all_prs)} PRs, {len(all_issue_events)} events")
     
     return generated_files
\ No newline at end of file
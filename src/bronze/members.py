@@ -1,10 +1,68 @@
 #!/usr/bin/env python3
 
 import os
-from typing import List
+import json
+from functools import reduce
+from typing import Any, Dict, List, Optional
 from utils.github_api import GitHubAPIClient, OrganizationConfig, save_json_data
+from utils.scheduler import RepoScheduler, fanout_scheduler
 
-def extract_members(client: GitHubAPIClient, config: OrganizationConfig, use_cache: bool = True) -> List[str]:
+MENTIONABLE_USERS_FIELDS = (
+    "mentionableUsers(first: 100{after}) {{ "
+    "pageInfo {{ hasNextPage endCursor }} nodes {{ login avatarUrl url }} }}"
+)
+
+def _merge_contributors(merged: Dict[str, Dict[str, Any]], partial: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Reduce step: add one repository's contributors into the running totals."""
+    for login, details in partial.items():
+        if login in merged:
+            # Accumulate contributions from multiple repos
+            merged[login]['contributions_total'] += details['contributions_total']
+        else:
+            merged[login] = dict(details)
+    return merged
+
+def _fetch_mentionable_users(client: GitHubAPIClient, repos: List[Dict[str, Any]], use_cache: bool) -> Dict[str, Dict[str, Any]]:
+    """
+    Users who can be mentioned in each repository (collaborators and contributors,
+    including the ones without commits), many repositories per GraphQL request;
+    repositories with more pages go into the next round with their own cursor.
+    """
+    users: Dict[str, Dict[str, Any]] = {}
+    names = {tuple(repo['full_name'].split('/', 1)): repo.get('name') for repo in repos if '/' in repo['full_name']}
+    cursors: Dict[Any, Optional[str]] = {key: None for key in names}
+    while cursors:
+        def fields(key):
+            cursor = cursors.get(key)
+            return MENTIONABLE_USERS_FIELDS.format(after=f", after: {json.dumps(cursor)}" if cursor else "")
+        results = client.graphql_repositories(list(cursors), fields, node_cost=100, use_cache=use_cache)
+        next_cursors: Dict[Any, Optional[str]] = {}
+        for key, data in results.items():
+            connection = (data or {}).get('mentionableUsers') or {}
+            for node in connection.get('nodes') or []:
+                if node and node.get('login') and node['login'] not in users:
+                    users[node['login']] = {
+                        'login': node['login'],
+                        'type': 'User',
+                        'contributions_total': 0,
+                        'avatar_url': node.get('avatarUrl'),
+                        'html_url': node.get('url'),
+                        'data_source': 'mentionable_users',
+                        'discovered_from_repo': names.get(key)
+                    }
+            page_info = connection.get('pageInfo') or {}
+            if page_info.get('hasNextPage') and page_info.get('endCursor'):
+                next_cursors[key] = page_info['endCursor']
+        cursors = next_cursors
+    return users
+
+def extract_members(
+    client: GitHubAPIClient,
+    config: OrganizationConfig,
+    use_cache: bool = True,
+    scheduler: Optional[RepoScheduler] = None,
+    include_mentionable: bool = False,
+) -> List[str]:
     
     members_url = f"https://api.github.com/orgs/{config.org_name}/members"
     raw_members = client.get_with_cache(members_url, use_cache)
@@ -27,32 +85,40 @@ def extract_members(client: GitHubAPIClient, config: OrganizationConfig, use_cac
                 repos_data = repos_data[1:]
             
            
-            contributors_set = set()
-            contributor_details = {}
+            def fetch_contributors(repo):
+                # Every page (per_page=100, pages in parallel): the first page alone truncates big repos
+                contrib_url = f"https://api.github.com/repos/{repo['full_name']}/contributors"
+                repo_contributors = client.get_paginated(contrib_url, use_cache=use_cache, per_page=100, parallel=True)
+                partial = {}
+                if repo_contributors and isinstance(repo_contributors, list):
+                    for contrib in repo_contributors:
+                        if contrib and isinstance(contrib, dict) and contrib.get('login') and contrib['login'] not in partial:
+                            # Store contributor details (contributions count, etc.)
+                            partial[contrib['login']] = {
+                                'login': contrib['login'],
+                                'type': contrib.get('type', 'User'),
+                                'contributions_total': contrib.get('contributions', 0),
+                                'avatar_url': contrib.get('avatar_url'),
+                                'html_url': contrib.get('html_url'),
+                                'data_source': 'contributors_api',
+                                'discovered_from_repo': repo.get('name')
+                            }
+                return partial
+            
+            repos_data = [repo for repo in repos_data if repo and isinstance(repo, dict) and repo.get('full_name')]
+            # Contributors of every repository are requested concurrently, up to the client's
+            # pool size whatever --workers is; each worker returns its own partial counts,
+            # reduced here in repository order
+            with fanout_scheduler(scheduler, client.pool_size) as contributors_scheduler:
+                partials = contributors_scheduler.map(fetch_contributors, repos_data)
+                contributor_details = reduce(_merge_contributors, partials, {})
             
-            for repo in repos_data:
-                if repo and isinstance(repo, dict) and repo.get('full_name'):
-                    contrib_url = f"https://api.github.com/repos/{repo['full_name']}/contributors"
-                    repo_contributors = client.get_with_cache(contrib_url, use_cache)
-                    if repo_contributors and isinstance(repo_contributors, list):
-                        for contrib in repo_contributors:
-                            if contrib and isinstance(contrib, dict) and contrib.get('login'):
-                                login = contrib['login']
-                                contributors_set.add(login)
-                                # Store contributor details (contributions count, etc.)
-                                if login not in contributor_details:
-                                    contributor_details[login] = {
-                                        'login': login,
-                                        'type': contrib.get('type', 'User'),
-                                        'contributions_total': contrib.get('contributions', 0),
-                                        'avatar_url': contrib.get('avatar_url'),
-                                        'html_url': contrib.get('html_url'),
-                                        'data_source': 'contributors_api',
-                                        'discovered_from_repo': repo.get('name')
-                                    }
-                                else:
-                                    # Accumulate contributions from multiple repos
-                                    contributor_details[login]['contributions_total'] += contrib.get('contributions', 0)
+            if include_mentionable and repos_data:
+                mentionable = _fetch_mentionable_users(client, repos_data, use_cache)
+                new_users = {login: user for login, user in mentionable.items() if login not in contributor_details}
+                print(f" Found {len(new_users)} mentionable users without contributions")
+                contributor_details = _merge_contributors(contributor_details, new_users)
+            contributors_set = set(contributor_details)
             
             if contributors_set:
                 print(f" Fallback successful: Found {len(contributors_set)} active contributors")
@@ -1,18 +1,24 @@
 import os
 import sys
-from typing import List
+from typing import Any, Dict, List, Optional
 from pathlib import Path
 
 # Adicionar raiz ao path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.utils.github_api import GitHubAPIClient, OrganizationConfig, save_json_data
+from src.utils.github_api import GitHubAPIClient, OrganizationConfig, save_json_data, save_json_files
+from utils.scheduler import RepoScheduler, fanout_scheduler
 
-def extract_repositories(client: GitHubAPIClient, config: OrganizationConfig, use_cache: bool = True) -> List[str]:  
+def extract_repositories(
+    client: GitHubAPIClient,
+    config: OrganizationConfig,
+    use_cache: bool = True,
+    scheduler: Optional[RepoScheduler] = None,
+) -> List[str]:
     
     repos_url = f"https://api.github.com/orgs/{config.org_name}/repos"
-    raw_repos = client.get_paginated(repos_url, use_cache=use_cache, per_page=300)
+    raw_repos = client.get_paginated(repos_url, use_cache=use_cache, per_page=300, parallel=True)
     
     if not raw_repos:
         print("ERROR: Failed to fetch repositories")
@@ -43,20 +49,22 @@ def extract_repositories(client: GitHubAPIClient, config: OrganizationConfig, us
     )
     generated_files.append(filtered_file)
     
-    # Save individual repositories
-    repo_details = []
-    for repo in filtered_repos:
+    # Repository details, fetched concurrently up to the client's pool size (the rate limit
+    # is shared), whatever the number of extractor workers
+    def fetch_detail(repo: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         repo_detail_url = f"https://api.github.com/repos/{repo['full_name']}"
-        detail = client.get_with_cache(repo_detail_url, use_cache)
-        if detail:
-            repo_details.append(detail)
-            
-            # Save individual repo detail
-            repo_file = save_json_data(
-                detail,
-                f"data/bronze/repo_{repo['name']}.json"
-            )
-            generated_files.append(repo_file)
+        return client.get_with_cache(repo_detail_url, use_cache)
+    
+    repo_details = []
+    repo_files: Dict[str, Any] = {}
+    with fanout_scheduler(scheduler, client.pool_size) as detail_scheduler:
+        for repo, detail in zip(filtered_repos, detail_scheduler.map(fetch_detail, filtered_repos)):
+            if detail:
+                repo_details.append(detail)
+                repo_files[f"data/bronze/repo_{repo['name']}.json"] = detail
+    
+    # Save individual repositories in one pass
+    generated_files.extend(save_json_files(repo_files))
     
     if repo_details:
         details_file = save_json_data(
@@ -3,12 +3,13 @@
 import os
 import sys
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 from src.utils.github_api import GitHubAPIClient, OrganizationConfig, save_json_data, load_json_data
+from src.utils.scheduler import RepoScheduler
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,19 +17,28 @@ logger = logging.getLogger(__name__)
 def extract_repository_structure(
     client: GitHubAPIClient, 
     config: OrganizationConfig, 
-    use_cache: bool = True
+    use_cache: bool = True,
+    scheduler: Optional[RepoScheduler] = None,
+    skip_unchanged: bool = True,
 ) -> List[str]:
     """
     Extrai estrutura de arquivos de todos os repositórios filtrados.
     
     Ordem de tentativa:
-    1. REST API com recursive=1 (mais rápido)
-    2. GraphQL (fallback se REST truncar)
+    1. REST API com recursive=1 (mais rápido); se truncar, subárvores faltantes por SHA
+    2. GraphQL (fallback se a árvore REST não puder ser completada)
+    
+    Se structure_{repo}.json já existe, o SHA do head do branch padrão (buscado para
+    todos os repositórios em lotes GraphQL) é comparado com o 'sha' salvo: repositórios
+    sem mudança não fazem nenhuma requisição, e os que mudaram buscam só as subárvores
+    alteradas (GitHubAPIClient.update_repository_tree).
     
     Args:
         client: Cliente da API do GitHub
         config: Configuração da organização
         use_cache: Se deve usar cache
+        scheduler: Fila de trabalho compartilhada (padrão: um repositório por vez)
+        skip_unchanged: Se deve reaproveitar as estruturas já extraídas (False refaz tudo)
     
     Returns:
         Lista de caminhos dos arquivos structure_{repo}.json gerados
@@ -53,11 +63,25 @@ def extract_repository_structure(
     successful = 0
     failed = 0
     
-    for repo in filtered_repos:
+    # Estruturas anteriores e heads atuais (um lote GraphQL para todos os repositórios)
+    previous_structures: Dict[str, Dict[str, Any]] = {}
+    heads: Dict[Any, Optional[Dict[str, Any]]] = {}
+    if skip_unchanged:
+        for repo in filtered_repos:
+            if not isinstance(repo, dict) or '/' not in repo.get('full_name', ''):
+                continue
+            previous = load_json_data(f"data/bronze/structure_{repo.get('name')}.json")
+            if isinstance(previous, dict) and previous.get('sha') and previous.get('tree'):
+                previous_structures[repo['full_name']] = previous
+        if previous_structures:
+            keys = [tuple(full_name.split('/', 1)) for full_name in previous_structures]
+            heads = client.graphql_repositories(keys, "defaultBranchRef { name target { oid } }", use_cache=False)
+    
+    def extract_repo(repo: Any) -> Optional[str]:
+        """Extrai e salva a estrutura de um repositório (executa num worker do scheduler)."""
         if not repo or not isinstance(repo, dict):
             logger.warning(f"Skipping invalid repo entry: {repo}")
-            failed += 1
-            continue
+            return None
         
         repo_name = repo.get('name', 'unknown')
         full_name = repo.get('full_name', repo_name)
@@ -66,8 +90,7 @@ def extract_repository_structure(
         # Extrair owner do full_name
         if '/' not in full_name:
             logger.warning(f"Skipping {repo_name}: invalid full_name format")
-            failed += 1
-            continue
+            return None
         
         owner, name_only = full_name.split('/', 1)
         
@@ -75,15 +98,53 @@ def extract_repository_structure(
         logger.info(f"   Owner: {owner}")
         logger.info(f"   Branch: {default_branch}")
         
+        output_path = f"data/bronze/structure_{repo_name}.json"
+        repository_metadata = {
+            'id': repo.get('id'),
+            'full_name': full_name,
+            'description': repo.get('description'),
+            'created_at': repo.get('created_at'),
+            'updated_at': repo.get('updated_at'),
+            'language': repo.get('language'),
+            'size': repo.get('size'),
+            'stars': repo.get('stargazers_count', 0),
+            'forks': repo.get('forks_count', 0),
+            'open_issues': repo.get('open_issues_count', 0),
+        }
+        
+        previous = previous_structures.get(full_name)
+        if previous and previous.get('branch') != default_branch:
+            previous = None
+        head = heads.get((owner, name_only)) or {}
+        head_ref = head.get('defaultBranchRef') or {}
+        head_sha = (head_ref.get('target') or {}).get('oid') if head_ref.get('name') == default_branch else None
+        
         try:
-            # 🚀 TRY REST FIRST (100x faster)
-            logger.info(f"   Method: REST API (recursive=1)")
-            structure = client.get_repository_tree(
-                owner=owner,
-                repo=name_only,
-                branch=default_branch,
-                use_cache=use_cache
-            )
+            if previous:
+                # ♻️ Estrutura já extraída: nada a fazer se o head não mudou, senão só as subárvores alteradas
+                logger.info(f"   Method: REST API (changed subtrees since {previous['sha'][:8]})")
+                structure = client.update_repository_tree(
+                    owner=owner,
+                    repo=name_only,
+                    branch=default_branch,
+                    previous=previous,
+                    head_sha=head_sha,
+                    use_cache=use_cache
+                )
+                if structure.get('sha') == previous['sha']:
+                    if previous.get('repository_metadata') != repository_metadata:
+                        save_json_data({**previous, 'repository_metadata': repository_metadata}, output_path, timestamp=False)
+                    logger.info(f"   ⏭️  Unchanged since {previous['sha'][:8]}: {output_path}")
+                    return output_path
+            else:
+                # 🚀 TRY REST FIRST (100x faster)
+                logger.info(f"   Method: REST API (recursive=1)")
+                structure = client.get_repository_tree(
+                    owner=owner,
+                    repo=name_only,
+                    branch=default_branch,
+                    use_cache=use_cache
+                )
             
             # Check if truncated (fallback to GraphQL)
             if structure.get('truncated', False):
@@ -98,48 +159,42 @@ def extract_repository_structure(
             # Validar dados mínimos
             if not structure or not structure.get('tree'):
                 logger.warning(f"   ⚠️  No files found in {repo_name}")
-                failed += 1
-                continue
+                return None
             
             total_items = len(structure['tree'])
             
             if total_items == 0:
                 logger.warning(f"   ⚠️  Empty tree for {repo_name}")
-                failed += 1
-                continue
+                return None
             
             # Adicionar metadados do repositório
-            structure['repository_metadata'] = {
-                'id': repo.get('id'),
-                'full_name': full_name,
-                'description': repo.get('description'),
-                'created_at': repo.get('created_at'),
-                'updated_at': repo.get('updated_at'),
-                'language': repo.get('language'),
-                'size': repo.get('size'),
-                'stars': repo.get('stargazers_count', 0),
-                'forks': repo.get('forks_count', 0),
-                'open_issues': repo.get('open_issues_count', 0),
-            }
+            structure['repository_metadata'] = repository_metadata
             
             # Salvar structure_{repo}.json
             output_file = save_json_data(
                 structure,
-                f"data/bronze/structure_{repo_name}.json",
+                output_path,
                 timestamp=False
             )
             
-            generated_files.append(output_file)
-            successful += 1
-            
             method = structure.get('method', 'unknown')
             logger.info(f"   ✅ Saved: {output_file}")
             logger.info(f"   📊 Files: {total_items} (method: {method})")
+            return output_file
             
         except Exception as e:
             logger.error(f"   ❌ Error extracting {repo_name}: {str(e)}")
+            return None
+    
+    if scheduler is None:
+        scheduler = RepoScheduler(max_workers=1)
+    
+    for output_file in scheduler.map(extract_repo, filtered_repos):
+        if output_file:
+            generated_files.append(output_file)
+            successful += 1
+        else:
             failed += 1
-            continue
     
     # Resumo final
     logger.info("\n" + "="*60)
@@ -9,32 +9,55 @@ from datetime import datetime
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from utils.github_api import GitHubAPIClient, OrganizationConfig, update_data_registry
+from utils.cache_store import parse_size
+from utils.token_pool import load_tokens
+from utils.scheduler import RepoScheduler
 
 def main():
     parser = argparse.ArgumentParser(description='Extract GitHub organization data to Bronze layer')
-    parser.add_argument('--token', required=True, help='GitHub Personal Access Token')
+    parser.add_argument('--token', required=True, help='GitHub Personal Access Token (comma-separated list for a token pool; GITHUB_TOKENS / GITHUB_TOKEN_<N> env vars and .secrets are added)')
     parser.add_argument('--org', default='coops-org', help='GitHub organization name')
     parser.add_argument('--cache', action='store_true', help='Use cached data when available')
+    parser.add_argument('--cache-backend', choices=['sharded', 'sqlite', 'files'], default='sharded', help='Response cache storage: gzip shards, one SQLite file, or legacy flat JSON files (default: sharded)')
+    parser.add_argument('--cache-max-size', help='Cap the response cache size with LRU eviction, e.g. 500MB or 2G')
+    parser.add_argument('--revalidate', action='store_true', help='Use the cache but revalidate REST responses with ETag/If-Modified-Since (304s are free; implies --cache)')
     parser.add_argument('--commits-method', choices=['rest', 'graphql'], default='graphql', help='Extraction method for commits (REST v3 or GraphQL v4)')
     parser.add_argument('--since', help='ISO-8601 timestamp (e.g., 2024-01-01T00:00:00Z) to limit commit extraction start')
     parser.add_argument('--until', help='ISO-8601 timestamp (e.g., 2024-12-31T23:59:59Z) to limit commit extraction end')
     parser.add_argument('--max-commits-per-repo', type=int, help='Optional hard cap of commits per repo to fetch (GraphQL only)')
-    parser.add_argument('--commits-page-size', type=int, default=50, help='Commits page size for pagination (REST & GraphQL). Default: 50')
+    parser.add_argument('--commits-page-size', type=int, default=50, help='Commits page size for pagination (REST & GraphQL; the GraphQL history walk starts here and adapts between 10 and 100). Default: 50')
     parser.add_argument('--include-active-branches', action='store_true', help='Include commits from recently active branches not merged to main (GraphQL only)')
     parser.add_argument('--active-days', type=int, default=30, help='Consider branches active if updated in last N days (default: 30)')
-    parser.add_argument('--time-chunks', type=int, default=3, help='Split large extractions into N time periods to avoid API overload (default: 3)')
+    parser.add_argument('--time-chunks', type=int, default=3, help='Split --since/--until extractions into N time periods; periods with too many commits are bisected further and walked in parallel (GraphQL, default: 3)')
+    parser.add_argument('--resume', action='store_true', help='Checkpoint commit history walks (GraphQL) after every page and resume an interrupted run from there')
+    parser.add_argument('--workers', type=int, default=1, help='Repositories extracted concurrently, shared by the issue/commit/member/structure extractors, which then also run side by side (opt-in, e.g. 8). Default: 1 (serial, one step after another)')
+    parser.add_argument('--incremental', action='store_true', help='Only fetch commits, issues and events newer than the last run (per-repo marks in data/bronze/_state/) and merge them into the existing files')
+    parser.add_argument('--mentionable-users', action='store_true', help='When the org members API is empty, also list each repository\'s mentionableUsers (GraphQL, many repositories per request) besides its contributors')
     
     # 🆕 NOVO: Argumento para extração de estrutura
     parser.add_argument('--skip-structure', action='store_true', help='Skip repository structure extraction')
     
     args = parser.parse_args()
+    if args.revalidate:
+        args.cache = True
     
     print(f"Starting Bronze layer extraction for organization: {args.org}")
     print(f"Started at: {datetime.now().isoformat()}")
     
     # Initialize API client
-    client = GitHubAPIClient(args.token)
+    tokens = load_tokens(args.token)
+    if len(tokens) > 1:
+        print(f"Using a pool of {len(tokens)} GitHub tokens")
+    client = GitHubAPIClient(
+        tokens,
+        pool_size=max(5, args.workers),
+        revalidate=args.revalidate,
+        cache_backend=args.cache_backend,
+        cache_max_bytes=parse_size(args.cache_max_size) if args.cache_max_size else None,
+    )
     config = OrganizationConfig(args.org)
+    # One work queue for every extractor; all workers draw from the client's rate-limit budget
+    scheduler = RepoScheduler(max_workers=args.workers)
     
     try:
         # Import and run individual extractors
@@ -50,25 +73,28 @@ def main():
         print("\n" + "="*60)
         print("📦 STEP 1: Extracting repositories")
         print("="*60)
-        repo_files = extract_repositories(client, config, use_cache=args.cache)
+        repo_files = extract_repositories(client, config, use_cache=args.cache, scheduler=scheduler)
         print(f"✅ Generated {len(repo_files)} repository files")
 
         # ========================================
-        # STEP 2: Extract Issues and Pull Requests
+        # STEPS 2-5: Issues, Commits, Members and Structures
         # ========================================
+        # The extractors run side by side (with --workers > 1) and put their repositories
+        # in the same work queue, so no step waits for the slowest repository of another.
         print("\n" + "="*60)
         print("🐛 STEP 2: Extracting issues and pull requests")
-        print("="*60)
-        issue_files = extract_issues(client, config, use_cache=args.cache)
-        print(f"✅ Generated {len(issue_files)} issue files")
-
-        # ========================================
-        # STEP 3: Extract Commits (GraphQL/REST Hybrid)
-        # ========================================
-        print("\n" + "="*60)
         print("💬 STEP 3: Extracting commits")
+        print("👥 STEP 4: Extracting organization members")
+        if not args.skip_structure:
+            print("🌳 STEP 5: Extracting repository structures")
+        print(f"   ({scheduler.max_workers} concurrent repositories)")
         print("="*60)
-        commit_files = extract_commits(
+
+        issue_future = scheduler.run(
+            extract_issues, client, config, use_cache=args.cache, incremental=args.incremental, scheduler=scheduler
+        )
+        commit_future = scheduler.run(
+            extract_commits,
             client,
             config,
             use_cache=args.cache,
@@ -80,27 +106,29 @@ def main():
             include_active_branches=args.include_active_branches,
             active_days=args.active_days,
             time_chunks=args.time_chunks,
+            resume=args.resume,
+            incremental=args.incremental,
+            scheduler=scheduler,
         )
-        print(f"✅ Generated {len(commit_files)} commit files")
+        member_future = scheduler.run(
+            extract_members, client, config, use_cache=args.cache, scheduler=scheduler,
+            include_mentionable=args.mentionable_users
+        )
+        structure_future = None
+        if not args.skip_structure:
+            structure_future = scheduler.run(
+                extract_repository_structure, client, config, use_cache=args.cache, scheduler=scheduler
+            )
 
-        # ========================================
-        # STEP 4: Extract Organization Members
-        # ========================================
-        print("\n" + "="*60)
-        print("👥 STEP 4: Extracting organization members")
-        print("="*60)
-        member_files = extract_members(client, config, use_cache=args.cache)
+        issue_files = issue_future.result()
+        print(f"✅ Generated {len(issue_files)} issue files")
+        commit_files = commit_future.result()
+        print(f"✅ Generated {len(commit_files)} commit files")
+        member_files = member_future.result()
         print(f"✅ Generated {len(member_files)} member files")
-
-        # ========================================
-        # 🆕 STEP 5: Extract Repository Structure (GraphQL)
-        # ========================================
         structure_files = []
-        if not args.skip_structure:
-            print("\n" + "="*60)
-            print("🌳 STEP 5: Extracting repository structures")
-            print("="*60)
-            structure_files = extract_repository_structure(client, config, use_cache=args.cache)
+        if structure_future is not None:
+            structure_files = structure_future.result()
             print(f"✅ Generated {len(structure_files)} structure files")
         else:
             print("\n⏭️  Skipping repository structure extraction (--skip-structure)")
@@ -128,6 +156,9 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        # Also on failure: otherwise the other extractors keep their workers calling the API
+        scheduler.shutdown()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Inspect and prune the GitHub API response cache.
+
+Usage:
+    python src/cache_manager.py stats
+    python src/cache_manager.py prune --max-size 500MB --older-than 30d
+    python src/cache_manager.py --backend sqlite --cache-dir cache stats
+"""
+
+import argparse
+from datetime import datetime
+from typing import Optional
+
+from utils.cache_store import CACHE_BACKENDS, create_cache_store, parse_duration, parse_size
+
+
+def _format_bytes(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    value = size / 1024
+    for unit in ("KB", "MB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+def _format_time(timestamp: Optional[float]) -> str:
+    return datetime.fromtimestamp(timestamp).isoformat(timespec='seconds') if timestamp else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect and prune the GitHub API response cache')
+    parser.add_argument('--cache-dir', default='cache', help='Cache directory (default: cache)')
+    parser.add_argument('--backend', choices=sorted(CACHE_BACKENDS), default='sharded', help='Cache backend (default: sharded)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('stats', help='Show entry count, size and age range')
+
+    prune_parser = subparsers.add_parser('prune', help='Evict old and least recently used entries')
+    prune_parser.add_argument('--max-size', help='Evict least recently used entries until the cache fits, e.g. 500MB, 2G')
+    prune_parser.add_argument('--older-than', help='Delete entries stored longer ago than this, e.g. 30d, 12h')
+
+    args = parser.parse_args()
+    store = create_cache_store(args.backend, args.cache_dir)
+
+    try:
+        if args.command == 'stats':
+            stats = store.stats()
+            print(f"Cache: {stats['cache_dir']} ({stats['backend']})")
+            print(f"  Entries: {stats['entries']}")
+            print(f"  Size:    {_format_bytes(stats['bytes'])}")
+            print(f"  Oldest:  {_format_time(stats['oldest_stored_at'])}")
+            print(f"  Newest:  {_format_time(stats['newest_stored_at'])}")
+        else:
+            if not args.max_size and not args.older_than:
+                parser.error('prune needs --max-size and/or --older-than')
+            max_bytes = parse_size(args.max_size) if args.max_size else None
+            max_age = parse_duration(args.older_than) if args.older_than else None
+            result = store.prune(max_bytes=max_bytes, max_age=max_age)
+            print(f"Removed {result['removed']} entries ({_format_bytes(result['freed_bytes'])})")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ import json
 from datetime import datetime
 from typing import Dict, List, Any
 from utils.github_api import load_json_data, save_json_data
+from utils.extraction_state import STATE_DIRNAME
 
 def create_master_registry() -> str:
     
@@ -42,6 +43,8 @@ def scan_data_directory(directory: str) -> List[str]:
     files = []
     if os.path.exists(directory):
         for root, dirs, filenames in os.walk(directory):
+            # Incremental extraction state is bookkeeping, not data
+            dirs[:] = [d for d in dirs if d != STATE_DIRNAME]
             for filename in filenames:
                 if filename.endswith('.json'):
                     files.append(os.path.join(root, filename))
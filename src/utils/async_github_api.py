@@ -0,0 +1,702 @@
+#!/usr/bin/env python3
+
+import asyncio
+import hashlib
+import json
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple, Callable, Awaitable, Sequence, Union
+from urllib.parse import urlsplit
+
+try:
+    import aiohttp
+except ImportError:  # optional: only needed by the asyncio client
+    aiohttp = None
+
+from utils.github_api import GitHubAPIClient
+
+
+class AsyncGitHubAPIClient:
+    """
+    Asyncio-native sibling of GitHubAPIClient.
+
+    Exposes the same methods as coroutines (get_with_cache, graphql, get_paginated,
+    graphql_commit_history, get_repository_tree) so hundreds of requests can be
+    in flight on one event loop. Concurrency is bounded by a global semaphore plus
+    a per-host semaphore, which keeps bursts below GitHub's secondary rate limits.
+
+    The response cache, the response-shaping helpers and the RateLimitGovernor are
+    shared with the synchronous client, so both clients read and write the same
+    cache entries and draw from one rate-limit budget. Cache reads and writes are
+    blocking disk I/O, so they run in worker threads (asyncio.to_thread) instead
+    of on the event loop.
+
+    Requires the optional `aiohttp` package (pip install aiohttp); the extraction
+    scripts use the synchronous client and do not need it.
+
+    Usage:
+        async with AsyncGitHubAPIClient(token) as client:
+            repo = await client.get_with_cache("https://api.github.com/repos/o/r")
+    """
+
+    def __init__(
+        self,
+        token: Union[str, Sequence[str]],
+        cache_dir: str = "cache",
+        max_concurrency: int = 100,
+        per_host_limit: int = 20,
+        revalidate: bool = False,
+        cache_backend: str = "sharded",
+        cache_max_bytes: Optional[int] = None,
+    ):
+        if aiohttp is None:
+            raise ImportError("AsyncGitHubAPIClient requires aiohttp: pip install aiohttp")
+        self._sync = GitHubAPIClient(
+            token,
+            cache_dir=cache_dir,
+            revalidate=revalidate,
+            cache_backend=cache_backend,
+            cache_max_bytes=cache_max_bytes,
+        )
+        self.token = self._sync.token
+        self.headers = dict(self._sync.headers)
+        self.cache_dir = cache_dir
+        self.graphql_url = self._sync.graphql_url
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.rate_governor = self._sync.rate_governor
+        self.revalidate = revalidate
+        # Created lazily so they bind to the running event loop
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # Single-flight: identical requests already in flight on the event loop
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+    async def __aenter__(self) -> "AsyncGitHubAPIClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying aiohttp session and the shared sync session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        await asyncio.to_thread(self._sync.close)
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.per_host_limit)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    @asynccontextmanager
+    async def _request_slot(self, url: str):
+        """Hold one global slot and one slot for the URL's host while a request runs."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        host = urlsplit(url).netloc
+        host_semaphore = self._host_semaphores.get(host)
+        if host_semaphore is None:
+            host_semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = host_semaphore
+        async with self._semaphore:
+            async with host_semaphore:
+                yield
+
+    async def _single_flight(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Async single-flight: coroutines asking for the same key await one shared task."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self._sync.coalesced_requests += 1
+        # shield: a cancelled waiter must not cancel the request other waiters share
+        return await asyncio.shield(task)
+
+    async def get_with_cache(self, url: str, use_cache: bool = True, retries: int = 3, backoff_base: float = 1.0, return_headers: bool = False, silent: bool = False, log_prefix: str = "REST") -> Any:
+        """Async counterpart of GitHubAPIClient.get_with_cache."""
+        cached = None
+        validators = None
+        request_headers = self.headers
+        if use_cache:
+            cached, fresh = await asyncio.to_thread(self._sync._cache_lookup, url)
+            if cached is not None:
+                if fresh and not self.revalidate:
+                    if not silent:
+                        print(f"✓ Using cached data for: {url}")
+                    return cached if not return_headers else (cached, None)
+                validators = await asyncio.to_thread(self._sync._cache_get_validators, url)
+                request_headers = {**self.headers, **self._sync._conditional_headers(validators)}
+
+        if not silent:
+            print(f"→ Fetching from API: {url}")
+        result = await self._single_flight(
+            f"GET {url}",
+            lambda: self._fetch_rest(
+                url, use_cache, request_headers, cached, validators, retries, backoff_base, silent,
+                log_prefix if not return_headers and not silent else None,
+            ),
+        )
+        if result is None:
+            return None
+        data, headers = result
+        return data if not return_headers else (data, headers)
+
+    async def _fetch_rest(
+        self,
+        url: str,
+        use_cache: bool,
+        request_headers: Dict[str, str],
+        cached: Any,
+        validators: Optional[Dict[str, str]],
+        retries: int,
+        backoff_base: float,
+        silent: bool,
+        log_prefix: Optional[str],
+    ) -> Optional[Tuple[Any, Any]]:
+        """Send the GET behind get_with_cache (with retries). Returns (data, headers) or None."""
+        session = self._get_session()
+        attempt = 0
+        while attempt < retries:
+            try:
+                token, wait = self._sync.token_pool.reserve("core")
+                governor = self._sync.token_pool.governor(token)
+                await asyncio.sleep(wait)
+                async with self._request_slot(url):
+                    async with session.get(url, headers={**request_headers, "Authorization": f"Bearer {token}"}, timeout=aiohttp.ClientTimeout(total=35)) as response:
+                        status = response.status
+                        headers = response.headers
+                        if status == 200:
+                            data = await response.json(content_type=None)
+                        elif status == 304:
+                            text = ""
+                        else:
+                            text = await response.text()
+                governor.update_from_headers(headers, "core")
+
+                if status == 200:
+                    if use_cache:
+                        await asyncio.to_thread(self._sync._cache_set, url, data)
+                        await asyncio.to_thread(self._sync._cache_set_validators, url, headers)
+                    if log_prefix:
+                        self._sync._log_rate_limit(response, prefix=log_prefix)
+                    return data, headers
+                elif status == 304 and cached is not None:
+                    await asyncio.to_thread(self._sync._cache_touch, url)
+                    if not silent:
+                        print(f"✓ Not modified (304), using cached data for: {url}")
+                    return cached, self._sync._not_modified_headers(headers, validators)
+                elif status in (403, 429):
+                    print(f"[ERROR] API request forbidden ({status}) - might be private or rate limited: {text}")
+                    if status == 429 or "rate limit" in text.lower():
+                        blocked_for = governor.penalize("core", headers)
+                        if len(self._sync.token_pool) > 1:
+                            print(f"Rate limit exceeded for token ...{token[-4:]} (blocked {blocked_for:.0f}s). Failing over to the other tokens...")
+                        else:
+                            print(f"Rate limit exceeded. Waiting {blocked_for:.0f} seconds...")
+                    else:
+                        print("Access forbidden - resource might be private or require different permissions")
+                        return None
+                elif status == 404:
+                    print(f"[ERROR] Resource not found (404): {url}")
+                    return None
+                elif status == 401 and len(self._sync.token_pool) > 1 and self._sync.token_pool.mark_revoked(token):
+                    print(f"[WARN] Token ...{token[-4:]} rejected (401) - switching to another token")
+                    continue
+                elif 500 <= status < 600:
+                    attempt += 1
+                    wait = backoff_base * (2 ** (attempt - 1))
+                    print(f"[WARN] API {status} - retrying in {wait:.1f}s (attempt {attempt}/{retries})")
+                    await asyncio.sleep(wait)
+                    continue
+                else:
+                    print(f"[ERROR] API request failed: {status} - {text}")
+                    return None
+            except asyncio.TimeoutError:
+                attempt += 1
+                wait = backoff_base * (2 ** (attempt - 1))
+                print(f"[ERROR] Request timeout for: {url} - retrying in {wait:.1f}s (attempt {attempt}/{retries})")
+                await asyncio.sleep(wait)
+                continue
+            except aiohttp.ClientError as e:
+                print(f"[ERROR] Request error for {url}: {str(e)}")
+                return None
+        print(f"[ERROR] Exhausted retries for: {url}")
+        return None
+
+    async def graphql(self, query: str, variables: Optional[Dict[str, Any]] = None, use_cache: bool = True, timeout: int = 4) -> Any:
+        """Async counterpart of GitHubAPIClient.graphql (same cache keys)."""
+        payload = {"query": query, "variables": variables or {}}
+
+        try:
+            cache_key = "graphql:" + hashlib.md5(
+                (query + "::" + json.dumps(payload["variables"], sort_keys=True, ensure_ascii=False)).encode("utf-8")
+            ).hexdigest()
+        except Exception:
+            cache_key = None
+        if use_cache and cache_key:
+            cached = await asyncio.to_thread(self._sync._cache_get, cache_key)
+            if cached is not None:
+                print("[GRAPHQL] ✓ Using cached response")
+                return cached
+
+        if cache_key is None:
+            return await self._post_graphql(payload, None, timeout)
+        return await self._single_flight(cache_key, lambda: self._post_graphql(payload, cache_key if use_cache else None, timeout))
+
+    async def _post_graphql(self, payload: Dict[str, Any], cache_key: Optional[str], timeout: int) -> Any:
+        """Send the POST behind graphql(); caches the response under cache_key when given."""
+        token, wait = self._sync.token_pool.reserve("graphql")
+        governor = self._sync.token_pool.governor(token)
+        headers = dict(self.headers)
+        headers["Authorization"] = f"Bearer {token}"
+        headers["Content-Type"] = "application/json"
+        session = self._get_session()
+
+        try:
+            await asyncio.sleep(wait)
+            async with self._request_slot(self.graphql_url):
+                async with session.post(self.graphql_url, headers=headers, json=payload, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    status = response.status
+                    response_headers = response.headers
+                    if status == 200:
+                        data = await response.json(content_type=None)
+                    else:
+                        text = await response.text()
+            governor.update_from_headers(response_headers, "graphql")
+
+            if status == 200:
+                if isinstance(data, dict):
+                    governor.update_from_graphql((data.get("data") or {}).get("rateLimit"))
+                if "errors" in data:
+                    errors = data.get('errors', [])
+                    has_stats_unavailable = any(
+                        err.get('type') == 'SERVICE_UNAVAILABLE' and
+                        ('additions' in str(err.get('path', [])) or 'deletions' in str(err.get('path', [])))
+                        for err in errors
+                    )
+                    if has_stats_unavailable:
+                        print(f"[GRAPHQL][WARN] Commit stats unavailable (SERVICE_UNAVAILABLE)")
+                    else:
+                        print(f"[GRAPHQL][ERROR] Returned errors: {data['errors']}")
+                    return None
+                if cache_key:
+                    await asyncio.to_thread(self._sync._cache_set, cache_key, data)
+                return data
+            elif status in (403, 429):
+                if status == 429 or "rate limit" in text.lower():
+                    governor.penalize("graphql", response_headers)
+                    print(f"[GRAPHQL][WARN] Rate limit exceeded")
+                else:
+                    print(f"[GRAPHQL][ERROR] Forbidden (403)")
+                return None
+            elif status == 401 and len(self._sync.token_pool) > 1 and self._sync.token_pool.mark_revoked(token):
+                print(f"[GRAPHQL][WARN] Token ...{token[-4:]} rejected (401) - switching to another token")
+                return await self._post_graphql(payload, cache_key, timeout)
+            elif status in [500, 502, 503]:
+                print(f"[GRAPHQL][WARN] {status}")
+                return None
+            else:
+                print(f"[GRAPHQL][ERROR] Request failed: {status}")
+                return None
+        except asyncio.TimeoutError:
+            print(f"[GRAPHQL][WARN] Timeout ({timeout}s)")
+            return None
+        except aiohttp.ClientError as e:
+            print(f"[GRAPHQL][ERROR] Request error: {str(e)}")
+            return None
+
+    async def get_paginated(
+        self,
+        base_url: str,
+        use_cache: bool = True,
+        per_page: int = 50,
+        start_page: int = 1,
+        max_pages: Optional[int] = None,
+    ) -> List[Any]:
+        """Async counterpart of GitHubAPIClient.get_paginated (same URLs and cache keys)."""
+        results: List[Any] = []
+        page = start_page
+        while True:
+            if max_pages is not None and page > max_pages:
+                break
+            sep = '&' if ('?' in base_url) else '?'
+            url = f"{base_url}{sep}per_page={per_page}&page={page}"
+            data = await self.get_with_cache(url, use_cache)
+            if data is None:
+                break
+            if isinstance(data, list):
+                results.extend(data)
+                if len(data) < per_page:
+                    break
+            else:
+                break
+            page += 1
+        return results
+
+    async def _fetch_rest_commit_details(self, commits_list: List[Dict], owner: str, repo: str, use_cache: bool) -> List[Dict[str, Any]]:
+        """Fetch REST commit details for every commit concurrently (bounded by the semaphores)."""
+        details = await asyncio.gather(*[
+            self.get_with_cache(
+                f"https://api.github.com/repos/{owner}/{repo}/commits/{c['sha']}",
+                use_cache,
+                silent=True,
+            )
+            for c in commits_list
+        ])
+        processed = []
+        for rest_commit, commit_details in zip(commits_list, details):
+            if commit_details:
+                processed.append(self._sync._rest_commit_to_node(rest_commit, commit_details))
+        return processed
+
+    async def _walk_commit_history(
+        self,
+        owner: str,
+        repo: str,
+        branch: Optional[str],
+        range_since: Optional[str],
+        range_until: Optional[str],
+        page_size: int,
+        max_pages: Optional[int],
+        max_commits: Optional[int],
+        use_cache: bool,
+        commits_by_sha: Dict[str, Dict[str, Any]],
+        rate_meta: Dict[str, Any],
+    ) -> int:
+        """Walk one branch/time-range, falling back to one REST page whenever a GraphQL page fails."""
+        history_field = """
+            history(first: $pageSize, after: $cursor, since: $since, until: $until) {
+              pageInfo { hasNextPage endCursor }
+              nodes {
+                oid
+                messageHeadline
+                committedDate
+                author { user { login } }
+                additions
+                deletions
+              }
+            }
+        """
+        if branch:
+            query = """
+            query($owner: String!, $name: String!, $branch: String!, $pageSize: Int!, $cursor: String, $since: GitTimestamp, $until: GitTimestamp) {
+              repository(owner: $owner, name: $name) {
+                ref(qualifiedName: $branch) { target { ... on Commit { %s } } }
+              }
+              rateLimit { remaining resetAt limit cost }
+            }
+            """ % history_field
+        else:
+            query = """
+            query($owner: String!, $name: String!, $pageSize: Int!, $cursor: String, $since: GitTimestamp, $until: GitTimestamp) {
+              repository(owner: $owner, name: $name) {
+                defaultBranchRef { name target { ... on Commit { %s } } }
+              }
+              rateLimit { remaining resetAt limit cost }
+            }
+            """ % history_field
+
+        cursor: Optional[str] = None
+        pages = 0
+        period_commits = 0
+        rest_page = 1
+
+        while True:
+            if max_pages is not None and pages >= max_pages:
+                break
+            if max_commits is not None and len(commits_by_sha) >= max_commits:
+                break
+
+            variables = {
+                "owner": owner,
+                "name": repo,
+                "pageSize": page_size,
+                "cursor": cursor,
+                "since": range_since,
+                "until": range_until,
+            }
+            if branch:
+                variables["branch"] = f"refs/heads/{branch}"
+
+            data = await self.graphql(query, variables, use_cache=use_cache, timeout=30)
+
+            if not data:
+                # REST fallback: one page of commits, then retry GraphQL from the same cursor
+                params = []
+                if branch:
+                    params.append(f"sha={branch}")
+                if range_since:
+                    params.append(f"since={range_since}")
+                if range_until:
+                    params.append(f"until={range_until}")
+                params.append("per_page=50")
+                params.append(f"page={rest_page}")
+                rest_url = f"https://api.github.com/repos/{owner}/{repo}/commits?{'&'.join(params)}"
+
+                rest_data = await self.get_with_cache(rest_url, use_cache=use_cache, silent=True)
+                if not rest_data or not isinstance(rest_data, list):
+                    print(f"[REST] Page {rest_page}: No more commits available")
+                    break
+                rest_page += 1
+
+                new_commits = [c for c in rest_data if c.get('sha') and c.get('sha') not in commits_by_sha]
+                print(f"[REST] Page {rest_page - 1}: Found {len(rest_data)} commits, processing {len(new_commits)} new")
+                for commit in await self._fetch_rest_commit_details(new_commits, owner, repo, use_cache):
+                    sha = commit.get('oid')
+                    if sha and sha not in commits_by_sha:
+                        commits_by_sha[sha] = commit
+                        period_commits += 1
+
+                if len(rest_data) < 50:
+                    print(f"[REST] Reached end of commits")
+                    break
+                continue
+
+            repo_data = data.get("data", {}).get("repository")
+            rate_meta.update(data.get("data", {}).get("rateLimit", {}) or {})
+            if not repo_data:
+                break
+
+            if branch:
+                ref_data = repo_data.get("ref")
+                if not ref_data:
+                    print(f"[GRAPHQL] Branch '{branch}' not found")
+                    break
+                target = ref_data.get("target", {})
+            else:
+                default_ref = repo_data.get("defaultBranchRef")
+                if not default_ref:
+                    break
+                target = default_ref.get("target", {})
+
+            history = target.get("history") if isinstance(target, dict) else None
+            if not history:
+                break
+
+            for node in history.get("nodes", []):
+                sha = node.get('oid')
+                if sha and sha not in commits_by_sha:
+                    # Copy: the node belongs to a (shared) cached response
+                    node = {**node, 'additions': node.get('additions') or 0, 'deletions': node.get('deletions') or 0}
+                    commits_by_sha[sha] = node
+                    period_commits += 1
+
+            page_info = history.get("pageInfo", {})
+            cursor = page_info.get("endCursor")
+            pages += 1
+            if not page_info.get("hasNextPage"):
+                break
+
+        return period_commits
+
+    async def graphql_commit_history(
+        self,
+        owner: str,
+        repo: str,
+        page_size: int,
+        max_pages: Optional[int] = None,
+        max_commits: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        use_cache: bool = True,
+        branches: Optional[List[str]] = None,
+        split_large_extractions: bool = True,
+        time_chunks: int = 3,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Async counterpart of GitHubAPIClient.graphql_commit_history.
+
+        Every (branch, time range) pair is walked concurrently; pages inside one
+        walk stay sequential because each page depends on the previous cursor.
+
+        Returns:
+            Tuple of (commits list, rate limit metadata)
+        """
+        commits_by_sha: Dict[str, Dict[str, Any]] = {}
+        rate_meta: Dict[str, Any] = {}
+
+        branches_to_process: List[Optional[str]] = [None]
+        if branches:
+            branches_to_process.extend(branches)
+            print(f"  Processing {len(branches_to_process)} branches (main + {len(branches)} active)")
+
+        time_ranges = [(since, until)]
+        if split_large_extractions and (since or until):
+            time_ranges = self._sync._split_time_range(since, until, chunks=time_chunks)
+            print(f"  Splitting extraction into {len(time_ranges)} time periods to avoid API overload")
+
+        await asyncio.gather(*[
+            self._walk_commit_history(
+                owner, repo, branch, range_since, range_until, page_size,
+                max_pages, max_commits, use_cache, commits_by_sha, rate_meta,
+            )
+            for branch in branches_to_process
+            for range_since, range_until in time_ranges
+        ])
+
+        commits = list(commits_by_sha.values())
+        if max_commits is not None:
+            commits = commits[:max_commits]
+        if branches:
+            print(f"  [GRAPHQL] Total unique commits across all branches: {len(commits)}")
+        return commits, rate_meta
+
+    async def get_repository_tree(
+        self,
+        owner: str,
+        repo: str,
+        branch: str = "main",
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Versão assíncrona de GitHubAPIClient.get_repository_tree.
+        Usa REST Git Trees (recursive=1) e cai para GraphQL se a árvore vier truncada.
+        """
+        logger = logging.getLogger(__name__)
+
+        try:
+            branch_url = f"https://api.github.com/repos/{owner}/{repo}/branches/{branch}"
+            branch_data = await self.get_with_cache(branch_url, use_cache=use_cache)
+
+            if not branch_data:
+                logger.error(f"Branch {branch} not found for {owner}/{repo}")
+                return self._sync._empty_tree_response(owner, repo, branch, error="Branch not found")
+
+            tree_sha = branch_data['commit']['sha']
+            tree_url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/{tree_sha}"
+            tree_data = await self.get_with_cache(f"{tree_url}?recursive=1", use_cache=use_cache)
+
+            if not tree_data:
+                logger.error(f"Failed to fetch tree for {owner}/{repo}")
+                return self._sync._empty_tree_response(owner, repo, branch, error="Tree fetch failed")
+
+            is_truncated = tree_data.get('truncated', False)
+            if is_truncated:
+                logger.warning(f"  ⚠️  Tree truncated! Falling back to GraphQL...")
+                return await self.graphql_repository_tree(owner, repo, branch, use_cache)
+
+            standardized_tree = []
+            for item in tree_data.get('tree', []):
+                node = self._sync._standardize_tree_node(item)
+                if node:
+                    standardized_tree.append(node)
+
+            return {
+                'owner': owner,
+                'repository': repo,
+                'branch': branch,
+                'sha': tree_sha,
+                'tree': standardized_tree,
+                'truncated': is_truncated,
+                'extracted_at': datetime.now().isoformat(),
+                'method': 'rest',
+                'total_items': len(standardized_tree)
+            }
+
+        except Exception as e:
+            logger.error(f"Error in get_repository_tree: {str(e)}")
+            return self._sync._empty_tree_response(owner, repo, branch, error=str(e))
+
+    async def graphql_repository_tree(
+        self,
+        owner: str,
+        repo: str,
+        branch: str = "main",
+        use_cache: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Versão assíncrona de GitHubAPIClient.graphql_repository_tree.
+        Percorre a árvore por níveis: todos os diretórios de um nível são buscados em paralelo.
+        """
+        logger = logging.getLogger(__name__)
+        query = """
+        query($owner: String!, $repo: String!, $expression: String!) {
+          repository(owner: $owner, name: $repo) {
+            object(expression: $expression) {
+              ... on Tree {
+                entries {
+                  name
+                  type
+                  mode
+                  path
+                  extension
+                  object {
+                    ... on Blob {
+                      byteSize
+                      isBinary
+                      oid
+                    }
+                  }
+                }
+              }
+            }
+          }
+        }
+        """
+
+        async def fetch_entries(path: str) -> List[Dict[str, Any]]:
+            variables = {"owner": owner, "repo": repo, "expression": f"{branch}:{path}"}
+            result = await self.graphql(query, variables, use_cache=use_cache)
+            repo_obj = ((result or {}).get('data') or {}).get('repository') or {}
+            tree_obj = repo_obj.get('object') or {}
+            return tree_obj.get('entries', []) or []
+
+        root_tree: List[Dict[str, Any]] = []
+        frontier: List[Tuple[str, List[Dict[str, Any]]]] = [("", root_tree)]
+
+        try:
+            while frontier:
+                levels = await asyncio.gather(*[fetch_entries(path) for path, _ in frontier])
+                next_frontier = []
+                for (_, parent_list), entries in zip(frontier, levels):
+                    for entry in entries:
+                        entry_type = entry.get('type')
+                        if entry_type == 'tree':
+                            directory_node = {
+                                'name': entry.get('name'),
+                                'path': entry.get('path'),
+                                'type': 'directory',
+                                'children': []
+                            }
+                            parent_list.append(directory_node)
+                            next_frontier.append((entry.get('path'), directory_node['children']))
+                        elif entry_type == 'blob':
+                            blob_info = entry.get('object') or {}
+                            parent_list.append({
+                                'name': entry.get('name'),
+                                'path': entry.get('path'),
+                                'type': 'file',
+                                'extension': entry.get('extension', ''),
+                                'size': blob_info.get('byteSize', 0),
+                                'is_binary': blob_info.get('isBinary', False),
+                                'oid': blob_info.get('oid', '')
+                            })
+                frontier = next_frontier
+
+            return {
+                'owner': owner,
+                'repository': repo,
+                'branch': branch,
+                'tree': root_tree,
+                'extracted_at': datetime.now().isoformat(),
+                'method': 'graphql',
+                'total_items': len(root_tree)
+            }
+        except Exception as e:
+            logger.error(f"Failed to build repository tree: {str(e)}")
+            return {
+                'owner': owner,
+                'repository': repo,
+                'branch': branch,
+                'tree': [],
+                'error': str(e),
+                'extracted_at': datetime.now().isoformat(),
+                'method': 'graphql'
+            }
@@ -0,0 +1,626 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import json
+import gzip
+import time
+import zlib
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def _encode(data: Any) -> bytes:
+    """Compact JSON, as UTF-8 bytes (the legacy store used indent=2)."""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _decode(raw: bytes) -> Any:
+    return json.loads(raw.decode('utf-8'))
+
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+# (pattern, ttl in seconds or None for "never expires"), first match wins.
+# Patterns are matched against the raw cache key: the request URL for REST,
+# "graphql:<hash>" for GraphQL queries and "<url>#validators" for ETag data.
+DEFAULT_TTL_RULES: List[Tuple[str, Optional[float]]] = [
+    # Validators must outlive the body they describe so stale entries can be revalidated
+    (r'#validators$', None),
+    # Content addressed by SHA never changes
+    (r'/commits/[0-9a-f]{40}(\?|$)', None),
+    (r'/git/(trees|blobs|commits)/[0-9a-f]{40}(\?|$)', None),
+    # Lists that grow or change all the time
+    (r'/issues(/events)?(\?|$)', 1 * HOUR),
+    (r'/orgs/[^/]+/(members|repos)(\?|$)', 1 * HOUR),
+    (r'/(contributors|branches|commits)(\?|$)', 1 * HOUR),
+    (r'/branches/', 1 * HOUR),
+    (r'/compare/', 1 * HOUR),
+    (r'^graphql:', 12 * HOUR),
+]
+
+
+class CachePolicy:
+    """
+    Freshness rules for cached responses, by endpoint class.
+
+    Args:
+        rules: (regex, ttl_seconds) pairs matched against the cache key; ttl None never expires
+        default_ttl: TTL for keys matching no rule, e.g. repository or user metadata (default: 1 day)
+    """
+
+    def __init__(self, rules: Optional[List[Tuple[str, Optional[float]]]] = None, default_ttl: Optional[float] = DAY):
+        self.rules = [(re.compile(pattern), ttl) for pattern, ttl in (rules if rules is not None else DEFAULT_TTL_RULES)]
+        self.default_ttl = default_ttl
+
+    def ttl_for(self, cache_key: str) -> Optional[float]:
+        for pattern, ttl in self.rules:
+            if pattern.search(cache_key):
+                return ttl
+        return self.default_ttl
+
+    def is_fresh(self, cache_key: str, stored_at: float, now: Optional[float] = None) -> bool:
+        ttl = self.ttl_for(cache_key)
+        return ttl is None or ((now or time.time()) - stored_at) <= ttl
+
+
+class MemoryCache:
+    """
+    Bounded in-process LRU tier in front of a CacheStore, keyed like the disk cache.
+
+    Holds the decoded objects, so a hit costs no I/O and no JSON parsing. The
+    objects are shared with every caller that asks for the same key: treat
+    cached responses as read-only and copy before modifying them.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (data, stored_at) or None, marking the entry as most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: str, data: Any, stored_at: Optional[float] = None) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (data, stored_at if stored_at is not None else time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def touch(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], time.time())
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte size such as "500MB", "2G" or "1048576"."""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMGT]?)B?\s*', str(value).upper())
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** " KMGT".index(unit or " "))
+
+
+def parse_duration(value: str) -> float:
+    """Parse a duration such as "30d", "12h", "15m" or "90" (seconds)."""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*', str(value).lower())
+    if not match:
+        raise ValueError(f"Invalid duration: {value}")
+    number, unit = match.groups()
+    return float(number) * {'': 1, 's': 1, 'm': 60, 'h': HOUR, 'd': DAY}[unit]
+
+
+class CacheBatch:
+    """
+    Writes buffered by one `CacheStore.batch()`. Only the thread that opened it and
+    the worker threads running functions wrapped with `bind()` write into it; other
+    threads (e.g. other repositories on the shared scheduler) keep writing through.
+    The buffer is flushed whenever it reaches `max_pending` entries and when the
+    batch closes, so memory stays bounded and a crash loses at most one buffer.
+    """
+
+    def __init__(self, store: "CacheStore", max_pending: int):
+        self.store = store
+        self.max_pending = max_pending
+        self.pending: Dict[str, Any] = {}
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def add(self, key: str, data: Any) -> None:
+        with self._lock:
+            if not self.closed:
+                self.pending[key] = data
+                if len(self.pending) < self.max_pending:
+                    return
+                items, self.pending = list(self.pending.items()), {}
+            else:
+                items = [(key, data)]
+        self.store.set_many(items)
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            if key in self.pending:
+                return True, self.pending[key]
+        return False, None
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self.pending.pop(key, None)
+
+    def flush(self, close: bool = False) -> None:
+        with self._lock:
+            items, self.pending = list(self.pending.items()), {}
+            self.closed = self.closed or close
+        if items:
+            self.store.set_many(items)
+
+    def bind(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap fn so that the cache writes it makes (on any thread) go into this batch."""
+        local = self.store._local
+
+        def bound(*args: Any, **kwargs: Any) -> Any:
+            previous = getattr(local, 'batch', None)
+            local.batch = self
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                local.batch = previous
+        return bound
+
+
+class CacheStore:
+    """
+    Storage backend for GitHubAPIClient's response cache.
+
+    Entries are addressed by the hashed request key produced by
+    GitHubAPIClient._get_cache_key and remember when they were stored (for
+    TTLs) and last read (for LRU eviction). Subclasses implement the `_read`,
+    `_write`, `_delete`, `_touch` and `_iter_entries` hooks; this base class adds:
+
+    - write batching: inside `batch()` the writes of the opening thread (and of
+      the workers it binds, see CacheBatch) are buffered, still visible to `get`,
+      and flushed every batch_max_pending entries and when the outermost batch exits;
+    - a byte budget: with `max_bytes` set, least recently used entries are
+      evicted (down to 90% of the budget) whenever the store grows past it.
+    """
+
+    name = "base"
+    # How many writes between two budget checks (a check scans every entry)
+    evict_check_interval = 500
+    # Buffered writes per batch before an intermediate flush
+    batch_max_pending = 200
+
+    def __init__(self, cache_dir: str, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        # Batch of the current thread (thread-local), and every open batch for lookups
+        self._local = threading.local()
+        self._batches: List[CacheBatch] = []
+        self._writes_since_check = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (data, stored_at) or None."""
+        with self._lock:
+            batches = list(self._batches)
+        for batch in batches:
+            found, data = batch.lookup(key)
+            if found:
+                return data, time.time()
+        return self._read(key)
+
+    def set(self, key: str, data: Any) -> None:
+        batch = getattr(self._local, 'batch', None)
+        if batch is not None:
+            batch.add(key, data)
+            return
+        self._write(key, data)
+        self._after_writes(1)
+
+    def set_many(self, items: Iterable[Tuple[str, Any]]) -> None:
+        items = list(items)
+        if items:
+            self._write_many(items)
+            self._after_writes(len(items))
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as freshly stored (e.g. after a 304 Not Modified)."""
+        self._touch(key)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            batches = list(self._batches)
+        for batch in batches:
+            batch.discard(key)
+        self._delete(key)
+
+    @contextmanager
+    def batch(self) -> Iterator[CacheBatch]:
+        """
+        Buffer this thread's writes (and those of functions wrapped with the yielded
+        batch's `bind()`) and write them in groups (one transaction each for SQLite).
+        A batch opened inside another one on the same thread joins the outer batch.
+        """
+        current = getattr(self._local, 'batch', None)
+        if current is not None:
+            yield current
+            return
+        batch = CacheBatch(self, self.batch_max_pending)
+        with self._lock:
+            self._batches.append(batch)
+        self._local.batch = batch
+        try:
+            yield batch
+        finally:
+            self._local.batch = None
+            try:
+                batch.flush(close=True)
+            finally:
+                with self._lock:
+                    self._batches.remove(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count, total size and age range of the cache."""
+        count = 0
+        total = 0
+        oldest = None
+        newest = None
+        for _, size, stored_at, _ in self._iter_entries():
+            count += 1
+            total += size
+            oldest = stored_at if oldest is None else min(oldest, stored_at)
+            newest = stored_at if newest is None else max(newest, stored_at)
+        return {
+            'backend': self.name,
+            'cache_dir': self.cache_dir,
+            'entries': count,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+            'oldest_stored_at': oldest,
+            'newest_stored_at': newest,
+        }
+
+    def prune(self, max_bytes: Optional[int] = None, max_age: Optional[float] = None) -> Dict[str, int]:
+        """
+        Delete entries stored more than `max_age` seconds ago, then evict least
+        recently used entries until the cache fits in `max_bytes`.
+        Returns the number of removed entries and bytes.
+        """
+        now = time.time()
+        entries = list(self._iter_entries())
+        removed = 0
+        freed = 0
+        kept = []
+        for key, size, stored_at, accessed_at in entries:
+            if max_age is not None and now - stored_at > max_age:
+                self._delete(key)
+                removed += 1
+                freed += size
+            else:
+                kept.append((key, size, stored_at, accessed_at))
+        if max_bytes is not None:
+            total = sum(size for _, size, _, _ in kept)
+            for key, size, _, _ in sorted(kept, key=lambda entry: entry[3]):
+                if total <= max_bytes:
+                    break
+                self._delete(key)
+                total -= size
+                removed += 1
+                freed += size
+        return {'removed': removed, 'freed_bytes': freed}
+
+    def close(self) -> None:
+        pass
+
+    def _after_writes(self, count: int) -> None:
+        if not self.max_bytes:
+            return
+        with self._lock:
+            self._writes_since_check += count
+            if self._writes_since_check < self.evict_check_interval:
+                return
+            self._writes_since_check = 0
+        if self.stats()['bytes'] > self.max_bytes:
+            self.prune(max_bytes=int(self.max_bytes * 0.9))
+
+    # Backend hooks
+    def _read(self, key: str) -> Optional[Tuple[Any, float]]:
+        raise NotImplementedError
+
+    def _write(self, key: str, data: Any) -> None:
+        raise NotImplementedError
+
+    def _write_many(self, items: Iterable[Tuple[str, Any]]) -> None:
+        for key, data in items:
+            self._write(key, data)
+
+    def _delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def _touch(self, key: str) -> None:
+        raise NotImplementedError
+
+    def _iter_entries(self) -> Iterator[Tuple[str, int, float, float]]:
+        """Yield (key, size_bytes, stored_at, accessed_at) for every entry."""
+        raise NotImplementedError
+
+
+class FlatFileCacheStore(CacheStore):
+    """
+    Legacy layout: one pretty-printed JSON file per request in a flat directory.
+    The file mtime is the store time and the atime (set explicitly on read,
+    so noatime mounts do not matter) is the last access.
+    """
+
+    name = "files"
+    suffix = ""
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def _load(self, path: str) -> Any:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _read_path(self, path: str) -> Optional[Tuple[Any, float]]:
+        try:
+            stored_at = os.stat(path).st_mtime
+            data = self._load(path)
+            os.utime(path, (time.time(), stored_at))
+        except FileNotFoundError:
+            return None
+        return data, stored_at
+
+    def _read(self, key: str) -> Optional[Tuple[Any, float]]:
+        return self._read_path(self._path(key))
+
+    def _write(self, key: str, data: Any) -> None:
+        with open(self._path(key), 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def _delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _touch(self, key: str) -> None:
+        try:
+            os.utime(self._path(key), None)
+        except FileNotFoundError:
+            pass
+
+    def _scan(self, directory: str, suffix: str) -> Iterator[Tuple[str, int, float, float]]:
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith(".json" + suffix):
+                        st = entry.stat()
+                        key = entry.name[:len(entry.name) - len(suffix)] if suffix else entry.name
+                        yield key, st.st_size, st.st_mtime, st.st_atime
+        except FileNotFoundError:
+            return
+
+    def _iter_entries(self) -> Iterator[Tuple[str, int, float, float]]:
+        return self._scan(self.cache_dir, "")
+
+
+class ShardedCacheStore(FlatFileCacheStore):
+    """
+    Gzip-compressed compact JSON, sharded by the first two hex digits of the
+    key (cache/ab/abcdef....json.gz) so no directory holds more than a few
+    hundred files. Entries still in the legacy flat layout are read as a
+    fallback, so an existing cache keeps working and is rewritten on refresh.
+    """
+
+    name = "sharded"
+
+    def __init__(self, cache_dir: str, max_bytes: Optional[int] = None, compresslevel: int = 6):
+        super().__init__(cache_dir, max_bytes=max_bytes)
+        self.compresslevel = compresslevel
+
+    def _shard_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".gz")
+
+    def _read(self, key: str) -> Optional[Tuple[Any, float]]:
+        entry = self._read_path(self._shard_path(key))
+        return entry if entry is not None else super()._read(key)
+
+    def _load(self, path: str) -> Any:
+        if not path.endswith(".gz"):
+            return super()._load(path)
+        with gzip.open(path, 'rb') as f:
+            return _decode(f.read())
+
+    def _write(self, key: str, data: Any) -> None:
+        path = self._shard_path(key)
+        shard = os.path.dirname(path)
+        os.makedirs(shard, exist_ok=True)
+        # Write to a temp file and rename so concurrent readers never see partial data
+        fd, tmp_path = tempfile.mkstemp(dir=shard, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(_encode(data), compresslevel=self.compresslevel))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        super()._delete(key)
+
+    def _delete(self, key: str) -> None:
+        try:
+            os.remove(self._shard_path(key))
+        except FileNotFoundError:
+            pass
+        super()._delete(key)
+
+    def _touch(self, key: str) -> None:
+        path = self._shard_path(key)
+        if os.path.exists(path):
+            os.utime(path, None)
+        else:
+            super()._touch(key)
+
+    def _iter_entries(self) -> Iterator[Tuple[str, int, float, float]]:
+        yield from super()._iter_entries()
+        with os.scandir(self.cache_dir) as it:
+            shards = [entry.path for entry in it if entry.is_dir() and len(entry.name) == 2]
+        for shard in shards:
+            yield from self._scan(shard, ".gz")
+
+
+class SQLiteCacheStore(CacheStore):
+    """
+    Single-file cache (cache/cache.sqlite3) with zlib-compressed JSON values.
+    One connection is shared by all threads behind a lock; batched writes go
+    through a single transaction. Read times for LRU are buffered in memory
+    and written back in bulk.
+    """
+
+    name = "sqlite"
+    access_flush_interval = 500
+
+    def __init__(self, cache_dir: str, max_bytes: Optional[int] = None, filename: str = "cache.sqlite3"):
+        super().__init__(cache_dir, max_bytes=max_bytes)
+        self.db_path = os.path.join(cache_dir, filename)
+        self._db_lock = threading.Lock()
+        self._accessed: Dict[str, float] = {}
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._db_lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, data BLOB NOT NULL, "
+                "stored_at REAL NOT NULL DEFAULT 0, accessed_at REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+            for column in ("stored_at", "accessed_at"):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE entries ADD COLUMN {column} REAL NOT NULL DEFAULT 0")
+            self._conn.commit()
+
+    def _read(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._db_lock:
+            row = self._conn.execute("SELECT data, stored_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= self.access_flush_interval:
+                self._flush_access_locked()
+        return _decode(zlib.decompress(row[0])), row[1]
+
+    def _write(self, key: str, data: Any) -> None:
+        self._write_many([(key, data)])
+
+    def _write_many(self, items: Iterable[Tuple[str, Any]]) -> None:
+        now = time.time()
+        rows = [(key, zlib.compress(_encode(data)), now, now) for key, data in items]
+        with self._db_lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries (key, data, stored_at, accessed_at) VALUES (?, ?, ?, ?)", rows
+                )
+
+    def _delete(self, key: str) -> None:
+        with self._db_lock:
+            self._accessed.pop(key, None)
+            with self._conn:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def _touch(self, key: str) -> None:
+        now = time.time()
+        with self._db_lock:
+            with self._conn:
+                self._conn.execute("UPDATE entries SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+
+    def _flush_access_locked(self) -> None:
+        if self._accessed:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                    [(accessed_at, key) for key, accessed_at in self._accessed.items()],
+                )
+            self._accessed = {}
+
+    def _iter_entries(self) -> Iterator[Tuple[str, int, float, float]]:
+        with self._db_lock:
+            self._flush_access_locked()
+            rows = self._conn.execute("SELECT key, length(data), stored_at, accessed_at FROM entries").fetchall()
+        return iter(rows)
+
+    def prune(self, max_bytes: Optional[int] = None, max_age: Optional[float] = None) -> Dict[str, int]:
+        result = super().prune(max_bytes=max_bytes, max_age=max_age)
+        if result['removed']:
+            with self._db_lock:
+                self._conn.execute("VACUUM")
+        return result
+
+    def close(self) -> None:
+        with self._db_lock:
+            self._flush_access_locked()
+            self._conn.close()
+
+
+CACHE_BACKENDS = {
+    FlatFileCacheStore.name: FlatFileCacheStore,
+    ShardedCacheStore.name: ShardedCacheStore,
+    SQLiteCacheStore.name: SQLiteCacheStore,
+}
+
+
+def create_cache_store(backend: str, cache_dir: str, max_bytes: Optional[int] = None) -> CacheStore:
+    """Instantiate a cache backend by name ("sharded", "sqlite" or "files")."""
+    try:
+        store_class = CACHE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown cache backend: {backend} (choose from {', '.join(CACHE_BACKENDS)})")
+    return store_class(cache_dir, max_bytes=max_bytes)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class HistoryCheckpoint:
+    """
+    Append-only checkpoint for a long paginated walk (e.g. a repository's commit history).
+
+    The file is JSON Lines: a header with the walk's `signature` (owner, repo, time
+    window, branches, ...) followed by one line per page holding the position reached
+    after that page and the nodes it added. Appending keeps each save O(page), and a
+    line cut short by a crash is simply ignored on load.
+
+    Args:
+        path: Checkpoint file (created on the first record)
+        signature: Parameters of the walk; a checkpoint written for other parameters
+            is discarded instead of resumed. Only stable inputs belong here (the
+            caller's since/until, not windows derived from the clock or live counts)
+
+    `plan` is stored in the header next to the signature: whatever the walk derived
+    before its first page (e.g. the time windows), so a resumed run reuses it instead
+    of recomputing it against data that has moved since.
+    """
+
+    def __init__(self, path: str, signature: Dict[str, Any]):
+        self.path = path
+        self.signature = signature
+        self.plan: Optional[Any] = None
+        self._started = False
+
+    def load(self) -> Tuple[Dict[str, Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Return (nodes by SHA, last position) from a previous run, or ({}, None)."""
+        nodes: Dict[str, Dict[str, Any]] = {}
+        position: Optional[Dict[str, Any]] = None
+        if not os.path.exists(self.path):
+            return nodes, position
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for index, line in enumerate(f):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # torn last line
+                if index == 0:
+                    if record.get('signature') != self.signature:
+                        print(f"[CHECKPOINT] Ignoring {self.path}: written for other parameters")
+                        return {}, None
+                    self.plan = record.get('plan')
+                    continue
+                for node in record.get('nodes') or []:
+                    if node.get('oid'):
+                        nodes[node['oid']] = node
+                position = record.get('position')
+
+        # Keep appending to this file
+        self._started = position is not None
+        return nodes, position
+
+    def record(self, position: Dict[str, Any], nodes: List[Dict[str, Any]]) -> None:
+        """Append the position reached and the nodes collected since the last record."""
+        if not self._started:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'signature': self.signature, 'plan': self.plan}, ensure_ascii=False) + "\n")
+            self._started = True
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'position': position, 'nodes': nodes}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clear(self) -> None:
+        """Remove the checkpoint once the walk has completed."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._started = False
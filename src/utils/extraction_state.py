@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional
+
+# Kept next to the bronze files (and committed with them by the workflow) so the
+# next scheduled run knows where the previous one stopped. The subdirectory keeps
+# it out of the data/bronze/<entity>_*.json globs used downstream, and
+# registry_manager.scan_data_directory skips it, so it is not listed as bronze data.
+STATE_DIRNAME = "_state"
+DEFAULT_STATE_DIR = f"data/bronze/{STATE_DIRNAME}"
+
+
+class ExtractionState:
+    """
+    High-water marks of an incremental extraction, one entry per repository,
+    persisted as a small JSON file (e.g. data/bronze/_state/commits.json).
+
+    Args:
+        path: State file; missing or unreadable files start an empty state
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.marks: Dict[str, Any] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.marks = json.load(f) or {}
+            except (OSError, json.JSONDecodeError):
+                print(f"[STATE][WARN] Could not read {path}, starting a full extraction")
+                self.marks = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.marks.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        self.marks[key] = value
+
+    def save(self) -> None:
+        """Write atomically, so a crash never leaves a truncated state file."""
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.marks, f, indent=2, ensure_ascii=False, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def load_records(filepath: str) -> List[Dict[str, Any]]:
+    """Records of a bronze list file without its `_metadata` entry ([] if missing)."""
+    if not os.path.exists(filepath):
+        return []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        return []
+    return [r for r in data if isinstance(r, dict) and '_metadata' not in r]
+
+
+def merge_records(existing: Iterable[Dict[str, Any]], updates: Iterable[Dict[str, Any]], key: str) -> List[Dict[str, Any]]:
+    """
+    Upsert `updates` into `existing` by `key`: changed records replace the old
+    version in place, new ones are put first (APIs list newest first).
+    """
+    updates_by_key: Dict[Any, Dict[str, Any]] = {}
+    for record in updates:
+        updates_by_key[record.get(key)] = record
+    merged = []
+    replaced = set()
+    for record in existing:
+        record_key = record.get(key)
+        if record_key in updates_by_key:
+            merged.append(updates_by_key[record_key])
+            replaced.add(record_key)
+        else:
+            merged.append(record)
+    new_records = [record for record_key, record in updates_by_key.items() if record_key not in replaced]
+    return new_records + merged
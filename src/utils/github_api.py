@@ -4,77 +4,266 @@ import os
 import json
 import time
 import hashlib
+import tempfile
+import itertools
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 import threading
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Any, Tuple, Iterator, Callable, Sequence, Set, Union
+from urllib.parse import parse_qs, urlsplit
+
+from utils.rate_limit import AdaptivePageSize, RateLimitGovernor
+from utils.token_pool import TokenPool
+from utils.checkpoint import HistoryCheckpoint
+from utils.cache_store import CachePolicy, CacheStore, MemoryCache, create_cache_store
 
 class GitHubAPIClient:
-    def __init__(self, token: str, cache_dir: str = "cache"):
-        self.token = token
+    def __init__(self, token: Union[str, Sequence[str]], cache_dir: str = "cache", pool_size: int = 5, revalidate: bool = False, cache_backend: str = "sharded", cache_policy: Optional[CachePolicy] = None, cache_max_bytes: Optional[int] = None, memory_cache_size: int = 1024):
+        # One token or a pool of tokens (see utils.token_pool.load_tokens). Requests are
+        # routed to the token with the most remaining quota; the first is the primary.
+        self.token_pool = TokenPool([token] if isinstance(token, str) or token is None else list(token))
+        self.token = self.token_pool.tokens[0]
         self.headers = {
-            "Authorization": f"Bearer {token}",
+            "Authorization": f"Bearer {self.token}",
             "Accept": "application/vnd.github+json"
         }
         self.cache_dir = cache_dir
         if not os.path.exists(cache_dir):
             os.makedirs(cache_dir)
+        # Response cache backend: "sharded" (gzip files in cache/ab/...), "sqlite"
+        # (single cache.sqlite3 file) or "files" (legacy flat one-JSON-per-URL).
+        # cache_max_bytes caps its size with LRU eviction.
+        self.cache_store: CacheStore = create_cache_store(cache_backend, cache_dir, max_bytes=cache_max_bytes)
+        # Per-endpoint TTLs: SHA-addressed data never expires, list endpoints expire quickly
+        self.cache_policy = cache_policy or CachePolicy()
+        # In-process LRU tier in front of cache_store (0 disables it). Cached objects
+        # are shared between callers, so responses must be treated as read-only.
+        self.memory_cache = MemoryCache(memory_cache_size)
+        # Single-flight: identical requests already in flight, keyed like the cache
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self.coalesced_requests = 0
         # GraphQL endpoint
         self.graphql_url = "https://api.github.com/graphql"
+        # Pooled keep-alive session shared by REST and GraphQL calls.
+        # pool_size also drives the worker count of the parallel REST fallback,
+        # so every worker can hold its own open connection to api.github.com.
+        self.pool_size = pool_size
+        self.session = self._build_session(pool_size)
+        # Quota-aware pacing shared by REST and GraphQL (replaces fixed sleeps);
+        # each pooled token has its own governor, this is the primary token's
+        self.rate_governor: RateLimitGovernor = self.token_pool.primary_governor
+        # When True, cached REST responses are revalidated with If-None-Match /
+        # If-Modified-Since instead of being served as-is. A 304 reuses the cached
+        # body and does not count against the rate limit.
+        self.revalidate = revalidate
+
+    @staticmethod
+    def _build_session(pool_size: int) -> requests.Session:
+        """Create a requests.Session with a connection pool sized for our workers."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self) -> None:
+        """Close pooled connections held by the HTTP session and the cache backend."""
+        self.session.close()
+        self.cache_store.close()
     
     def _get_cache_key(self, key: str) -> str:
         """Create a stable cache key from an arbitrary string."""
         return hashlib.md5(key.encode()).hexdigest() + ".json"
     
     def _cache_get(self, cache_key: str) -> Optional[Any]:
-        """Get response from cache if exists"""
-        cache_file = os.path.join(self.cache_dir, self._get_cache_key(cache_key))
-        if os.path.exists(cache_file):
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return None
+        """Get response from cache if exists and is still fresh"""
+        data, fresh = self._cache_lookup(cache_key)
+        return data if fresh else None
+    
+    def _cache_lookup(self, cache_key: str) -> Tuple[Optional[Any], bool]:
+        """Get a cached response even if expired, plus whether it is still within its TTL."""
+        key = self._get_cache_key(cache_key)
+        entry = self.memory_cache.get(key)
+        if entry is None:
+            entry = self.cache_store.get_entry(key)
+            if entry is None:
+                return None, False
+            self.memory_cache.set(key, *entry)
+        data, stored_at = entry
+        return data, self.cache_policy.is_fresh(cache_key, stored_at)
     
     def _cache_set(self, cache_key: str, data: Any) -> None:
-        cache_file = os.path.join(self.cache_dir, self._get_cache_key(cache_key))
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        key = self._get_cache_key(cache_key)
+        self.cache_store.set(key, data)
+        self.memory_cache.set(key, data)
+    
+    def _cache_touch(self, cache_key: str) -> None:
+        """Mark a cached response as freshly stored (after a 304 Not Modified)."""
+        key = self._get_cache_key(cache_key)
+        self.cache_store.touch(key)
+        self.memory_cache.touch(key)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the in-memory tier and number of coalesced requests."""
+        return {'memory': self.memory_cache.stats(), 'coalesced_requests': self.coalesced_requests}
+    
+    def _single_flight(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Run `fetch` at most once at a time per key. Callers arriving while it is in
+        flight wait for it and share its result (or exception) instead of sending
+        a duplicate request and writing the same cache entry.
+        """
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = Future()
+            else:
+                self.coalesced_requests += 1
+        if not leader:
+            return flight.result()
+        try:
+            result = fetch()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    def cache_batch(self):
+        """
+        Context manager that groups cache writes (a single transaction on SQLite). It
+        yields a CacheBatch: wrap the functions handed to a thread pool with its
+        `bind()` so the workers' writes are grouped too; other threads are unaffected.
+        """
+        return self.cache_store.batch()
+    
+    def _cache_get_validators(self, cache_key: str) -> Optional[Dict[str, str]]:
+        """Get the ETag / Last-Modified (and Link) stored for a cached response (never expires)."""
+        return self._cache_lookup(f"{cache_key}#validators")[0]
+    
+    def _cache_set_validators(self, cache_key: str, headers: Any) -> None:
+        """Store the validators of a 200 response next to its cached body."""
+        if headers is None or not hasattr(headers, "get"):
+            return
+        validators = {
+            name: headers.get(header)
+            for name, header in (("etag", "ETag"), ("last_modified", "Last-Modified"), ("link", "Link"))
+            if isinstance(headers.get(header), str)
+        }
+        if validators.get("etag") or validators.get("last_modified"):
+            self._cache_set(f"{cache_key}#validators", validators)
+    
+    @staticmethod
+    def _conditional_headers(validators: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from stored validators."""
+        headers = {}
+        if validators and validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators and validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+    
+    @staticmethod
+    def _not_modified_headers(headers: Any, validators: Optional[Dict[str, str]]) -> CaseInsensitiveDict:
+        """Headers for a 304 reply, restoring the cached Link header so pagination still works."""
+        merged = CaseInsensitiveDict(headers if hasattr(headers, "items") else {})
+        if validators and validators.get("link") and "Link" not in merged:
+            merged["Link"] = validators["link"]
+        return merged
     
     def get_with_cache(self, url: str, use_cache: bool = True, retries: int = 3, backoff_base: float = 1.0, return_headers: bool = False, silent: bool = False, log_prefix: str = "REST") -> Any:
 
+        cached = None
+        validators = None
+        request_headers = self.headers
         if use_cache:
-            cached = self._cache_get(url)
+            cached, fresh = self._cache_lookup(url)
             if cached is not None:
-                if not silent:
-                    print(f"✓ Using cached data for: {url}")
-                return cached if not return_headers else (cached, None)
+                if fresh and not self.revalidate:
+                    if not silent:
+                        print(f"✓ Using cached data for: {url}")
+                    return cached if not return_headers else (cached, None)
+                # Expired or revalidating: send a conditional request. An entry
+                # without validators is simply re-downloaded.
+                validators = self._cache_get_validators(url)
+                request_headers = {**self.headers, **self._conditional_headers(validators)}
         
         if not silent:
             print(f"→ Fetching from API: {url}")
+        result = self._single_flight(
+            f"GET {url}",
+            lambda: self._fetch_rest(
+                url, use_cache, request_headers, cached, validators, retries, backoff_base, silent,
+                log_prefix if not return_headers and not silent else None,
+            ),
+        )
+        if result is None:
+            return None
+        data, headers = result
+        return data if not return_headers else (data, headers)
+
+    def _fetch_rest(
+        self,
+        url: str,
+        use_cache: bool,
+        request_headers: Dict[str, str],
+        cached: Any,
+        validators: Optional[Dict[str, str]],
+        retries: int,
+        backoff_base: float,
+        silent: bool,
+        log_prefix: Optional[str],
+    ) -> Optional[Tuple[Any, Any]]:
+        """Send the GET behind get_with_cache (with retries). Returns (data, headers) or None."""
         attempt = 0
         while attempt < retries:
             try:
-                response = requests.get(url, headers=self.headers, timeout=35)
+                token = self.token_pool.acquire("core")
+                governor = self.token_pool.governor(token)
+                response = self.session.get(url, headers={**request_headers, "Authorization": f"Bearer {token}"}, timeout=35)
+                governor.update_from_headers(response.headers, "core")
 
                 if response.status_code == 200:
                     data = response.json()
                     if use_cache:
                         self._cache_set(url, data)
-                    if not return_headers and not silent:
+                        self._cache_set_validators(url, response.headers)
+                    if log_prefix:
                         self._log_rate_limit(response, prefix=log_prefix)
-                    return data if not return_headers else (data, response.headers)
-                elif response.status_code == 403:
-                    print(f"[ERROR] API request forbidden (403) - might be private or rate limited: {response.text}")
-                    if "rate limit" in response.text.lower():
-                        print("Rate limit exceeded. Waiting 60 seconds...")
-                        time.sleep(60)
-                        # After sleep, continue loop to retry
+                    return data, response.headers
+                elif response.status_code == 304 and cached is not None:
+                    self._cache_touch(url)
+                    if not silent:
+                        print(f"✓ Not modified (304), using cached data for: {url}")
+                    return cached, self._not_modified_headers(response.headers, validators)
+                elif response.status_code in (403, 429):
+                    print(f"[ERROR] API request forbidden ({response.status_code}) - might be private or rate limited: {response.text}")
+                    if response.status_code == 429 or "rate limit" in response.text.lower():
+                        blocked_for = governor.penalize("core", response.headers)
+                        if len(self.token_pool) > 1:
+                            print(f"Rate limit exceeded for token ...{token[-4:]} (blocked {blocked_for:.0f}s). Failing over to the other tokens...")
+                        else:
+                            print(f"Rate limit exceeded. Waiting {blocked_for:.0f} seconds...")
+                        # The governor blocks the next acquire() until the window reopens
                     else:
                         print("Access forbidden - resource might be private or require different permissions")
                         return None
                 elif response.status_code == 404:
                     print(f"[ERROR] Resource not found (404): {url}")
                     return None
+                elif response.status_code == 401 and len(self.token_pool) > 1 and self.token_pool.mark_revoked(token):
+                    print(f"[WARN] Token ...{token[-4:]} rejected (401) - switching to another token")
+                    continue
                 elif 500 <= response.status_code < 600:
                     attempt += 1
                     wait = backoff_base * (2 ** (attempt - 1))
@@ -99,32 +288,96 @@ class GitHubAPIClient:
     # ----------------------
     # GraphQL support (API v4)
     # ----------------------
-    def graphql(self, query: str, variables: Optional[Dict[str, Any]] = None, use_cache: bool = True, timeout: int = 4) -> Any:
-        """Execute a GraphQL query against GitHub's v4 API with simple timeout handling."""
+    # Failure kinds (see graphql's `outcome`) caused by the size of the request: a
+    # smaller page may succeed. Anything else (rate limit, 403, query errors) will not.
+    GRAPHQL_OVERLOAD_FAILURES = frozenset({'timeout', 'server_error', 'service_unavailable'})
+
+    def graphql(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True,
+        timeout: int = 4,
+        allow_partial: bool = False,
+        cache_ignore: Sequence[str] = (),
+        outcome: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Execute a GraphQL query against GitHub's v4 API with simple timeout handling.
+
+        With allow_partial=True a response carrying both `data` and `errors` is returned
+        as-is (not cached) so callers of aliased queries can keep the fields that resolved.
+
+        Args:
+            cache_ignore: Variables left out of the cache key, e.g. a page size that only
+                changes how much of the same walk one response covers
+            outcome: Filled with 'cached' (served from cache) and, when None is returned,
+                'failure': 'timeout', 'server_error', 'service_unavailable' (see
+                GRAPHQL_OVERLOAD_FAILURES), 'rate_limited', 'forbidden' or 'error'
+        """
+        if outcome is None:
+            outcome = {}
+        outcome['cached'] = False
         payload = {"query": query, "variables": variables or {}}
 
         # Build a deterministic cache key based on query + variables
-        cache_key = None
-        if use_cache:
-            try:
-                cache_key = "graphql:" + hashlib.md5(
-                    (query + "::" + json.dumps(payload["variables"], sort_keys=True, ensure_ascii=False)).encode("utf-8")
-                ).hexdigest()
-                cached = self._cache_get(cache_key)
-                if cached is not None:
-                    print("[GRAPHQL] ✓ Using cached response")
-                    return cached
-            except Exception:
-                # Fallback to no-cache if serialization fails
-                cache_key = None
+        try:
+            key_variables = {k: v for k, v in payload["variables"].items() if k not in cache_ignore}
+            cache_key = "graphql:" + hashlib.md5(
+                (query + "::" + json.dumps(key_variables, sort_keys=True, ensure_ascii=False)).encode("utf-8")
+            ).hexdigest()
+        except Exception:
+            # Fallback to no-cache (and no coalescing) if serialization fails
+            cache_key = None
+        if use_cache and cache_key:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                print("[GRAPHQL] ✓ Using cached response")
+                outcome['cached'] = True
+                return cached
+
+        if cache_key is None:
+            return self._post_graphql(payload, None, timeout, allow_partial, outcome)
+        # Single-flight: identical concurrent queries share one POST. The shared result
+        # carries the failure kind too, so followers see the leader's timeout or 502.
+        def post() -> Tuple[Any, Optional[str]]:
+            leader_outcome: Dict[str, Any] = {}
+            data = self._post_graphql(payload, cache_key if use_cache else None, timeout, allow_partial, leader_outcome)
+            return data, leader_outcome.get('failure')
+
+        result, failure = self._single_flight(cache_key + (":partial" if allow_partial else ""), post)
+        if result is None:
+            outcome['failure'] = failure or 'error'
+        return result
 
+    def _post_graphql(
+        self,
+        payload: Dict[str, Any],
+        cache_key: Optional[str],
+        timeout: int,
+        allow_partial: bool = False,
+        outcome: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Send the POST behind graphql(); caches the response under cache_key when given."""
+        if outcome is None:
+            outcome = {}
+        token = self.token_pool.acquire("graphql")
+        governor = self.token_pool.governor(token)
         headers = dict(self.headers)
+        headers["Authorization"] = f"Bearer {token}"
         headers["Content-Type"] = "application/json"
 
         try:
-            response = requests.post(self.graphql_url, headers=headers, json=payload, timeout=timeout)
+            response = self.session.post(self.graphql_url, headers=headers, json=payload, timeout=timeout)
+            governor.update_from_headers(response.headers, "graphql")
             if response.status_code == 200:
                 data = response.json()
+                if isinstance(data, dict):
+                    governor.update_from_graphql((data.get("data") or {}).get("rateLimit"))
+                if "errors" in data and allow_partial and data.get("data"):
+                    # Aliased batch: the caller splits errors by alias; don't cache partial data
+                    print(f"[GRAPHQL][WARN] Partial response ({len(data['errors'])} errors)")
+                    return data
                 if "errors" in data:
                     # Check if errors are SERVICE_UNAVAILABLE (commit stats unavailable)
                     errors = data.get('errors', [])
@@ -137,37 +390,140 @@ class GitHubAPIClient:
                     if has_stats_unavailable:
                         # Stats unavailable - treat as failure to trigger REST fallback
                         print(f"[GRAPHQL][WARN] Commit stats unavailable (SERVICE_UNAVAILABLE)")
+                        outcome['failure'] = 'service_unavailable'
                         return None  # Trigger REST fallback
                     else:
-                        # Other critical errors
+                        # Other critical errors ("... may be the result of a timeout" is an overload)
                         print(f"[GRAPHQL][ERROR] Returned errors: {data['errors']}")
+                        timed_out = any(
+                            isinstance(err, dict) and (err.get('type') == 'TIMEOUT' or 'timeout' in str(err.get('message', '')).lower())
+                            for err in errors
+                        )
+                        outcome['failure'] = 'timeout' if timed_out else 'error'
                         return None
-                if use_cache and cache_key:
+                if cache_key:
                     self._cache_set(cache_key, data)
                 # Don't log rate limit for GraphQL - already logged after processing commits
                 return data
-            elif response.status_code == 403:
-                if "rate limit" in response.text.lower():
+            elif response.status_code in (403, 429):
+                if response.status_code == 429 or "rate limit" in response.text.lower():
+                    governor.penalize("graphql", response.headers)
                     print(f"[GRAPHQL][WARN] Rate limit exceeded")
+                    outcome['failure'] = 'rate_limited'
                 else:
                     print(f"[GRAPHQL][ERROR] Forbidden (403)")
+                    outcome['failure'] = 'forbidden'
                 return None
+            elif response.status_code == 401 and len(self.token_pool) > 1 and self.token_pool.mark_revoked(token):
+                print(f"[GRAPHQL][WARN] Token ...{token[-4:]} rejected (401) - switching to another token")
+                return self._post_graphql(payload, cache_key, timeout, allow_partial, outcome)
             elif response.status_code == 502:
                 print(f"[GRAPHQL][WARN] 502 (server overload)")
+                outcome['failure'] = 'server_error'
                 return None
             elif response.status_code in [500, 503]:
                 print(f"[GRAPHQL][WARN] {response.status_code}")
+                outcome['failure'] = 'server_error'
                 return None
             else:
                 print(f"[GRAPHQL][ERROR] Request failed: {response.status_code}")
+                outcome['failure'] = 'error'
                 return None
         except requests.exceptions.Timeout:
             print(f"[GRAPHQL][WARN] Timeout ({timeout}s)")
+            outcome['failure'] = 'timeout'
             return None
         except requests.exceptions.RequestException as e:
             print(f"[GRAPHQL][ERROR] Request error: {str(e)}")
+            outcome['failure'] = 'error'
             return None
 
+    # ----------------------
+    # Batched multi-repository GraphQL (aliases)
+    # ----------------------
+    # Estimated nodes per aliased request: keeps batched queries well below GitHub's
+    # node limit and the server-side timeout that expensive fields (commit stats) hit.
+    graphql_batch_node_budget = 500
+    graphql_batch_max_repos = 25
+
+    def graphql_repositories(
+        self,
+        repos: Sequence[Tuple[str, str]],
+        fields: Union[str, Callable[[Tuple[str, str]], str]],
+        node_cost: int = 1,
+        variables: Optional[Dict[str, Any]] = None,
+        variable_defs: str = "",
+        use_cache: bool = True,
+        timeout: int = 30,
+    ) -> Dict[Tuple[str, str], Optional[Dict[str, Any]]]:
+        """
+        Query many repositories per round trip by packing them into one document with
+        aliases (`r0: repository(...) { ... } r1: repository(...) { ... }`).
+
+        Args:
+            repos: (owner, name) pairs
+            fields: Selection set for each repository, or a callable building it per
+                repository (e.g. to inline a per-repository pagination cursor)
+            node_cost: Estimated nodes one repository's selection returns; batches are
+                sized so that the sum stays within graphql_batch_node_budget
+            variables: Variables shared by every aliased selection
+            variable_defs: Their declarations, e.g. "$pageSize: Int!, $since: GitTimestamp"
+
+        Returns:
+            Dict (owner, name) -> repository data, or None when the repository was not
+            found or its part of the response failed (callers fall back per repository)
+        """
+        repos = list(dict.fromkeys(repos))
+        batch_size = max(1, min(self.graphql_batch_max_repos, self.graphql_batch_node_budget // max(1, node_cost)))
+        results: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+        for i in range(0, len(repos), batch_size):
+            results.update(self._graphql_repository_batch(
+                repos[i:i + batch_size], fields, variables or {}, variable_defs, use_cache, timeout
+            ))
+        return results
+
+    def _graphql_repository_batch(
+        self,
+        repos: List[Tuple[str, str]],
+        fields: Union[str, Callable[[Tuple[str, str]], str]],
+        variables: Dict[str, Any],
+        variable_defs: str,
+        use_cache: bool,
+        timeout: int,
+    ) -> Dict[Tuple[str, str], Optional[Dict[str, Any]]]:
+        """One aliased request; a failed batch is split in half and retried."""
+        aliases = []
+        for idx, (owner, name) in enumerate(repos):
+            selection = fields((owner, name)) if callable(fields) else fields
+            aliases.append(
+                f"r{idx}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{ {selection} }}"
+            )
+        header = f"query({variable_defs})" if variable_defs else "query"
+        query = header + " {\n" + "\n".join(aliases) + "\nrateLimit { remaining resetAt limit cost }\n}"
+
+        data = self.graphql(query, variables, use_cache=use_cache, timeout=timeout, allow_partial=True)
+        if not data or not isinstance(data.get("data"), dict):
+            if len(repos) == 1:
+                return {repos[0]: None}
+            # Timeout / 502 on a large document: halve the batch instead of giving up on all of it
+            half = len(repos) // 2
+            print(f"[GRAPHQL][BATCH] Batch of {len(repos)} repositories failed, splitting into {half} + {len(repos) - half}")
+            results = self._graphql_repository_batch(repos[:half], fields, variables, variable_defs, use_cache, timeout)
+            results.update(self._graphql_repository_batch(repos[half:], fields, variables, variable_defs, use_cache, timeout))
+            return results
+
+        # Errors are reported per alias (path[0]); drop only the repositories they affect
+        failed = {
+            str(err.get("path")[0])
+            for err in data.get("errors") or []
+            if isinstance(err, dict) and err.get("path")
+        }
+        payload = data["data"]
+        return {
+            key: (None if f"r{idx}" in failed else payload.get(f"r{idx}"))
+            for idx, key in enumerate(repos)
+        }
+
     def _split_time_range(
         self,
         since: Optional[str],
@@ -225,6 +581,118 @@ class GitHubAPIClient:
         
         return ranges
 
+    # Adaptive time windows for long histories: a window holding more commits than this
+    # is bisected, so every window can be walked well within GraphQL's timeout.
+    # None disables the probes (plain equal chunks from _split_time_range).
+    history_window_max_commits: Optional[int] = 1000
+    history_window_min_seconds = 3600
+    history_window_probe_batch = 50
+
+    def _count_history_windows(
+        self,
+        owner: str,
+        repo: str,
+        branch: Optional[str],
+        windows: Sequence[Tuple[Optional[str], Optional[str]]],
+        use_cache: bool = True,
+    ) -> Optional[List[int]]:
+        """
+        Commit count of each (since, until) window, from `history(...) { totalCount }`
+        aliases on one target (up to history_window_probe_batch windows per request).
+        Returns None if a probe fails.
+        """
+        ref = f"ref(qualifiedName: {json.dumps('refs/heads/' + branch)})" if branch else "defaultBranchRef"
+        counts: List[int] = []
+        for start in range(0, len(windows), self.history_window_probe_batch):
+            chunk = windows[start:start + self.history_window_probe_batch]
+            aliases = []
+            for idx, (window_since, window_until) in enumerate(chunk):
+                args = "first: 1"
+                if window_since:
+                    args += f", since: {json.dumps(window_since)}"
+                if window_until:
+                    args += f", until: {json.dumps(window_until)}"
+                aliases.append(f"w{idx}: history({args}) {{ totalCount }}")
+            query = (
+                "query($owner: String!, $name: String!) { repository(owner: $owner, name: $name) { "
+                f"{ref} {{ target {{ ... on Commit {{ {' '.join(aliases)} }} }} }} }} }}"
+            )
+            data = self.graphql(query, {"owner": owner, "name": repo}, use_cache=use_cache, timeout=30)
+            repo_data = ((data or {}).get("data") or {}).get("repository") or {}
+            target = (repo_data.get("ref" if branch else "defaultBranchRef") or {}).get("target")
+            if not isinstance(target, dict):
+                return None
+            for idx in range(len(chunk)):
+                total = (target.get(f"w{idx}") or {}).get("totalCount")
+                if not isinstance(total, int):
+                    return None
+                counts.append(total)
+        return counts
+
+    def _plan_history_windows(
+        self,
+        owner: str,
+        repo: str,
+        branch: Optional[str],
+        since: Optional[str],
+        until: Optional[str],
+        chunks: int = 3,
+        use_cache: bool = True,
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Split [since, until] by commit density instead of by time alone: start from
+        `chunks` equal slices, count the commits of each (_count_history_windows) and
+        bisect every slice above history_window_max_commits, one probe request per
+        level, until each window is small enough or history_window_min_seconds long.
+        Empty windows are dropped. If a probe fails, the equal slices are used as is.
+        """
+        from datetime import datetime
+        
+        windows = self._split_time_range(since, until, chunks=chunks)
+        limit = self.history_window_max_commits
+        if limit is None or windows == [(None, None)]:
+            return windows
+        
+        def parse(value: str) -> datetime:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        
+        def fmt(value: datetime) -> str:
+            return value.isoformat().replace('+00:00', 'Z')
+        
+        counts = self._count_history_windows(owner, repo, branch, windows, use_cache)
+        if counts is None:
+            return windows
+        
+        planned: List[Tuple[Tuple[str, str], int]] = []
+        pending = list(zip(windows, counts))
+        levels = 0
+        while pending:
+            dense = []
+            for window, count in pending:
+                if count == 0:
+                    continue
+                start, end = parse(window[0]), parse(window[1])
+                if count <= limit or (end - start).total_seconds() <= self.history_window_min_seconds:
+                    planned.append((window, count))
+                else:
+                    middle = fmt(start + (end - start) / 2)
+                    dense.extend([(window[0], middle), (middle, window[1])])
+            if not dense:
+                break
+            levels += 1
+            counts = self._count_history_windows(owner, repo, branch, dense, use_cache)
+            if counts is None:
+                # Probe failed mid-way: keep the halves unprobed
+                planned.extend((window, limit) for window in dense)
+                break
+            pending = list(zip(dense, counts))
+        
+        planned.sort(key=lambda item: item[0][0])
+        if levels:
+            sizes = ", ".join(str(count) for _, count in planned)
+            print(f"  [GRAPHQL] Bisected {owner}/{repo} history into {len(planned)} windows ({sizes} commits)")
+        return [window for window, _ in planned]
+
     def get_active_unmerged_branches(
         self,
         owner: str,
@@ -292,32 +760,43 @@ class GitHubAPIClient:
             nodes = refs.get("nodes", [])
             
             # Filter by date and exclude default branch
-            for node in nodes:
-                branch_name = node.get("name")
-                if branch_name == default_branch:
-                    continue
-                
-                # Skip gh-pages and similar branches
-                if branch_name and branch_name.startswith("gh-pages"):
-                    continue
-                    
-                target = node.get("target", {})
-                commit_date = target.get("committedDate")
-                
-                if commit_date:
-                    commit_dt = datetime.fromisoformat(commit_date.replace('Z', '+00:00'))
-                    if commit_dt >= cutoff_date:
-                        active_branches.append(branch_name)
+            active_branches.extend(self._active_branch_names(nodes, default_branch, cutoff_date))
             
             page_info = refs.get("pageInfo", {})
             if not page_info.get("hasNextPage"):
                 break
             cursor = page_info.get("endCursor")
         
+        return self._unmerged_branches(owner, repo, default_branch, active_branches, use_cache)
+
+    @staticmethod
+    def _active_branch_names(nodes: List[Dict[str, Any]], default_branch: str, cutoff_date: datetime) -> List[str]:
+        """Names of refs committed to since cutoff_date, excluding the default and gh-pages branches."""
+        active = []
+        for node in nodes or []:
+            branch_name = node.get("name")
+            if branch_name == default_branch:
+                continue
+            
+            # Skip gh-pages and similar branches
+            if branch_name and branch_name.startswith("gh-pages"):
+                continue
+                
+            target = node.get("target") or {}
+            commit_date = target.get("committedDate")
+            
+            if commit_date:
+                commit_dt = datetime.fromisoformat(commit_date.replace('Z', '+00:00'))
+                if commit_dt >= cutoff_date:
+                    active.append(branch_name)
+        return active
+
+    def _unmerged_branches(self, owner: str, repo: str, default_branch: str, active_branches: List[str], use_cache: bool) -> List[str]:
+        """Keep the active branches that are ahead of the default branch (REST compare)."""
         if not active_branches:
             return []
         
-        # Batch check which branches have unmerged commits (max 10 at a time to avoid rate limits)
+        # Batch check which branches have unmerged commits (pacing is handled by rate_governor)
         print(f"  Found {len(active_branches)} active branches (gh-pages excluded), checking merge status...")
         unmerged_branches = []
         batch_size = 10
@@ -334,13 +813,64 @@ class GitHubAPIClient:
                     if ahead_by > 0:
                         unmerged_branches.append(branch)
                         print(f"    ✓ {branch}: {ahead_by} commits ahead")
-            
-            # Small delay between batches to respect rate limits
-            if i + batch_size < len(active_branches):
-                time.sleep(1)
-        
+
         return unmerged_branches
 
+    def get_active_unmerged_branches_batch(
+        self,
+        repos: Sequence[Tuple[str, str]],
+        days: int = 30,
+        use_cache: bool = True,
+    ) -> Dict[Tuple[str, str], Optional[List[str]]]:
+        """
+        get_active_unmerged_branches for many repositories: the refs listing of several
+        repositories (and their default branch, so no extra REST call) is fetched per
+        aliased GraphQL request. Repositories still paginating keep their own cursor.
+
+        Returns:
+            Dict (owner, name) -> unmerged branch names, or None when the repository's
+            refs could not be listed (use get_active_unmerged_branches for it)
+        """
+        from datetime import timedelta, timezone
+
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+        default_branches: Dict[Tuple[str, str], str] = {}
+        active: Dict[Tuple[str, str], List[str]] = {key: [] for key in repos}
+        results: Dict[Tuple[str, str], Optional[List[str]]] = {}
+        cursors: Dict[Tuple[str, str], Optional[str]] = {key: None for key in repos}
+
+        def fields(key: Tuple[str, str]) -> str:
+            after = f", after: {json.dumps(cursors[key])}" if cursors[key] else ""
+            return (
+                "defaultBranchRef { name } "
+                f'refs(refPrefix: "refs/heads/", first: 100{after}, orderBy: {{field: TAG_COMMIT_DATE, direction: DESC}}) {{ '
+                "pageInfo { hasNextPage endCursor } "
+                "nodes { name target { ... on Commit { oid committedDate } } } }"
+            )
+
+        while cursors:
+            page = self.graphql_repositories(list(cursors), fields, node_cost=100, use_cache=use_cache)
+            for key, repo_data in page.items():
+                if not repo_data:
+                    results[key] = None
+                    del cursors[key]
+                    continue
+                default_ref = repo_data.get("defaultBranchRef") or {}
+                default_branch = default_branches.setdefault(key, default_ref.get("name") or "main")
+                refs = repo_data.get("refs") or {}
+                active[key].extend(self._active_branch_names(refs.get("nodes"), default_branch, cutoff_date))
+                page_info = refs.get("pageInfo") or {}
+                if page_info.get("hasNextPage") and page_info.get("endCursor"):
+                    cursors[key] = page_info["endCursor"]
+                else:
+                    del cursors[key]
+
+        for key, branches in active.items():
+            if key not in results:
+                owner, repo = key
+                results[key] = self._unmerged_branches(owner, repo, default_branches[key], branches, use_cache)
+        return results
+
     def _fetch_with_thread_id(self, owner: str, repo: str, sha: str, use_cache: bool) -> Dict[str, Any]:
         """Helper function to fetch commit details with thread identification."""
         thread_id = threading.get_ident() % 1000  # Use last 3 digits for readability
@@ -352,7 +882,32 @@ class GitHubAPIClient:
         )
         return {'data': data, 'thread_id': thread_id, 'headers': headers}
     
-    def _fetch_rest_commit_details_parallel(self, commits_list: List[Dict], owner: str, repo: str, use_cache: bool, max_workers: int = 5) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _rest_commit_to_node(rest_commit: Dict[str, Any], commit_details: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a REST commit (list item + details) to the GraphQL history node shape."""
+        stats = commit_details.get('stats', {})
+        
+        # Extract author login
+        author_login = None
+        if rest_commit.get('author') and rest_commit['author'].get('login'):
+            author_login = rest_commit['author']['login']
+        elif rest_commit.get('commit', {}).get('author', {}).get('name'):
+            author_login = rest_commit['commit']['author']['name']
+        
+        return {
+            'oid': rest_commit.get('sha'),
+            'messageHeadline': rest_commit.get('commit', {}).get('message', '').split('\n')[0],
+            'committedDate': rest_commit.get('commit', {}).get('author', {}).get('date'),
+            'author': {
+                'user': {
+                    'login': author_login
+                }
+            },
+            'additions': stats.get('additions', 0),
+            'deletions': stats.get('deletions', 0),
+        }
+    
+    def _fetch_rest_commit_details_parallel(self, commits_list: List[Dict], owner: str, repo: str, use_cache: bool, max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Fetch commit details in parallel with conservative settings.
         
@@ -361,19 +916,22 @@ class GitHubAPIClient:
             owner: Repository owner
             repo: Repository name
             use_cache: Whether to use cache
-            max_workers: Maximum parallel requests (default: 5)
+            max_workers: Maximum parallel requests (default: client pool_size)
         
         Returns:
             List of processed commits with stats
         """
         from concurrent.futures import ThreadPoolExecutor, as_completed
         
+        if max_workers is None:
+            max_workers = self.pool_size
+        
         processed_commits = []
         batch_size = 10  # Process in small batches
         thread_id_map = {}  # Map real thread IDs to sequential worker numbers
         
-        # Create executor once and reuse across all batches
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Create executor once and reuse across all batches; cache writes are grouped
+        with self.cache_batch() as cache_batch, ThreadPoolExecutor(max_workers=max_workers) as executor:
             for batch_idx in range(0, len(commits_list), batch_size):
                 batch = commits_list[batch_idx:batch_idx+batch_size]
                 batch_headers = []  # Collect headers from this batch
@@ -382,7 +940,7 @@ class GitHubAPIClient:
                 future_to_data = {}
                 for c in batch:
                     future = executor.submit(
-                        self._fetch_with_thread_id,
+                        cache_batch.bind(self._fetch_with_thread_id),
                         owner,
                         repo,
                         c['sha'],
@@ -411,31 +969,9 @@ class GitHubAPIClient:
                         worker_num = thread_id_map[thread_id]
                         
                         if commit_details:
-                            stats = commit_details.get('stats', {})
-                            additions = stats.get('additions', 0)
-                            deletions = stats.get('deletions', 0)
-                            
-                            # Extract author login
-                            author_login = None
-                            if rest_commit.get('author') and rest_commit['author'].get('login'):
-                                author_login = rest_commit['author']['login']
-                            elif rest_commit.get('commit', {}).get('author', {}).get('name'):
-                                author_login = rest_commit['commit']['author']['name']
-                            
-                            print(f"[REST][Worker-{worker_num}] Fetched {sha[:8]}: +{additions}/-{deletions}")
-                            
-                            processed_commits.append({
-                                'oid': sha,
-                                'messageHeadline': rest_commit.get('commit', {}).get('message', '').split('\n')[0],
-                                'committedDate': rest_commit.get('commit', {}).get('author', {}).get('date'),
-                                'author': {
-                                    'user': {
-                                        'login': author_login
-                                    }
-                                },
-                                'additions': additions,
-                                'deletions': deletions,
-                            })
+                            node = self._rest_commit_to_node(rest_commit, commit_details)
+                            print(f"[REST][Worker-{worker_num}] Fetched {sha[:8]}: +{node['additions']}/-{node['deletions']}")
+                            processed_commits.append(node)
                     except Exception as e:
                         print(f"[REST][Worker-?][WARN] Failed {sha[:8] if sha else 'unknown'}: {e}")
                 
@@ -450,13 +986,110 @@ class GitHubAPIClient:
                         print(f"[REST][Batch {batch_idx//batch_size + 1}] Rate limit: {remaining}/{limit}, resets at {reset_datetime}")
                     else:
                         print(f"[REST][Batch {batch_idx//batch_size + 1}] Rate limit: {remaining}/{limit}")
-                
-                # Small delay between batches
-                if batch_idx + batch_size < len(commits_list):
-                    time.sleep(0.3)
         
         return processed_commits
 
+    def get_commit_stats(
+        self,
+        owner: str,
+        repo: str,
+        shas: Sequence[str],
+        use_cache: bool = True,
+        batch_size: int = 50,
+        rest_fallback: bool = True,
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        additions/deletions for many commits, up to batch_size per GraphQL request
+        (`c0: object(oid: "...") { ... on Commit { additions deletions } }`).
+
+        GitHub computes diff stats on demand and answers SERVICE_UNAVAILABLE for the ones
+        it cannot compute in time: those commits (or a batch that times out) are retried
+        in batches half the size. Commits that still fail alone are fetched with
+        GET /repos/{owner}/{repo}/commits/{sha} when rest_fallback is True.
+
+        Returns:
+            Dict sha -> {'additions', 'deletions', 'total'}; commits that could not be
+            resolved are missing
+        """
+        shas = list(dict.fromkeys(sha for sha in shas if sha))
+        stats: Dict[str, Dict[str, int]] = {}
+        chunks = [shas[i:i + batch_size] for i in range(0, len(shas), batch_size)]
+        rest_shas: List[str] = []
+        graphql_down = False
+
+        while chunks:
+            chunk = chunks.pop(0)
+            if graphql_down:
+                rest_shas.extend(chunk)
+                continue
+            resolved = self._graphql_commit_stats(owner, repo, chunk, use_cache)
+            if resolved is None and len(chunk) == 1:
+                # Even a single lookup fails: GraphQL is unavailable, stop trying it
+                graphql_down = True
+            stats.update(resolved or {})
+            failed = [sha for sha in chunk if sha not in (resolved or {})]
+            if not failed:
+                continue
+            if len(chunk) == 1:
+                rest_shas.extend(failed)
+                continue
+            size = max(1, len(chunk) // 2)
+            print(f"[GRAPHQL][STATS] {len(failed)}/{len(chunk)} commit stats unavailable, retrying in batches of {size}")
+            chunks[:0] = [failed[i:i + size] for i in range(0, len(failed), size)]
+
+        if rest_shas and rest_fallback:
+            print(f"[REST][STATS] Fetching stats for {len(rest_shas)} commits via REST")
+            from concurrent.futures import ThreadPoolExecutor
+
+            def fetch(sha: str) -> Tuple[str, Any]:
+                return sha, self.get_with_cache(
+                    f"https://api.github.com/repos/{owner}/{repo}/commits/{sha}", use_cache, silent=True
+                )
+
+            with self.cache_batch() as cache_batch, ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+                for sha, details in executor.map(cache_batch.bind(fetch), rest_shas):
+                    if details and isinstance(details, dict):
+                        rest_stats = details.get('stats') or {}
+                        stats[sha] = {
+                            'additions': rest_stats.get('additions', 0),
+                            'deletions': rest_stats.get('deletions', 0),
+                            'total': rest_stats.get('total', 0),
+                        }
+        return stats
+
+    def _graphql_commit_stats(self, owner: str, repo: str, shas: List[str], use_cache: bool) -> Optional[Dict[str, Dict[str, int]]]:
+        """One aliased stats lookup. Returns the stats that resolved, or None if the request failed."""
+        aliases = "\n".join(
+            f"c{idx}: object(oid: {json.dumps(sha)}) {{ ... on Commit {{ additions deletions }} }}"
+            for idx, sha in enumerate(shas)
+        )
+        query = (
+            "query($owner: String!, $name: String!) {\n"
+            "repository(owner: $owner, name: $name) {\n" + aliases + "\n}\n"
+            "rateLimit { remaining resetAt limit cost }\n}"
+        )
+        data = self.graphql(query, {"owner": owner, "name": repo}, use_cache=use_cache, timeout=30, allow_partial=True)
+        if not data or not isinstance((data.get("data") or {}).get("repository"), dict):
+            return None
+        # Errors point at ["repository", "c<idx>", "additions"]: only those commits failed
+        failed = {
+            str(err["path"][1])
+            for err in data.get("errors") or []
+            if isinstance(err, dict) and len(err.get("path") or []) > 1
+        }
+        repo_data = data["data"]["repository"]
+        resolved = {}
+        for idx, sha in enumerate(shas):
+            node = repo_data.get(f"c{idx}")
+            if f"c{idx}" in failed or not node or node.get("additions") is None or node.get("deletions") is None:
+                continue
+            resolved[sha] = {
+                'additions': node['additions'],
+                'deletions': node['deletions'],
+                'total': node['additions'] + node['deletions'],
+            }
+        return resolved
+
     def graphql_commit_history(
         self,
         owner: str,
@@ -470,19 +1103,40 @@ class GitHubAPIClient:
         branches: Optional[List[str]] = None,
         split_large_extractions: bool = True,
         time_chunks: int = 3,
+        checkpoint_path: Optional[str] = None,
+        stop_at: Optional[Set[str]] = None,
+        heads: Optional[Dict[str, Dict[str, Any]]] = None,
+        include_default_branch: bool = True,
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Fetch commit history with automatic REST fallback on GraphQL failures.
         
         Features:
-        - Switches to REST after 16s timeout (2 failed attempts)
+        - Adaptive page size (AdaptivePageSize): starts at page_size, grows up to 100
+          while network round trips are fast and halves on every page that times out
+          or overloads the server (502/500/503, SERVICE_UNAVAILABLE); the page size is
+          not part of the cache key, so cached reruns replay the same pages
+        - Switches to REST when an overloaded page fails at the minimum page size, or
+          right away on failures a smaller page cannot fix (rate limit, 403, errors)
         - REST fallback extracts 50 commits, then retries GraphQL
         - Circuit breaker for repeated failures
+        - Optional checkpoint: position and collected commits are saved after every
+          page, so a rerun with the same parameters resumes where the last one stopped
         
         Args:
             branches: List of branch names to extract from. If None, uses default branch.
             split_large_extractions: If True, splits extraction into time chunks
             time_chunks: Number of time periods to split extraction into (default: 3)
+            checkpoint_path: Checkpoint file (see utils.checkpoint.HistoryCheckpoint);
+                removed once the history has been walked completely
+            stop_at: Already extracted SHAs (incremental runs): they are skipped, and a
+                branch walk stops at the page where it reaches one of them
+            heads: Filled with the newest commit seen per branch ("" = default branch)
+            include_default_branch: Walk the default branch too (False: only `branches`)
+        
+        Without a checkpoint, extra branches are walked after the default branch and
+        concurrently, each one stopping at the first page that reaches a commit of the
+        default branch or their merge-base (see _commit_history_branches).
         
         Returns:
             Tuple of (commits list, rate limit metadata)
@@ -493,26 +1147,83 @@ class GitHubAPIClient:
         using_rest_fallback = False
         rest_commit_count = 0
         rest_commits_before_retry = 50  # Try GraphQL again after 50 REST commits
+        # Page size adapts to the repository: grows while pages are fast, halves on failures
+        pager = AdaptivePageSize(page_size)
         
         # Always include default branch, optionally add others
-        branches_to_process = [None]  # None = default branch
+        branches_to_process: List[Optional[str]] = [None] if include_default_branch else []  # None = default branch
         if branches:
             branches_to_process.extend(branches)
-            print(f"  Processing {len(branches_to_process)} branches (main + {len(branches)} active)")
+            if include_default_branch:
+                print(f"  Processing {len(branches_to_process)} branches (main + {len(branches)} active)")
+                if not checkpoint_path:
+                    return self._commit_history_branches(
+                        owner, repo, branches, page_size=page_size, max_pages=max_pages, max_commits=max_commits,
+                        since=since, until=until, use_cache=use_cache, split_large_extractions=split_large_extractions,
+                        time_chunks=time_chunks, stop_at=stop_at, heads=heads,
+                    )
+        
+        # Resume from a previous run's checkpoint (branch, time period, cursor, commits).
+        # The signature holds the caller's parameters only: the planned windows depend on
+        # the clock (open-ended --since) and on live commit counts, so they are stored in
+        # the checkpoint and reused on resume instead of being part of the signature.
+        checkpoint = None
+        resume_at: Optional[Dict[str, Any]] = None
+        if checkpoint_path:
+            checkpoint = HistoryCheckpoint(checkpoint_path, {
+                'owner': owner, 'repo': repo, 'branches': branches or [],
+                'since': since, 'until': until, 'max_commits': max_commits,
+                'time_chunks': time_chunks if split_large_extractions else None,
+            })
+            commits_by_sha, resume_at = checkpoint.load()
         
         # Determine if we should split by time
         time_ranges = [(since, until)]  # Default: single time range
         
         if split_large_extractions and (since or until):
-            time_ranges = self._split_time_range(since, until, chunks=time_chunks)
+            if resume_at and checkpoint and checkpoint.plan:
+                time_ranges = [tuple(r) for r in checkpoint.plan]
+            else:
+                time_ranges = self._plan_history_windows(owner, repo, None, since, until, chunks=time_chunks, use_cache=use_cache)
             print(f"  Splitting extraction into {len(time_ranges)} time periods to avoid API overload")
+            if len(time_ranges) > 1 and not checkpoint_path:
+                return self._commit_history_windows(
+                    owner, repo, time_ranges, page_size=page_size, max_pages=max_pages, max_commits=max_commits,
+                    use_cache=use_cache, branches=branches, stop_at=stop_at, heads=heads,
+                )
         
-        for branch in branches_to_process:
+        if checkpoint:
+            checkpoint.plan = [list(r) for r in time_ranges]
+            if resume_at:
+                print(f"  [CHECKPOINT] Resuming {owner}/{repo} with {len(commits_by_sha)} commits "
+                      f"(branch {resume_at['branch'] + 1}/{len(branches_to_process)}, "
+                      f"period {resume_at['period'] + 1}/{len(time_ranges)})")
+        
+        def note_heads(branch: Optional[str], new_nodes: List[Dict[str, Any]]) -> None:
+            if heads is None:
+                return
+            for node in new_nodes:
+                current = heads.get(branch or "")
+                if current is None or (node.get('committedDate') or '') > (current.get('committedDate') or ''):
+                    heads[branch or ""] = node
+        
+        def save_progress(new_nodes: List[Dict[str, Any]], period: int, cursor: Optional[str], rest_page: int) -> None:
+            if checkpoint:
+                checkpoint.record(
+                    {'branch': branch_idx, 'period': period, 'cursor': cursor, 'rest_page': rest_page},
+                    new_nodes,
+                )
+        
+        for branch_idx, branch in enumerate(branches_to_process):
+            if resume_at and branch_idx < resume_at['branch']:
+                continue
             branch_name = branch if branch else "default branch"
             print(f"    Extracting from: {branch_name}")
             
             # Process each time range for this branch
             for time_idx, (range_since, range_until) in enumerate(time_ranges):
+                if resume_at and (branch_idx, time_idx) < (resume_at['branch'], resume_at['period']):
+                    continue
                 if len(time_ranges) > 1:
                     print(f"      Time period {time_idx + 1}/{len(time_ranges)}: {range_since} to {range_until}")
                 
@@ -573,6 +1284,11 @@ class GitHubAPIClient:
                 period_commits = 0
                 rest_page = 1
                 last_rest_commit_sha = None
+                if resume_at:
+                    # First period after a restart: continue from the saved page
+                    cursor = resume_at.get('cursor')
+                    rest_page = resume_at.get('rest_page') or 1
+                    resume_at = None
                 
                 while True:
                     if max_pages is not None and pages >= max_pages:
@@ -580,9 +1296,9 @@ class GitHubAPIClient:
                     if max_commits is not None and len(commits_by_sha) >= max_commits:
                         break
 
-                    # 🔥 CIRCUIT BREAKER: Switch to REST after 1 GraphQL failure (30s timeout)
+                    # 🔥 CIRCUIT BREAKER: Switch to REST once a page fails at the minimum page size
                     if graphql_failures >= 1 and not using_rest_fallback:
-                        print(f"[CIRCUIT BREAKER] GraphQL failed (30s timeout)")
+                        print(f"[CIRCUIT BREAKER] GraphQL failed (page size {pager.size})")
                         print(f"        Switching to REST API fallback...")
                         using_rest_fallback = True
                         rest_commit_count = 0
@@ -613,34 +1329,55 @@ class GitHubAPIClient:
                         # Filter commits that haven't been processed yet
                         new_commits = [
                             c for c in rest_data
-                            if c.get('sha') and c.get('sha') not in commits_by_sha
+                            if c.get('sha') and c.get('sha') not in commits_by_sha and c.get('sha') not in (stop_at or ())
                         ]
+                        reached_known = bool(stop_at) and any(c.get('sha') in stop_at for c in rest_data)
                         
                         total_in_page = len(rest_data)
                         already_processed = total_in_page - len(new_commits)
                         
                         if not new_commits:
                             print(f"[REST] Page {rest_page}: Found {total_in_page} commits, all already in dataset (skipping)")
+                            if reached_known:
+                                break
                             rest_page += 1
                             continue
                         
                         print(f"[REST] Page {rest_page}: Found {total_in_page} commits, {already_processed} already in dataset (processing {len(new_commits)} new)")
                         
-                        # Fetch commit details in parallel
-                        processed = self._fetch_rest_commit_details_parallel(
-                            new_commits, owner, repo, use_cache, max_workers=5
+                        # Stats for the whole page via batched GraphQL lookups (object(oid:) aliases);
+                        # only the commits still missing go through one REST request each, in parallel
+                        stats = self.get_commit_stats(
+                            owner, repo, [c['sha'] for c in new_commits], use_cache, rest_fallback=False
                         )
+                        processed = [
+                            self._rest_commit_to_node(c, {'stats': stats[c['sha']]})
+                            for c in new_commits if c['sha'] in stats
+                        ]
+                        missing = [c for c in new_commits if c['sha'] not in stats]
+                        if missing:
+                            processed.extend(self._fetch_rest_commit_details_parallel(
+                                missing, owner, repo, use_cache, max_workers=self.pool_size
+                            ))
                         
                         # Add to commits dictionary
+                        added = []
                         for commit in processed:
                             sha = commit.get('oid')
                             if sha and sha not in commits_by_sha:
                                 commits_by_sha[sha] = commit
+                                added.append(commit)
                                 rest_commit_count += 1
                                 period_commits += 1
                                 last_rest_commit_sha = sha 
                         
                         rest_page += 1
+                        note_heads(branch, added)
+                        save_progress(added, time_idx, cursor, rest_page)
+                        
+                        if reached_known:
+                            print(f"[REST] Reached already extracted commits")
+                            break
                         
                         # Check if we should retry GraphQL
                         if rest_commit_count >= rest_commits_before_retry:
@@ -652,7 +1389,6 @@ class GitHubAPIClient:
                             using_rest_fallback = False
                             rest_commit_count = 0
                             graphql_failures = 0
-                            time.sleep(1)
                             continue
                         
                         # If REST returned less than 100 commits, we're done
@@ -660,14 +1396,13 @@ class GitHubAPIClient:
                             print(f"[REST] Reached end of commits")
                             break
                         
-                        time.sleep(1)  # Rate limit protection for REST
                         continue
                     
                     # GRAPHQL MODE 
                     variables = {
                         "owner": owner,
                         "name": repo,
-                        "pageSize": page_size,
+                        "pageSize": pager.size,
                         "cursor": cursor,
                         "since": range_since,
                         "until": range_until,
@@ -675,12 +1410,27 @@ class GitHubAPIClient:
                     if branch:
                         variables["branch"] = f"refs/heads/{branch}"
                     
-                    
-                    data = self.graphql(query, variables, use_cache=use_cache, timeout=30)
+                    # pageSize stays out of the cache key: a cached page answers the same
+                    # cursor whatever size it was fetched with, so reruns replay the walk
+                    started = time.monotonic()
+                    outcome: Dict[str, Any] = {}
+                    data = self.graphql(query, variables, use_cache=use_cache, timeout=30,
+                                        cache_ignore=("pageSize",), outcome=outcome)
                     
                     if not data:
-                        graphql_failures += 1
-                        continue  # Circuit breaker will activate REST fallback after 1 failure
+                        failure = outcome.get('failure', 'timeout')
+                        if failure not in self.GRAPHQL_OVERLOAD_FAILURES:
+                            # Rate limit / 403 / query errors: a smaller page would not help
+                            graphql_failures += 1
+                        elif pager.failure():
+                            # Overload at the minimum page size; REST takes over
+                            graphql_failures += 1
+                        else:
+                            print(f"[GRAPHQL] Retrying with page size {pager.size}")
+                        continue
+                    if not outcome.get('cached'):
+                        # Only real round trips tell how fast the server answers
+                        pager.success(time.monotonic() - started)
 
                     repo_data = data.get("data", {}).get("repository")
                     rate_meta = data.get("data", {}).get("rateLimit", {}) or {}
@@ -711,47 +1461,279 @@ class GitHubAPIClient:
                     nodes = history.get("nodes", [])
                     
                     # Add commits to dict (auto-deduplicates by SHA)
+                    added = []
+                    reached_known = False
                     for node in nodes:
                         sha = node.get('oid')
+                        if stop_at and sha in stop_at:
+                            reached_known = True
+                            continue
                         if sha and sha not in commits_by_sha:
-                            # Set additions/deletions to 0 if unavailable (SERVICE_UNAVAILABLE errors)
-                            if node.get('additions') is None:
-                                node['additions'] = 0
-                            if node.get('deletions') is None:
-                                node['deletions'] = 0
+                            # Set additions/deletions to 0 if unavailable (SERVICE_UNAVAILABLE errors).
+                            # Copy first: the node belongs to a (shared) cached response.
+                            node = {
+                                **node,
+                                'additions': node.get('additions') or 0,
+                                'deletions': node.get('deletions') or 0,
+                            }
                             
                             commits_by_sha[sha] = node
+                            added.append(node)
                             period_commits += 1
 
                     page_info = history.get("pageInfo", {})
                     has_next = page_info.get("hasNextPage")
                     cursor = page_info.get("endCursor")
                     pages += 1
+                    note_heads(branch, added)
+                    save_progress(added, time_idx, cursor, rest_page)
                     
                     # Log rate limit after processing commits
                     if rate_meta:
                         remaining = rate_meta.get("remaining", 0)
                         limit = rate_meta.get("limit", 5000)
                         print(f"[GRAPHQL] Rate limit: {remaining}/{limit}, {len(commits_by_sha)} commits processed")
-                        if remaining < 100:
-                            print(f"[GRAPHQL][WARN] Rate limit low ({remaining}). Pausing 30s...")
-                            time.sleep(30)
-                    
-                    # Delay between pages
-                    if has_next:
-                        time.sleep(1)
                     
-                    if not has_next:
+                    if not has_next or reached_known:
                         break
                 
                 if len(time_ranges) > 1 and period_commits > 0:
                     print(f"[GRAPHQL] Extracted {period_commits} total unique commits from this period")
+                # Period done: a restart continues with the next one
+                save_progress([], time_idx + 1, None, 1)
         
+        if checkpoint:
+            checkpoint.clear()
         commits = list(commits_by_sha.values())
         if branches:
             print(f"  [GRAPHQL] Total unique commits across all branches: {len(commits)}")
         return commits, rate_meta
 
+    def _merge_base(self, owner: str, repo: str, branch: str, use_cache: bool = True) -> Optional[str]:
+        """
+        SHA of the merge-base between the default branch and `branch`, from the same
+        (cached) compare request _unmerged_branches makes when picking the branches.
+        """
+        repo_info = self.get_with_cache(f"https://api.github.com/repos/{owner}/{repo}", use_cache=use_cache)
+        default_branch = repo_info.get("default_branch", "main") if isinstance(repo_info, dict) else "main"
+        compare_data = self.get_with_cache(
+            f"https://api.github.com/repos/{owner}/{repo}/compare/{default_branch}...{branch}", use_cache=use_cache
+        )
+        if isinstance(compare_data, dict):
+            return (compare_data.get("merge_base_commit") or {}).get("sha")
+        return None
+
+    def _commit_history_branches(
+        self,
+        owner: str,
+        repo: str,
+        branches: List[str],
+        page_size: int,
+        max_pages: Optional[int] = None,
+        max_commits: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        use_cache: bool = True,
+        split_large_extractions: bool = True,
+        time_chunks: int = 3,
+        stop_at: Optional[Set[str]] = None,
+        heads: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        graphql_commit_history for the default branch plus `branches`: the default
+        branch is walked first, then the other branches concurrently (up to pool_size).
+        A branch walk stops at the first page reaching a commit already collected from
+        the default branch (or their merge-base), so it only costs its unmerged commits.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        commits, rate_meta = self.graphql_commit_history(
+            owner, repo, page_size, max_pages=max_pages, max_commits=max_commits, since=since, until=until,
+            use_cache=use_cache, split_large_extractions=split_large_extractions, time_chunks=time_chunks,
+            stop_at=stop_at, heads=heads,
+        )
+        known = {node.get('oid') for node in commits} | set(stop_at or ())
+        branch_heads: List[Dict[str, Dict[str, Any]]] = [{} for _ in branches]
+        
+        def walk(idx: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+            branch = branches[idx]
+            merge_base = self._merge_base(owner, repo, branch, use_cache)
+            return self.graphql_commit_history(
+                owner, repo, page_size, max_pages=max_pages, max_commits=max_commits, since=since, until=until,
+                use_cache=use_cache, branches=[branch], split_large_extractions=False,
+                stop_at=known | {merge_base} if merge_base else known, heads=branch_heads[idx],
+                include_default_branch=False,
+            )
+        
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(branches))) as executor:
+            results = list(executor.map(walk, range(len(branches))))
+        
+        commits_by_sha = {node.get('oid'): node for node in commits}
+        for branch, (branch_commits, branch_meta) in zip(branches, results):
+            added = 0
+            for node in branch_commits:
+                if node.get('oid') not in commits_by_sha:
+                    commits_by_sha[node.get('oid')] = node
+                    added += 1
+            rate_meta = branch_meta or rate_meta
+            print(f"    {branch}: {added} commits not on the default branch")
+        if heads is not None:
+            for partial in branch_heads:
+                heads.update(partial)
+        merged = list(commits_by_sha.values())
+        if max_commits is not None:
+            merged = merged[:max_commits]
+        print(f"  [GRAPHQL] Total unique commits across all branches: {len(merged)}")
+        return merged, rate_meta
+
+    def _commit_history_windows(
+        self,
+        owner: str,
+        repo: str,
+        windows: Sequence[Tuple[Optional[str], Optional[str]]],
+        page_size: int,
+        max_pages: Optional[int] = None,
+        max_commits: Optional[int] = None,
+        use_cache: bool = True,
+        branches: Optional[List[str]] = None,
+        stop_at: Optional[Set[str]] = None,
+        heads: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Walk the time windows of graphql_commit_history concurrently (up to pool_size),
+        each one with its own cursor and fallbacks, and merge the results by SHA in
+        window order. Checkpointed walks stay sequential (positions index the windows).
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        window_heads: List[Dict[str, Dict[str, Any]]] = [{} for _ in windows]
+        
+        def walk(idx: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+            window_since, window_until = windows[idx]
+            return self.graphql_commit_history(
+                owner, repo, page_size, max_pages=max_pages, max_commits=max_commits,
+                since=window_since, until=window_until, use_cache=use_cache, branches=branches,
+                split_large_extractions=False, stop_at=stop_at, heads=window_heads[idx],
+            )
+        
+        print(f"  [GRAPHQL] Walking {len(windows)} time windows of {owner}/{repo} in parallel")
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(windows))) as executor:
+            results = list(executor.map(walk, range(len(windows))))
+        
+        commits_by_sha: Dict[str, Dict[str, Any]] = {}
+        rate_meta: Dict[str, Any] = {}
+        for window_commits, window_meta in results:
+            for node in window_commits:
+                commits_by_sha.setdefault(node.get('oid'), node)
+            rate_meta = window_meta or rate_meta
+        if heads is not None:
+            for partial in window_heads:
+                for branch, node in partial.items():
+                    current = heads.get(branch)
+                    if current is None or (node.get('committedDate') or '') > (current.get('committedDate') or ''):
+                        heads[branch] = node
+        commits = list(commits_by_sha.values())
+        if max_commits is not None:
+            commits = commits[:max_commits]
+        return commits, rate_meta
+
+    def graphql_commit_history_batch(
+        self,
+        repos: Sequence[Tuple[str, str]],
+        page_size: int,
+        max_commits: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        use_cache: bool = True,
+        max_pages: Optional[int] = None,
+        since_by_repo: Optional[Dict[Tuple[str, str], str]] = None,
+    ) -> Dict[Tuple[str, str], Optional[List[Dict[str, Any]]]]:
+        """
+        Default-branch commit history for many repositories, several repositories per
+        aliased GraphQL request (see graphql_repositories). Each round asks for the next
+        page of every repository that still has one, so small repositories finish in a
+        single round trip shared with their neighbours. With max_pages, repositories
+        with a longer history are handed back unfinished. since_by_repo overrides
+        `since` per repository (incremental runs start at each one's high-water mark).
+
+        Returns:
+            Dict (owner, name) -> history nodes (same shape as graphql_commit_history),
+            or None when the repository's part failed (timeout, SERVICE_UNAVAILABLE on
+            stats, ...) or did not finish within max_pages, and should go through
+            graphql_commit_history with its fallbacks
+        """
+        commits: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {key: {} for key in repos}
+        failed = set()
+        cursors: Dict[Tuple[str, str], Optional[str]] = {key: None for key in repos}
+        variables = {"pageSize": page_size}
+
+        def fields(key: Tuple[str, str]) -> str:
+            # Cursor and time window are inlined: they differ per repository
+            args = "first: $pageSize"
+            if cursors[key]:
+                args += f", after: {json.dumps(cursors[key])}"
+            repo_since = (since_by_repo or {}).get(key, since)
+            if repo_since:
+                args += f", since: {json.dumps(repo_since)}"
+            if until:
+                args += f", until: {json.dumps(until)}"
+            return (
+                "defaultBranchRef { target { ... on Commit { "
+                f"history({args}) {{ "
+                "pageInfo { hasNextPage endCursor } "
+                "nodes { oid messageHeadline committedDate author { user { login } } additions deletions } "
+                "} } } }"
+            )
+
+        rounds = 0
+        while cursors:
+            rounds += 1
+            page = self.graphql_repositories(
+                list(cursors),
+                fields,
+                node_cost=page_size,
+                variables=variables,
+                variable_defs="$pageSize: Int!",
+                use_cache=use_cache,
+            )
+            for key, repo_data in page.items():
+                if repo_data is None:
+                    failed.add(key)
+                    del cursors[key]
+                    continue
+                target = (repo_data.get("defaultBranchRef") or {}).get("target")
+                history = target.get("history") if isinstance(target, dict) else None
+                if not history:
+                    # Empty repository: nothing to paginate
+                    del cursors[key]
+                    continue
+                for node in history.get("nodes") or []:
+                    sha = node.get("oid")
+                    if sha and sha not in commits[key]:
+                        # Copy first: the node belongs to a (shared) cached response
+                        commits[key][sha] = {
+                            **node,
+                            'additions': node.get('additions') or 0,
+                            'deletions': node.get('deletions') or 0,
+                        }
+                page_info = history.get("pageInfo") or {}
+                done = max_commits is not None and len(commits[key]) >= max_commits
+                if page_info.get("hasNextPage") and page_info.get("endCursor") and not done:
+                    if max_pages is not None and rounds >= max_pages:
+                        failed.add(key)
+                        del cursors[key]
+                    else:
+                        cursors[key] = page_info["endCursor"]
+                else:
+                    del cursors[key]
+
+        print(f"[GRAPHQL][BATCH] Commit history for {len(repos)} repositories in {rounds} rounds "
+              f"({len(failed)} left for per-repository extraction)")
+        return {
+            key: None if key in failed else list(nodes.values())[:max_commits]
+            for key, nodes in commits.items()
+        }
+
     # ============================================================================
     # 🆕 REPOSITORY STRUCTURE EXTRACTION (REST + GraphQL Fallback)
     # ============================================================================
@@ -765,7 +1747,8 @@ class GitHubAPIClient:
     ) -> Dict[str, Any]:
         """
         Obtém árvore de arquivos usando REST API Git Trees como método principal.
-        Se a árvore for truncada, automaticamente usa GraphQL como fallback.
+        Se a árvore for truncada, busca só as subárvores que faltam por SHA
+        (_complete_truncated_tree) e usa GraphQL apenas se isso falhar.
         
         Args:
             owner: Proprietário do repositório
@@ -803,14 +1786,21 @@ class GitHubAPIClient:
             
             is_truncated = tree_data.get('truncated', False)
             raw_tree = tree_data.get('tree', [])
+            method = 'rest'
             
             logger.info(f"  ├─ Items fetched: {len(raw_tree)}")
             logger.info(f"  ├─ Truncated: {is_truncated}")
             
-            # ⚠️ Se truncado, fallback para GraphQL
+            # ⚠️ Se truncado, completa só as subárvores cortadas (por SHA); GraphQL se falhar
             if is_truncated:
-                logger.warning(f"  ⚠️  Tree truncated! Falling back to GraphQL...")
-                return self.graphql_repository_tree(owner, repo, branch, use_cache)
+                logger.warning(f"  ⚠️  Tree truncated! Fetching the missing subtrees by SHA...")
+                raw_tree = self._complete_truncated_tree(owner, repo, tree_sha, raw_tree, use_cache)
+                if raw_tree is None:
+                    logger.warning(f"  ⚠️  Subtree fetch failed, falling back to GraphQL...")
+                    return self.graphql_repository_tree(owner, repo, branch, use_cache)
+                is_truncated = False
+                method = 'rest_subtrees'
+                logger.info(f"  ├─ Items after subtree fetch: {len(raw_tree)}")
             
             # Passo 3: Padronizar formato dos nós
             standardized_tree = []
@@ -827,7 +1817,7 @@ class GitHubAPIClient:
                 'tree': standardized_tree,
                 'truncated': is_truncated,
                 'extracted_at': datetime.now().isoformat(),
-                'method': 'rest',
+                'method': method,
                 'total_items': len(standardized_tree)
             }
             
@@ -835,135 +1825,362 @@ class GitHubAPIClient:
             logger.error(f"Error in get_repository_tree: {str(e)}")
             return self._empty_tree_response(owner, repo, branch, error=str(e))
 
+    def _complete_truncated_tree(
+        self,
+        owner: str,
+        repo: str,
+        tree_sha: str,
+        raw_tree: List[Dict[str, Any]],
+        use_cache: bool = True,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Completa uma listagem `recursive=1` truncada sem descartá-la.
+        
+        Subárvores cortadas são de dois tipos: diretórios listados sem nenhum filho (git
+        não tem diretórios vazios) e os diretórios onde a listagem parou (a raiz e os
+        ancestrais do último item, pois a listagem segue a ordem da árvore). Os últimos
+        são relistados sem recursão para achar as entradas que faltam, exceto o que já
+        será buscado inteiro por não ter filhos listados; cada subárvore ausente é
+        buscada uma única vez (por caminho) com `git/trees/{sha}?recursive=1` em
+        paralelo (cache por SHA, imutável), e de novo completada se também vier truncada.
+        
+        Returns:
+            Itens brutos com caminhos completos, ou None se alguma busca falhar
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        base_url = f"https://api.github.com/repos/{owner}/{repo}/git/trees"
+        items: Dict[str, Dict[str, Any]] = {}
+        for item in raw_tree:
+            if item.get('path'):
+                items[item['path']] = item
+        parents = {path.rsplit('/', 1)[0] for path in items if '/' in path}
+        missing = {path: item for path, item in items.items() if item.get('type') == 'tree' and path not in parents}
+        
+        # Directories where the listing stopped: the root and the ancestors of the last item.
+        # One without any listed child is already fetched whole, so it is not relisted.
+        cut_dirs = [("", tree_sha)]
+        if raw_tree and raw_tree[-1].get('path'):
+            parts = raw_tree[-1]['path'].split('/')
+            for depth in range(1, len(parts) + 1):
+                path = '/'.join(parts[:depth])
+                if items.get(path, {}).get('type') == 'tree' and path not in missing:
+                    cut_dirs.append((path, items[path].get('sha')))
+        
+        def relist(cut: Tuple[str, Optional[str]]) -> Optional[List[Dict[str, Any]]]:
+            path, sha = cut
+            data = self.get_with_cache(f"{base_url}/{sha}", use_cache=use_cache) if sha else None
+            if not isinstance(data, dict):
+                return None
+            return [{**entry, 'path': f"{path}/{entry['path']}" if path else entry['path']} for entry in data.get('tree', [])]
+        
+        def fetch_subtree(item: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+            data = self.get_with_cache(f"{base_url}/{item.get('sha')}?recursive=1", use_cache=use_cache)
+            if not isinstance(data, dict):
+                return None
+            entries = data.get('tree', [])
+            if data.get('truncated'):
+                entries = self._complete_truncated_tree(owner, repo, item.get('sha'), entries, use_cache)
+                if entries is None:
+                    return None
+            return [{**entry, 'path': f"{item['path']}/{entry['path']}"} for entry in entries]
+        
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            listings = list(executor.map(relist, cut_dirs))
+            if any(listing is None for listing in listings):
+                return None
+            cut_paths = {path for path, _ in cut_dirs}
+            for listing in listings:
+                for entry in listing:
+                    if entry['path'] in items:
+                        continue
+                    items[entry['path']] = entry
+                    if entry.get('type') == 'tree' and entry['path'] not in cut_paths:
+                        missing.setdefault(entry['path'], entry)
+            
+            print(f"[REST] {owner}/{repo}: fetching {len(missing)} truncated subtrees by SHA")
+            for subtree in executor.map(fetch_subtree, missing.values()):
+                if subtree is None:
+                    return None
+                for entry in subtree:
+                    items.setdefault(entry['path'], entry)
+        
+        return list(items.values())
+
+    def update_repository_tree(
+        self,
+        owner: str,
+        repo: str,
+        branch: str,
+        previous: Dict[str, Any],
+        head_sha: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Atualiza uma árvore já extraída (structure_{repo}.json) para o head atual do branch
+        buscando só o que mudou.
+        
+        Percorre a árvore nova por níveis com listagens não recursivas `git/trees/{sha}`:
+        um diretório cujo SHA de árvore é igual ao da extração anterior não mudou, então
+        ele e todos os seus descendentes são reaproveitados sem nenhuma requisição; só os
+        diretórios alterados são descidos, e os diretórios novos vêm inteiros com
+        `?recursive=1`. Se o head não mudou, nenhuma árvore é buscada.
+        
+        Args:
+            owner: Proprietário do repositório
+            repo: Nome do repositório
+            branch: Branch a ser analisada
+            previous: Estrutura salva anteriormente (com 'sha' e 'tree' da REST API)
+            head_sha: SHA do commit head, se já conhecido (evita a consulta do branch)
+            use_cache: Se deve usar cache
+        
+        Returns:
+            Dicionário no formato de get_repository_tree (method 'rest_incremental'), ou o
+            resultado de get_repository_tree se a árvore anterior não tiver SHAs de
+            diretório (GraphQL) ou alguma listagem falhar
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        logger = logging.getLogger(__name__)
+        
+        old_nodes: Dict[str, Dict[str, Any]] = {}
+        for node in previous.get('tree') or []:
+            if isinstance(node, dict) and node.get('path'):
+                old_nodes[node['path']] = node
+        if not str(previous.get('method', '')).startswith('rest') or not old_nodes:
+            return self.get_repository_tree(owner, repo, branch, use_cache)
+        
+        if head_sha is None:
+            branch_url = f"https://api.github.com/repos/{owner}/{repo}/branches/{branch}"
+            branch_data = self.get_with_cache(branch_url, use_cache=use_cache)
+            if not branch_data:
+                logger.error(f"Branch {branch} not found for {owner}/{repo}")
+                return self._empty_tree_response(owner, repo, branch, error="Branch not found")
+            head_sha = branch_data['commit']['sha']
+        
+        if head_sha == previous.get('sha'):
+            logger.info(f"Tree for {owner}/{repo} unchanged (SHA: {head_sha[:8]})")
+            return previous
+        
+        children: Dict[str, List[Dict[str, Any]]] = {}
+        for path, node in old_nodes.items():
+            parent = path.rsplit('/', 1)[0] if '/' in path else ''
+            children.setdefault(parent, []).append(node)
+        
+        def descendants(path: str) -> List[Dict[str, Any]]:
+            found = []
+            stack = [path]
+            while stack:
+                for node in children.get(stack.pop(), []):
+                    found.append(node)
+                    if node.get('type') == 'directory':
+                        stack.append(node['path'])
+            return found
+        
+        base_url = f"https://api.github.com/repos/{owner}/{repo}/git/trees"
+        
+        def list_directory(job: Tuple[str, str]) -> Optional[List[Dict[str, Any]]]:
+            path, sha = job
+            data = self.get_with_cache(f"{base_url}/{sha}", use_cache=use_cache)
+            if not isinstance(data, dict):
+                return None
+            return [{**entry, 'path': f"{path}/{entry['path']}" if path else entry['path']} for entry in data.get('tree', [])]
+        
+        def fetch_new_directory(entry: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+            data = self.get_with_cache(f"{base_url}/{entry.get('sha')}?recursive=1", use_cache=use_cache)
+            if not isinstance(data, dict):
+                return None
+            entries = data.get('tree', [])
+            if data.get('truncated'):
+                entries = self._complete_truncated_tree(owner, repo, entry.get('sha'), entries, use_cache)
+                if entries is None:
+                    return None
+            return [{**item, 'path': f"{entry['path']}/{item['path']}"} for item in entries]
+        
+        def walk() -> Optional[List[Dict[str, Any]]]:
+            nodes: List[Dict[str, Any]] = []
+            reused = listed = 0
+            frontier: List[Tuple[str, str]] = [("", head_sha)]
+            with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+                while frontier:
+                    listings = list(executor.map(list_directory, frontier))
+                    listed += len(frontier)
+                    if any(listing is None for listing in listings):
+                        return None
+                    next_frontier: List[Tuple[str, str]] = []
+                    new_directories: List[Dict[str, Any]] = []
+                    for listing in listings:
+                        for entry in listing:
+                            old = old_nodes.get(entry['path'])
+                            if entry.get('type') == 'tree':
+                                if old and old.get('type') == 'directory':
+                                    if old.get('sha') == entry.get('sha'):
+                                        nodes.append(old)
+                                        nodes.extend(descendants(entry['path']))
+                                        reused += 1
+                                        continue
+                                    next_frontier.append((entry['path'], entry['sha']))
+                                else:
+                                    new_directories.append(entry)
+                            node = self._standardize_tree_node(entry)
+                            if node:
+                                nodes.append(node)
+                    for subtree in executor.map(fetch_new_directory, new_directories):
+                        if subtree is None:
+                            return None
+                        for item in subtree:
+                            node = self._standardize_tree_node(item)
+                            if node:
+                                nodes.append(node)
+                    listed += len(new_directories)
+                    frontier = next_frontier
+            print(f"[REST] {owner}/{repo}: {listed} trees fetched, {reused} unchanged directories reused")
+            return nodes
+        
+        try:
+            logger.info(f"Updating tree for {owner}/{repo} ({str(previous.get('sha'))[:8]} -> {head_sha[:8]})")
+            nodes = walk()
+        except Exception as e:
+            logger.error(f"Error in update_repository_tree: {str(e)}")
+            nodes = None
+        if nodes is None:
+            logger.warning(f"  ⚠️  Incremental tree update failed, fetching the full tree...")
+            return self.get_repository_tree(owner, repo, branch, use_cache)
+        
+        nodes.sort(key=lambda node: node['path'].split('/'))
+        return {
+            'owner': owner,
+            'repository': repo,
+            'branch': branch,
+            'sha': head_sha,
+            'tree': nodes,
+            'truncated': False,
+            'extracted_at': datetime.now().isoformat(),
+            'method': 'rest_incremental',
+            'total_items': len(nodes)
+        }
+
+    # Directories listed per aliased object(expression:) request in graphql_repository_tree
+    tree_batch_max_dirs = 20
+
     def graphql_repository_tree(
         self,
         owner: str,
         repo: str,
         branch: str = "main",
         use_cache: bool = True,
-        max_depth: int = 100
     ) -> Dict[str, Any]:
         """
         Extrai árvore completa usando GraphQL (usado quando REST trunca).
-        Implementação iterativa com stack para evitar recursão profunda.
+        Percorre a árvore por níveis (BFS): os diretórios de um nível são buscados em
+        lotes de tree_batch_max_dirs aliases `object(expression:)` por requisição, com
+        os lotes do nível em paralelo. Não há limite de diretórios: a árvore volta completa.
         
         Args:
             owner: Proprietário do repositório
             repo: Nome do repositório
             branch: Branch a ser analisada
             use_cache: Se deve usar cache
-            max_depth: Profundidade máxima para segurança
         
         Returns:
             Dicionário com árvore hierárquica
         """
+        from concurrent.futures import ThreadPoolExecutor
+        
         logger = logging.getLogger(__name__)
         
-        def build_tree_iterative(start_path: str = "") -> List[Dict[str, Any]]:
-            """Constrói árvore usando stack iterativa."""
-            root_tree = []
-            stack = [(start_path, root_tree)]
-            processed = set()
-            
-            while stack and len(processed) < max_depth:
-                current_path, parent_list = stack.pop()
-                
-                if current_path in processed:
-                    logger.warning(f"Skipping already processed path: {current_path}")
-                    continue
-                processed.add(current_path)
-                
-                expression = f"{branch}:{current_path}" if current_path else f"{branch}:"
-                
-                query = """
-                query($owner: String!, $repo: String!, $expression: String!) {
-                  repository(owner: $owner, name: $repo) {
-                    object(expression: $expression) {
-                      ... on Tree {
-                        entries {
-                          name
-                          type
-                          mode
-                          path
-                          extension
-                          object {
-                            ... on Blob {
-                              byteSize
-                              isBinary
-                              oid
-                            }
-                          }
-                        }
-                      }
-                    }
-                  }
-                }
-                """
-                
-                variables = {
-                    "owner": owner,
-                    "repo": repo,
-                    "expression": expression
-                }
-                
-                try:
-                    result = self.graphql(query, variables, use_cache=use_cache)
-                    
-                    if not result or 'data' not in result:
-                        logger.warning(f"No data returned for path: {current_path}")
-                        continue
-                    
-                    repo_obj = result.get('data', {}).get('repository', {})
-                    if not repo_obj:
-                        logger.warning(f"Repository not found")
-                        continue
-                    
-                    tree_obj = repo_obj.get('object', {})
-                    if not tree_obj:
-                        logger.debug(f"No tree object for path: {current_path}")
-                        continue
-                    
-                    entries = tree_obj.get('entries', [])
+        def fetch_directories(paths: List[str]) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+            """Entries of each directory, one aliased request; failed halves are retried apart."""
+            aliases = " ".join(
+                f"d{idx}: object(expression: {json.dumps(f'{branch}:{path}')}) {{ ...treeEntries }}"
+                for idx, path in enumerate(paths)
+            )
+            query = (
+                "query($owner: String!, $repo: String!) { repository(owner: $owner, name: $repo) { "
+                f"{aliases} }} }} "
+                "fragment treeEntries on Tree { entries { name type mode path extension "
+                "object { ... on Blob { byteSize isBinary oid } } } }"
+            )
+            result = self.graphql(query, {"owner": owner, "repo": repo}, use_cache=use_cache, allow_partial=True)
+            repo_obj = ((result or {}).get('data') or {}).get('repository')
+            if not isinstance(repo_obj, dict):
+                if len(paths) == 1:
+                    logger.warning(f"No data returned for path: {paths[0]}")
+                    return {paths[0]: None}
+                middle = len(paths) // 2
+                return {**fetch_directories(paths[:middle]), **fetch_directories(paths[middle:])}
+            failed = {
+                str(err['path'][1])
+                for err in (result or {}).get('errors') or []
+                if isinstance(err, dict) and isinstance(err.get('path'), list) and len(err['path']) > 1
+            }
+            entries: Dict[str, Optional[List[Dict[str, Any]]]] = {}
+            retry = []
+            for idx, path in enumerate(paths):
+                if f"d{idx}" in failed:
+                    retry.append(path)
+                else:
+                    entries[path] = (repo_obj.get(f"d{idx}") or {}).get('entries') or []
+            if retry and len(paths) == 1:
+                logger.warning(f"Could not list path: {retry[0]}")
+                entries[retry[0]] = None
+            elif retry:
+                half = max(1, len(paths) // 2)
+                for start in range(0, len(retry), half):
+                    entries.update(fetch_directories(retry[start:start + half]))
+            return entries
+        
+        def build_tree_bfs() -> List[Dict[str, Any]]:
+            """Constrói a árvore nível a nível."""
+            root_tree: List[Dict[str, Any]] = []
+            frontier: List[Tuple[str, List[Dict[str, Any]]]] = [("", root_tree)]
+            levels = 0
+            with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+                while frontier:
+                    paths = [path for path, _ in frontier]
+                    chunks = [paths[i:i + self.tree_batch_max_dirs] for i in range(0, len(paths), self.tree_batch_max_dirs)]
+                    listed: Dict[str, Optional[List[Dict[str, Any]]]] = {}
+                    for chunk_entries in executor.map(fetch_directories, chunks):
+                        listed.update(chunk_entries)
+                    levels += 1
+                    logger.debug(f"Level {levels}: {len(paths)} directories in {len(chunks)} requests")
                     
-                    for entry in entries:
-                        entry_type = entry.get('type')
-                        entry_name = entry.get('name')
-                        entry_path = entry.get('path')
-                        
-                        if entry_type == 'tree':
-                            logger.debug(f"Processing directory: {entry_path}")
-                            directory_node = {
-                                'name': entry_name,
-                                'path': entry_path,
-                                'type': 'directory',
-                                'children': []
-                            }
-                            parent_list.append(directory_node)
-                            stack.append((entry_path, directory_node['children']))
+                    next_frontier: List[Tuple[str, List[Dict[str, Any]]]] = []
+                    for path, parent_list in frontier:
+                        for entry in listed.get(path) or []:
+                            entry_type = entry.get('type')
+                            entry_name = entry.get('name')
+                            entry_path = entry.get('path')
                             
-                        elif entry_type == 'blob':
-                            blob_info = entry.get('object', {})
-                            file_node = {
-                                'name': entry_name,
-                                'path': entry_path,
-                                'type': 'file',
-                                'extension': entry.get('extension', ''),
-                                'size': blob_info.get('byteSize', 0),
-                                'is_binary': blob_info.get('isBinary', False),
-                                'oid': blob_info.get('oid', '')
-                            }
-                            parent_list.append(file_node)
-                
-                except Exception as e:
-                    logger.error(f"Error processing path {current_path}: {str(e)}")
-                    continue
-            
+                            if entry_type == 'tree':
+                                directory_node = {
+                                    'name': entry_name,
+                                    'path': entry_path,
+                                    'type': 'directory',
+                                    'children': []
+                                }
+                                parent_list.append(directory_node)
+                                next_frontier.append((entry_path, directory_node['children']))
+                                
+                            elif entry_type == 'blob':
+                                blob_info = entry.get('object') or {}
+                                file_node = {
+                                    'name': entry_name,
+                                    'path': entry_path,
+                                    'type': 'file',
+                                    'extension': entry.get('extension', ''),
+                                    'size': blob_info.get('byteSize', 0),
+                                    'is_binary': blob_info.get('isBinary', False),
+                                    'oid': blob_info.get('oid', '')
+                                }
+                                parent_list.append(file_node)
+                    frontier = next_frontier
             return root_tree
         
         logger.info(f"Building repository tree via GraphQL for {owner}/{repo}")
         
         try:
-            tree = build_tree_iterative("")
+            tree = build_tree_bfs()
             
             return {
                 'owner': owner,
@@ -1077,18 +2294,27 @@ class GitHubAPIClient:
         per_page: int = 50,
         start_page: int = 1,
         max_pages: Optional[int] = None,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
     ) -> List[Any]:
         """
         Fetch all pages for list endpoints that support per_page & page params.
         Stops when a page returns fewer than per_page results or when max_pages is reached.
+        
+        With parallel=True the first page's `Link: rel="last"` header gives the page
+        count, and the remaining pages are fetched concurrently (up to max_workers,
+        default: pool_size). Results keep page order and page URLs are identical to
+        the sequential mode, so cache entries are shared between both modes.
         """
+        if parallel:
+            return self._get_paginated_parallel(base_url, use_cache, per_page, start_page, max_pages, max_workers)
+        
         results: List[Any] = []
         page = start_page
         while True:
             if max_pages is not None and page > max_pages:
                 break
-            sep = '&' if ('?' in base_url) else '?'
-            url = f"{base_url}{sep}per_page={per_page}&page={page}"
+            url = self._page_url(base_url, per_page, page)
             data = self.get_with_cache(url, use_cache)
             if data is None:
                 break
@@ -1102,6 +2328,123 @@ class GitHubAPIClient:
             page += 1
         return results
     
+    def iter_paginated(
+        self,
+        base_url: str,
+        use_cache: bool = True,
+        per_page: int = 50,
+        start_page: int = 1,
+        max_pages: Optional[int] = None,
+        pages: bool = False,
+    ) -> Iterator[Any]:
+        """
+        Generator version of get_paginated: yields items (or whole pages with pages=True)
+        as each page arrives, so only one page is held in memory at a time.
+        
+        Paging follows the `Link: rel="next"` header. For pages served from cache
+        (no headers), a page shorter than min(per_page, 100) is the last one, since
+        GitHub clamps per_page to 100. Page URLs match get_paginated (shared cache keys).
+        """
+        full_page = min(per_page, 100)
+        page = start_page
+        while max_pages is None or page <= max_pages:
+            result = self.get_with_cache(self._page_url(base_url, per_page, page), use_cache, return_headers=True)
+            data, headers = result if isinstance(result, tuple) else (result, None)
+            if not isinstance(data, list):
+                return
+            if pages:
+                yield data
+            else:
+                yield from data
+            
+            if headers is not None:
+                link = headers.get('Link')
+                if not isinstance(link, str) or 'rel="next"' not in link:
+                    return
+            elif len(data) < full_page:
+                return
+            page += 1
+    
+    @staticmethod
+    def _page_url(base_url: str, per_page: int, page: int) -> str:
+        sep = '&' if ('?' in base_url) else '?'
+        return f"{base_url}{sep}per_page={per_page}&page={page}"
+    
+    @staticmethod
+    def _parse_last_page(link_header: Optional[str]) -> Optional[int]:
+        """Extract the page number of the rel="last" entry from a Link header."""
+        if not link_header or not isinstance(link_header, str):
+            return None
+        for part in link_header.split(','):
+            if 'rel="last"' not in part:
+                continue
+            url = part.split(';')[0].strip().strip('<>')
+            query = parse_qs(urlsplit(url).query)
+            try:
+                return int(query['page'][0])
+            except (KeyError, IndexError, ValueError):
+                return None
+        return None
+    
+    def _get_paginated_parallel(
+        self,
+        base_url: str,
+        use_cache: bool,
+        per_page: int,
+        start_page: int,
+        max_pages: Optional[int],
+        max_workers: Optional[int],
+    ) -> List[Any]:
+        from concurrent.futures import ThreadPoolExecutor
+        
+        if max_pages is not None and start_page > max_pages:
+            return []
+        
+        first = self.get_with_cache(self._page_url(base_url, per_page, start_page), use_cache, return_headers=True)
+        data, headers = first if isinstance(first, tuple) else (first, None)
+        if not isinstance(data, list):
+            return []
+        results: List[Any] = list(data)
+        
+        if headers is not None:
+            last_page = self._parse_last_page(headers.get('Link'))
+            if last_page is None:
+                # No Link header: everything fit in a single page
+                return results
+        else:
+            # Page served from cache (no headers): walk on sequentially. GitHub caps
+            # per_page at 100, so a full page is as long as the first one.
+            page_len = len(data)
+            page = start_page + 1
+            while page_len and len(data) >= page_len and (max_pages is None or page <= max_pages):
+                data = self.get_with_cache(self._page_url(base_url, per_page, page), use_cache)
+                if not isinstance(data, list):
+                    break
+                results.extend(data)
+                page += 1
+            return results
+        
+        if max_pages is not None:
+            last_page = min(last_page, max_pages)
+        remaining_pages = list(range(start_page + 1, last_page + 1))
+        if not remaining_pages:
+            return results
+        
+        workers = max_workers or self.pool_size
+        print(f"[REST] Fetching pages {remaining_pages[0]}-{last_page} with {workers} workers")
+        with self.cache_batch() as cache_batch, ThreadPoolExecutor(max_workers=workers) as executor:
+            pages = executor.map(
+                cache_batch.bind(lambda page: self.get_with_cache(self._page_url(base_url, per_page, page), use_cache, silent=True)),
+                remaining_pages,
+            )
+            # executor.map yields in submission order, so page order is preserved
+            for page, page_data in zip(remaining_pages, pages):
+                if isinstance(page_data, list):
+                    results.extend(page_data)
+                else:
+                    print(f"[REST][WARN] Page {page} of {base_url} could not be fetched")
+        return results
+    
     def _log_rate_limit(self, response: requests.Response, prefix: str = "REST") -> None:
 
         remaining = response.headers.get('X-RateLimit-Remaining', 'Unknown')
@@ -1114,27 +2457,84 @@ class GitHubAPIClient:
         else:
             print(f"[{prefix}] Rate limit: {remaining}/{limit}")
 
+class JsonSpool:
+    """
+    Append-only list of JSON records spooled to a temporary file.
+    
+    Lets extractors collect large outputs (e.g. every issue of an organization)
+    without keeping them in memory; save_json_data streams a spool straight to
+    disk in the same format it uses for lists.
+    
+    Use it as a context manager (`with JsonSpool() as spool:`) so the temporary
+    file is released even when extraction fails halfway.
+    """
+    
+    def __init__(self):
+        self._file = tempfile.TemporaryFile(mode='w+b')
+        self._offsets: List[int] = []
+    
+    def append(self, record: Any) -> None:
+        self._file.seek(0, os.SEEK_END)
+        self._offsets.append(self._file.tell())
+        self._file.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n')
+    
+    def extend(self, records: Any) -> None:
+        for record in records:
+            self.append(record)
+    
+    def __len__(self) -> int:
+        return len(self._offsets)
+    
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self._offsets)):
+            yield self[index]
+    
+    def __getitem__(self, index: int) -> Any:
+        offset = self._offsets[index]
+        self._file.seek(offset)
+        return json.loads(self._file.readline().decode('utf-8'))
+    
+    def close(self) -> None:
+        self._file.close()
+    
+    def __enter__(self) -> "JsonSpool":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def _write_json_records(f, records: Any) -> None:
+    """Write an iterable as a JSON array, byte-identical to json.dump(list, indent=2)."""
+    first = True
+    f.write('[')
+    for record in records:
+        f.write('\n  ' if first else ',\n  ')
+        f.write(json.dumps(record, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+        first = False
+    f.write(']' if first else '\n]')
+
 def save_json_data(data: Any, filepath: str, timestamp: bool = True) -> str:
  
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
     
-    if timestamp:
-        now = datetime.now().isoformat()
-        if isinstance(data, dict):
-            data['_metadata'] = {
-                'extracted_at': now,
-                'file_path': filepath
-            }
-        elif isinstance(data, list) and len(data) > 0:
-           
+    if isinstance(data, JsonSpool):
+        records: Any = data
+        if timestamp and len(data) > 0:
             metadata = {
                 '_metadata': {
-                    'extracted_at': now,
+                    'extracted_at': datetime.now().isoformat(),
                     'file_path': filepath,
                     'record_count': len(data)
                 }
             }
-            data = [metadata] + data
+            records = itertools.chain([metadata], data)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            _write_json_records(f, records)
+        print(f"Saved data to: {filepath}")
+        return filepath
+    
+    if timestamp:
+        data = _with_metadata(data, filepath, datetime.now().isoformat())
     
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
@@ -1142,6 +2542,48 @@ def save_json_data(data: Any, filepath: str, timestamp: bool = True) -> str:
     print(f"Saved data to: {filepath}")
     return filepath
 
+def save_json_files(files: Dict[str, Any], timestamp: bool = True) -> List[str]:
+    """
+    Write many small JSON files in one pass (e.g. one repo_{name}.json per repository):
+    each directory is created once, every file shares one extraction timestamp and one
+    summary line is printed. Each file is byte-identical to what save_json_data writes.
+    """
+    now = datetime.now().isoformat()
+    directories = sorted({os.path.dirname(filepath) for filepath in files})
+    for directory in directories:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    
+    written = []
+    for filepath, data in files.items():
+        if timestamp:
+            data = _with_metadata(data, filepath, now)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        written.append(filepath)
+    
+    if written:
+        print(f"Saved {len(written)} files to: {', '.join(d or '.' for d in directories)}")
+    return written
+
+def _with_metadata(data: Any, filepath: str, now: str) -> Any:
+    if isinstance(data, dict):
+        # Build a new dict so the caller's object (possibly a cached response) is left untouched
+        return {**data, '_metadata': {
+            'extracted_at': now,
+            'file_path': filepath
+        }}
+    if isinstance(data, list) and len(data) > 0:
+        metadata = {
+            '_metadata': {
+                'extracted_at': now,
+                'file_path': filepath,
+                'record_count': len(data)
+            }
+        }
+        return [metadata] + data
+    return data
+
 def load_json_data(filepath: str) -> Any:
    
     if not os.path.exists(filepath):
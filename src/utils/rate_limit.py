@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+
+import time
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Any, Tuple
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_epoch(value: Any) -> Optional[float]:
+    """Parse a reset time given as epoch seconds (REST) or ISO-8601 (GraphQL resetAt)."""
+    as_int = _to_int(value)
+    if as_int is not None:
+        return float(as_int)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+class _Bucket:
+    """Rate-limit state for one GitHub resource ("core", "graphql", "search", ...)."""
+
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.blocked_until: float = 0.0
+        self.next_slot: float = 0.0
+        self.last_cost: int = 1
+        self.requests = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+
+class RateLimitGovernor:
+    """
+    Token-bucket governor shared by REST and GraphQL requests.
+
+    Each GitHub resource gets a bucket whose token count is the quota reported by
+    the API (`X-RateLimit-*` headers or the GraphQL `rateLimit` block). Requests
+    spend tokens locally between responses so concurrent workers see an up-to-date
+    estimate.
+
+    Once the quota and reset time are known, requests are spaced evenly across the
+    whole window, (reset - now) / remaining apart, so the remaining tokens run out
+    exactly at the reset instead of being burnt in a burst followed by a stall.
+    Requests slower than that spacing are never delayed. An empty bucket, or a
+    403/429 carrying `Retry-After`, blocks the resource until the reset or retry time.
+
+    Args:
+        pace_threshold: Fraction of the limit at or below which requests are paced;
+            1.0 (default) paces the whole window, lower values let the first part of
+            each window go out unthrottled
+        default_penalty: Seconds to block on a rate-limit error without reset info (default: 60)
+    """
+
+    def __init__(self, pace_threshold: float = 1.0, default_penalty: float = 60.0):
+        self.pace_threshold = pace_threshold
+        self.default_penalty = default_penalty
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _Bucket] = {}
+
+    def _bucket(self, resource: str) -> _Bucket:
+        bucket = self._buckets.get(resource)
+        if bucket is None:
+            bucket = self._buckets[resource] = _Bucket()
+        return bucket
+
+    def reserve(self, resource: str = "core", cost: Optional[int] = None) -> float:
+        """
+        Book the next request slot for `resource` and return how long to wait before sending.
+        Does not sleep, so it can be used from both threads and coroutines.
+        """
+        with self._lock:
+            bucket = self._bucket(resource)
+            cost = cost if cost is not None else bucket.last_cost
+            now = time.time()
+
+            if bucket.reset_at is not None and now >= bucket.reset_at:
+                # Window rolled over: quota is unknown until the next response refreshes it
+                bucket.remaining = None
+                bucket.reset_at = None
+                bucket.next_slot = 0.0
+
+            wait = 0.0
+            if bucket.blocked_until > now:
+                wait = bucket.blocked_until - now
+            elif bucket.remaining is not None and bucket.reset_at is not None:
+                window = bucket.reset_at - now
+                if bucket.remaining < cost:
+                    wait = window + 1.0
+                elif bucket.limit and bucket.remaining <= bucket.limit * self.pace_threshold:
+                    interval = window / max(bucket.remaining, 1) * cost
+                    slot = max(now, bucket.next_slot)
+                    wait = slot - now
+                    bucket.next_slot = slot + interval
+
+            if bucket.remaining is not None:
+                bucket.remaining = max(bucket.remaining - cost, 0)
+            bucket.requests += 1
+            if wait > 0:
+                bucket.throttled += 1
+                bucket.wait_seconds += wait
+            return wait
+
+    def peek(self, resource: str = "core", cost: Optional[int] = None) -> Tuple[float, Optional[int]]:
+        """
+        Estimate, without booking a slot, how long a request to `resource` would be
+        blocked and how many tokens remain (None if unknown). Pacing is ignored.
+        """
+        with self._lock:
+            bucket = self._bucket(resource)
+            cost = cost if cost is not None else bucket.last_cost
+            now = time.time()
+            if bucket.reset_at is not None and now >= bucket.reset_at:
+                return max(bucket.blocked_until - now, 0.0), None
+            if bucket.blocked_until > now:
+                return bucket.blocked_until - now, bucket.remaining
+            if bucket.remaining is not None and bucket.reset_at is not None and bucket.remaining < cost:
+                return bucket.reset_at - now + 1.0, bucket.remaining
+            return 0.0, bucket.remaining
+
+    def acquire(self, resource: str = "core", cost: Optional[int] = None) -> float:
+        """Block the calling thread until a request to `resource` may be sent. Returns seconds waited."""
+        wait = self.reserve(resource, cost)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def update_from_headers(self, headers: Any, resource: Optional[str] = None) -> None:
+        """Refresh a bucket from `X-RateLimit-*` / `Retry-After` response headers."""
+        if headers is None or not hasattr(headers, "get"):
+            return
+        header_resource = headers.get("X-RateLimit-Resource")
+        resource = header_resource if isinstance(header_resource, str) and header_resource else (resource or "core")
+        remaining = _to_int(headers.get("X-RateLimit-Remaining"))
+        limit = _to_int(headers.get("X-RateLimit-Limit"))
+        reset_at = _to_epoch(headers.get("X-RateLimit-Reset"))
+        retry_after = _to_int(headers.get("Retry-After"))
+        with self._lock:
+            bucket = self._bucket(resource)
+            if limit is not None:
+                bucket.limit = limit
+            if remaining is not None:
+                bucket.remaining = remaining
+            if reset_at is not None:
+                bucket.reset_at = reset_at
+            if retry_after is not None:
+                bucket.blocked_until = max(bucket.blocked_until, time.time() + retry_after)
+
+    def update_from_graphql(self, rate_limit: Optional[Dict[str, Any]]) -> None:
+        """Refresh the GraphQL bucket from a `rateLimit { cost remaining resetAt limit }` block."""
+        if not rate_limit or not isinstance(rate_limit, dict):
+            return
+        with self._lock:
+            bucket = self._bucket("graphql")
+            limit = _to_int(rate_limit.get("limit"))
+            remaining = _to_int(rate_limit.get("remaining"))
+            reset_at = _to_epoch(rate_limit.get("resetAt"))
+            cost = _to_int(rate_limit.get("cost"))
+            if limit is not None:
+                bucket.limit = limit
+            if remaining is not None:
+                bucket.remaining = remaining
+            if reset_at is not None:
+                bucket.reset_at = reset_at
+            if cost:
+                bucket.last_cost = cost
+
+    def penalize(self, resource: str = "core", headers: Any = None) -> float:
+        """
+        Record a rate-limit rejection (403/429) and block the resource.
+        Uses `Retry-After`, then the reset time, then `default_penalty`. Returns the block length.
+        """
+        self.update_from_headers(headers, resource)
+        retry_after = _to_int(headers.get("Retry-After")) if headers is not None and hasattr(headers, "get") else None
+        with self._lock:
+            bucket = self._bucket(resource)
+            now = time.time()
+            if retry_after is not None:
+                until = now + retry_after
+            elif bucket.remaining == 0 and bucket.reset_at is not None and bucket.reset_at > now:
+                until = bucket.reset_at + 1.0
+            else:
+                until = now + self.default_penalty
+            bucket.blocked_until = max(bucket.blocked_until, until)
+            return bucket.blocked_until - now
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of every bucket: quota, reset time, pacing state and wait counters."""
+        now = time.time()
+        with self._lock:
+            return {
+                resource: {
+                    'limit': bucket.limit,
+                    'remaining': bucket.remaining,
+                    'reset_at': datetime.fromtimestamp(bucket.reset_at).isoformat() if bucket.reset_at else None,
+                    'seconds_to_reset': max(bucket.reset_at - now, 0.0) if bucket.reset_at else None,
+                    'blocked_for': max(bucket.blocked_until - now, 0.0),
+                    'pacing': bool(bucket.limit and bucket.remaining is not None
+                                   and bucket.remaining <= bucket.limit * self.pace_threshold),
+                    'last_cost': bucket.last_cost,
+                    'requests': bucket.requests,
+                    'throttled': bucket.throttled,
+                    'wait_seconds': round(bucket.wait_seconds, 3),
+                }
+                for resource, bucket in self._buckets.items()
+            }
+
+
+class AdaptivePageSize:
+    """
+    AIMD page-size controller for expensive GraphQL connections (commit history with
+    stats): the page grows by `step` after every response faster than `fast_seconds`
+    and is halved after every failure (timeout, 502, SERVICE_UNAVAILABLE, ...), so a
+    heavy repository settles on the largest page the server still answers in time.
+
+    Args:
+        initial: Starting page size (clamped to [minimum, maximum])
+        minimum: Smallest page; a failure at this size is reported to the caller (default: 10)
+        maximum: Largest page; GitHub caps connections at 100 nodes (default: 100)
+        step: Additive increase per fast response (default: 10)
+        fast_seconds: Responses up to this long count as fast (default: 5.0)
+    """
+
+    def __init__(self, initial: int, minimum: int = 10, maximum: int = 100, step: int = 10, fast_seconds: float = 5.0):
+        self.minimum = max(1, min(minimum, initial))
+        self.maximum = max(maximum, self.minimum)
+        self.step = step
+        self.fast_seconds = fast_seconds
+        self.size = max(self.minimum, min(initial, self.maximum))
+
+    def success(self, elapsed: float) -> int:
+        """Record a successful page; grows the size if it came back fast."""
+        if elapsed <= self.fast_seconds:
+            self.size = min(self.maximum, self.size + self.step)
+        return self.size
+
+    def failure(self) -> bool:
+        """
+        Record a failed page and halve the size. Returns True when the failure already
+        happened at the minimum size, i.e. smaller pages will not help.
+        """
+        if self.size <= self.minimum:
+            return True
+        self.size = max(self.minimum, self.size // 2)
+        return False
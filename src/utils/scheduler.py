@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class RepoScheduler:
+    """
+    Work queue shared by the bronze extractors: every per-repository task (issues of
+    repo A, commits of repo B, tree of repo C, ...) goes into the same pool of workers,
+    so a huge repository only keeps one worker busy while the small ones flow around
+    it, and the extractors can run side by side instead of one after another.
+
+    All tasks should use the same GitHubAPIClient: its rate-limit governor / token
+    pool is then the single budget every worker draws from.
+
+    Args:
+        max_workers: Concurrent repository tasks; 1 (or less) runs every task inline,
+            in order, on the calling thread
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self) -> 'RepoScheduler':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("RepoScheduler is shut down")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='repo')
+            return self._executor
+
+    def map(
+        self,
+        fn: Callable[[Dict[str, Any]], T],
+        repos: Iterable[Dict[str, Any]],
+        window: Optional[int] = None,
+    ) -> Iterator[T]:
+        """
+        Run fn(repo) for every repository and yield the results in input order, so the
+        caller can aggregate (`_all` files, state) on its own thread.
+
+        The largest repositories (GitHub `size`) are queued first: they set the wall
+        clock, so starting them early keeps the tail short. An exception raised by a
+        task is re-raised when its result is reached.
+
+        With `window`, at most that many tasks are submitted but not yet consumed, in
+        input order: results that hold resources (open temporary files, ...) then never
+        pile up behind one slow repository.
+        """
+        repos = list(repos)
+        if self.max_workers == 1:
+            for repo in repos:
+                yield fn(repo)
+            return
+
+        def size(index: int) -> int:
+            repo = repos[index]
+            return (repo.get('size') or 0) if isinstance(repo, dict) else 0
+
+        pool = self._pool()
+        futures: List[Optional[Future]] = [None] * len(repos)
+        try:
+            if window is None:
+                for index in sorted(range(len(repos)), key=size, reverse=True):
+                    futures[index] = pool.submit(fn, repos[index])
+                for future in futures:
+                    yield future.result()
+            else:
+                window = max(1, window)
+                for index in range(min(window, len(repos))):
+                    futures[index] = pool.submit(fn, repos[index])
+                for index in range(len(repos)):
+                    result = futures[index].result()
+                    futures[index] = None
+                    yield result
+                    # The caller is done with this result: its slot goes to the next repository
+                    if index + window < len(repos):
+                        futures[index + window] = pool.submit(fn, repos[index + window])
+        finally:
+            # Caller stopped early (error or break): drop the tasks that have not started
+            for future in futures:
+                if future is not None:
+                    future.cancel()
+
+    def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> 'Future[T]':
+        """
+        Start a whole extractor next to the others. Extractors get their own threads
+        (not the repository workers), so waiting on their repository tasks never
+        starves the pool. With max_workers=1 the extractor runs right away, inline.
+        """
+        future: 'Future[T]' = Future()
+
+        def target() -> None:
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        if self.max_workers == 1:
+            target()
+        else:
+            threading.Thread(target=target, name=getattr(fn, '__name__', 'extractor'), daemon=True).start()
+        return future
+
+    def shutdown(self) -> None:
+        """
+        Stop the workers: queued repository tasks are cancelled, running ones finish, and
+        extractors still going get an error on their next map() instead of a new pool.
+        """
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+@contextmanager
+def fanout_scheduler(scheduler: Optional[RepoScheduler], workers: int) -> Iterator[RepoScheduler]:
+    """
+    Scheduler for a fan-out of short API calls, one per repository (repository details,
+    contributors, ...). These run concurrently even when the extractors themselves run
+    one at a time (--workers 1): the shared `scheduler` is used only if it has at least
+    `workers` workers, otherwise a pool of `workers` threads is created and shut down on
+    exit. Size it from the client's pool_size, which bounds the open connections anyway.
+    """
+    if scheduler is not None and scheduler.max_workers >= workers:
+        yield scheduler
+        return
+    own = RepoScheduler(max_workers=workers)
+    try:
+        yield own
+    finally:
+        own.shutdown()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple, Union, Any
+
+from utils.rate_limit import RateLimitGovernor
+
+
+def load_tokens(explicit: Union[str, Sequence[str], None] = None, secrets_file: str = ".secrets") -> List[str]:
+    """
+    Collect GitHub tokens for a TokenPool, de-duplicated and in priority order:
+
+    1. `explicit` (a token, a comma-separated list or a sequence, e.g. from --token)
+    2. GITHUB_TOKENS (comma/space separated), GITHUB_TOKEN and GITHUB_TOKEN_<N> env vars
+    3. GITHUB_TOKEN* = ... lines in the .secrets file
+    """
+    candidates: List[str] = []
+
+    def add(value: Optional[str]) -> None:
+        if value:
+            candidates.extend(t for t in re.split(r'[\s,]+', value) if t)
+
+    if isinstance(explicit, str):
+        add(explicit)
+    elif explicit:
+        for value in explicit:
+            add(value)
+
+    add(os.getenv('GITHUB_TOKENS'))
+    add(os.getenv('GITHUB_TOKEN'))
+    numbered = sorted(
+        (int(match.group(1)), name)
+        for name in os.environ
+        for match in [re.fullmatch(r'GITHUB_TOKEN_(\d+)', name)]
+        if match
+    )
+    for _, name in numbered:
+        add(os.getenv(name))
+
+    if secrets_file and os.path.exists(secrets_file):
+        with open(secrets_file, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#') or '=' not in line:
+                    continue
+                key, value = line.split('=', 1)
+                if key.strip().startswith('GITHUB_TOKEN'):
+                    add(value.strip())
+
+    return list(dict.fromkeys(candidates))
+
+
+class _TokenState:
+    def __init__(self, token: str):
+        self.token = token
+        self.governor = RateLimitGovernor()
+        self.revoked = False
+
+
+class TokenPool:
+    """
+    Pool of GitHub tokens with one RateLimitGovernor each.
+
+    Every request is routed to the healthiest token: the one that is not revoked,
+    not blocked, and has the most remaining quota for the resource (unknown quota
+    counts as full). A token that hits its rate limit is blocked by its own
+    governor, so traffic fails over to the other tokens; a token rejected with
+    401 is marked revoked and skipped. Aggregate throughput therefore grows with
+    the number of tokens.
+
+    Args:
+        tokens: GitHub tokens; the first one is the primary token
+    """
+
+    def __init__(self, tokens: Sequence[str]):
+        tokens = list(dict.fromkeys(tokens))
+        if not tokens:
+            raise ValueError("TokenPool needs at least one GitHub token")
+        self._states = [_TokenState(token) for token in tokens]
+        self._by_token: Dict[str, _TokenState] = {state.token: state for state in self._states}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    @property
+    def tokens(self) -> List[str]:
+        return [state.token for state in self._states]
+
+    @property
+    def primary_governor(self) -> RateLimitGovernor:
+        return self._states[0].governor
+
+    def governor(self, token: str) -> RateLimitGovernor:
+        return self._by_token[token].governor
+
+    def select(self, resource: str = "core") -> str:
+        """Pick the healthiest token for `resource` without booking a request."""
+        with self._lock:
+            # With every token revoked, keep going with all of them (the API reports the error)
+            candidates = [state for state in self._states if not state.revoked] or self._states
+
+            def score(state: _TokenState) -> Tuple[float, float]:
+                wait, remaining = state.governor.peek(resource)
+                return wait, -(remaining if remaining is not None else float('inf'))
+
+            return min(candidates, key=score).token
+
+    def reserve(self, resource: str = "core", cost: Optional[int] = None) -> Tuple[str, float]:
+        """Pick a token and book a slot on its governor. Returns (token, seconds to wait); does not sleep."""
+        token = self.select(resource)
+        return token, self._by_token[token].governor.reserve(resource, cost)
+
+    def acquire(self, resource: str = "core", cost: Optional[int] = None) -> str:
+        """Pick a token and block until its governor allows the request. Returns the token."""
+        token = self.select(resource)
+        self._by_token[token].governor.acquire(resource, cost)
+        return token
+
+    def mark_revoked(self, token: str) -> bool:
+        """Stop routing to a token rejected with 401. Returns True if a usable token remains."""
+        with self._lock:
+            self._by_token[token].revoked = True
+            return any(not state.revoked for state in self._states)
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """Per-token status (tokens are masked) and governor metrics."""
+        return [
+            {
+                'token': f"...{str(state.token)[-4:]}",
+                'revoked': state.revoked,
+                'resources': state.governor.metrics(),
+            }
+            for state in self._states
+        ]
@@ -0,0 +1,287 @@
+"""
+Unit tests for src/utils/async_github_api.py
+Runs the async client against a local aiohttp stub server.
+"""
+import asyncio
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from utils.async_github_api import AsyncGitHubAPIClient
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def _start(app: web.Application) -> TestServer:
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+class TestAsyncGetWithCache:
+    """Testes para AsyncGitHubAPIClient.get_with_cache"""
+
+    def test_fetch_and_cache(self, tmp_path):
+        """Testa que a resposta é buscada uma vez e depois servida do cache"""
+        calls = []
+
+        async def handler(request):
+            calls.append(request.path)
+            assert request.headers["Authorization"] == "Bearer test"
+            return web.json_response({"ok": True}, headers={"X-RateLimit-Remaining": "4999", "X-RateLimit-Limit": "5000"})
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_get("/repos/o/r", handler)
+            server = await _start(app)
+            url = str(server.make_url("/repos/o/r"))
+            async with AsyncGitHubAPIClient("test", cache_dir=str(tmp_path)) as client:
+                first = await client.get_with_cache(url)
+                second = await client.get_with_cache(url)
+            await server.close()
+            return first, second
+
+        first, second = run(scenario())
+        assert first == {"ok": True}
+        assert second == {"ok": True}
+        assert calls == ["/repos/o/r"]
+
+    def test_revalidate_uses_etag(self, tmp_path):
+        """Testa revalidação com If-None-Match e resposta 304"""
+        seen = []
+
+        async def handler(request):
+            seen.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            return web.json_response({"v": 1}, headers={"ETag": '"v1"'})
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_get("/repos/o/r", handler)
+            server = await _start(app)
+            url = str(server.make_url("/repos/o/r"))
+            async with AsyncGitHubAPIClient("test", cache_dir=str(tmp_path), revalidate=True) as client:
+                first = await client.get_with_cache(url, silent=True)
+                second = await client.get_with_cache(url, silent=True)
+            await server.close()
+            return first, second
+
+        first, second = run(scenario())
+        assert first == second == {"v": 1}
+        assert seen == [None, '"v1"']
+
+    def test_identical_concurrent_requests_share_one_call(self, tmp_path):
+        """Testa single-flight: requisições idênticas simultâneas viram uma só"""
+        calls = []
+
+        async def handler(request):
+            calls.append(request.path)
+            await asyncio.sleep(0.05)
+            return web.json_response({"ok": True})
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_get("/repos/o/r", handler)
+            server = await _start(app)
+            url = str(server.make_url("/repos/o/r"))
+            async with AsyncGitHubAPIClient("test", cache_dir=str(tmp_path)) as client:
+                results = await asyncio.gather(*[client.get_with_cache(url, use_cache=False, silent=True) for _ in range(5)])
+                coalesced = client._sync.coalesced_requests
+            await server.close()
+            return results, coalesced
+
+        results, coalesced = run(scenario())
+        assert results == [{"ok": True}] * 5
+        assert calls == ["/repos/o/r"]
+        assert coalesced == 4
+
+    def test_404_returns_none(self, tmp_path):
+        """Testa que 404 retorna None"""
+        async def scenario():
+            app = web.Application()
+            server = await _start(app)
+            async with AsyncGitHubAPIClient("test", cache_dir=str(tmp_path)) as client:
+                result = await client.get_with_cache(str(server.make_url("/missing")), use_cache=False)
+            await server.close()
+            return result
+
+        assert run(scenario()) is None
+
+    def test_per_host_limit_bounds_in_flight_requests(self, tmp_path):
+        """Testa que o semáforo por host limita requisições simultâneas"""
+        state = {"in_flight": 0, "peak": 0}
+
+        async def handler(request):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.02)
+            state["in_flight"] -= 1
+            return web.json_response({"n": request.match_info["n"]})
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_get("/items/{n}", handler)
+            server = await _start(app)
+            async with AsyncGitHubAPIClient("test", cache_dir=str(tmp_path), max_concurrency=50, per_host_limit=4) as client:
+                results = await asyncio.gather(*[
+                    client.get_with_cache(str(server.make_url(f"/items/{i}")), use_cache=False, silent=True)
+                    for i in range(20)
+                ])
+            await server.close()
+            return results
+
+        results = run(scenario())
+        assert [r["n"] for r in results] == [str(i) for i in range(20)]
+        assert 1 < state["peak"] <= 4
+
+
+class TestAsyncGraphQL:
+    """Testes para AsyncGitHubAPIClient.graphql"""
+
+    def test_graphql_success_and_errors(self, tmp_path):
+        """Testa sucesso e resposta com erros"""
+        async def handler(request):
+            body = await request.json()
+            if "bad" in body["query"]:
+                return web.json_response({"errors": [{"message": "boom"}]})
+            return web.json_response({"data": {"viewer": {"login": "me"}}})
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_post("/graphql", handler)
+            server = await _start(app)
+            async with AsyncGitHubAPIClient("test", cache_dir=str(tmp_path)) as client:
+                client.graphql_url = str(server.make_url("/graphql"))
+                ok = await client.graphql("query { viewer { login } }", use_cache=False)
+                bad = await client.graphql("query { bad }", use_cache=False)
+            await server.close()
+            return ok, bad
+
+        ok, bad = run(scenario())
+        assert ok["data"]["viewer"]["login"] == "me"
+        assert bad is None
+
+
+class TestAsyncPaginationAndHistory:
+    """Testes para get_paginated e graphql_commit_history"""
+
+    def test_get_paginated_stops_on_short_page(self, tmp_path):
+        """Testa paginação até página incompleta"""
+        async def handler(request):
+            page = int(request.query["page"])
+            return web.json_response([{"id": page * 10 + i} for i in range(2 if page < 3 else 1)])
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_get("/issues", handler)
+            server = await _start(app)
+            async with AsyncGitHubAPIClient("test", cache_dir=str(tmp_path)) as client:
+                items = await client.get_paginated(str(server.make_url("/issues")), use_cache=False, per_page=2)
+            await server.close()
+            return items
+
+        items = run(scenario())
+        assert [i["id"] for i in items] == [10, 11, 20, 21, 30]
+
+    def test_commit_history_walks_ranges_concurrently_and_dedups(self, tmp_path):
+        """Testa que períodos são percorridos e commits deduplicados por SHA"""
+        client = AsyncGitHubAPIClient("test", cache_dir=str(tmp_path))
+
+        async def fake_graphql(query, variables, use_cache=True, timeout=4):
+            nodes = [{"oid": "shared"}, {"oid": f"sha-{variables['since']}", "additions": None, "deletions": 2}]
+            return {"data": {
+                "repository": {"defaultBranchRef": {"target": {"history": {
+                    "nodes": nodes, "pageInfo": {"hasNextPage": False, "endCursor": None}}}}},
+                "rateLimit": {"remaining": 4000, "limit": 5000},
+            }}
+
+        client.graphql = fake_graphql
+        commits, meta = run(client.graphql_commit_history(
+            "o", "r", page_size=50,
+            since="2024-01-01T00:00:00Z", until="2024-04-01T00:00:00Z", time_chunks=3,
+        ))
+
+        shas = sorted(c["oid"] for c in commits)
+        assert len(shas) == 4
+        assert "shared" in shas
+        assert meta["remaining"] == 4000
+        assert all(c["additions"] is not None for c in commits)
+
+    def test_commit_history_rest_fallback(self, tmp_path):
+        """Testa fallback REST quando GraphQL falha"""
+        client = AsyncGitHubAPIClient("test", cache_dir=str(tmp_path))
+
+        async def failing_graphql(*args, **kwargs):
+            return None
+
+        async def fake_get(url, use_cache=True, **kwargs):
+            if "/commits?" in url:
+                return [{"sha": "abc12345", "commit": {"message": "msg\nbody", "author": {"date": "2024-01-01T00:00:00Z"}}, "author": {"login": "dev"}}]
+            return {"stats": {"additions": 3, "deletions": 1}}
+
+        client.graphql = failing_graphql
+        client.get_with_cache = fake_get
+        commits, _ = run(client.graphql_commit_history("o", "r", page_size=50))
+
+        assert commits == [{
+            "oid": "abc12345",
+            "messageHeadline": "msg",
+            "committedDate": "2024-01-01T00:00:00Z",
+            "author": {"user": {"login": "dev"}},
+            "additions": 3,
+            "deletions": 1,
+        }]
+
+
+class TestAsyncRepositoryTree:
+    """Testes para get_repository_tree"""
+
+    def test_rest_tree(self, tmp_path):
+        """Testa árvore REST não truncada"""
+        client = AsyncGitHubAPIClient("test", cache_dir=str(tmp_path))
+
+        async def fake_get(url, use_cache=True, **kwargs):
+            if "/branches/" in url:
+                return {"commit": {"sha": "deadbeef"}}
+            return {"truncated": False, "tree": [
+                {"path": "src", "type": "tree", "sha": "t1"},
+                {"path": "src/app.py", "type": "blob", "sha": "b1", "size": 10},
+            ]}
+
+        client.get_with_cache = fake_get
+        result = run(client.get_repository_tree("o", "r"))
+
+        assert result["method"] == "rest"
+        assert result["sha"] == "deadbeef"
+        assert [n["path"] for n in result["tree"]] == ["src", "src/app.py"]
+
+    def test_truncated_tree_uses_graphql_levels(self, tmp_path):
+        """Testa fallback GraphQL percorrendo diretórios por nível"""
+        client = AsyncGitHubAPIClient("test", cache_dir=str(tmp_path))
+        entries = {
+            "main:": [{"name": "src", "path": "src", "type": "tree"}, {"name": "README.md", "path": "README.md", "type": "blob", "object": {"byteSize": 5}}],
+            "main:src": [{"name": "a.py", "path": "src/a.py", "type": "blob", "extension": ".py", "object": {"byteSize": 7}}],
+        }
+
+        async def fake_get(url, use_cache=True, **kwargs):
+            if "/branches/" in url:
+                return {"commit": {"sha": "deadbeef"}}
+            return {"truncated": True, "tree": []}
+
+        async def fake_graphql(query, variables, use_cache=True, timeout=4):
+            return {"data": {"repository": {"object": {"entries": entries[variables["expression"]]}}}}
+
+        client.get_with_cache = fake_get
+        client.graphql = fake_graphql
+        result = run(client.get_repository_tree("o", "r"))
+
+        assert result["method"] == "graphql"
+        src = next(n for n in result["tree"] if n["path"] == "src")
+        assert src["children"][0]["path"] == "src/a.py"
+        assert src["children"][0]["size"] == 7
@@ -303,14 +303,17 @@ class TestExtractCommits:
         ]
         
         mock_client.get_paginated.return_value = mock_commits
-        mock_client.get_with_cache.return_value = {"stats": {"additions": 10, "deletions": 5, "total": 15}}
+        mock_client.get_commit_stats.return_value = {"abc123": {"additions": 10, "deletions": 5, "total": 15}}
         
+        saved = []
         with patch('bronze.commits.load_json_data', return_value=mock_repos):
-            with patch('bronze.commits.save_json_data', return_value="file.json"):
+            with patch('bronze.commits.save_json_data', side_effect=lambda data, path: saved.append(data) or "file.json"):
                 extract_commits(mock_client, mock_config, method="rest")
                 
-                # Deve buscar detalhes para cada commit (2 commits)
-                assert mock_client.get_with_cache.call_count == 2
+                # Busca os stats dos 2 commits numa única chamada em lote
+                mock_client.get_commit_stats.assert_called_once_with("test-org", "repo1", ["abc123", "def456"], use_cache=True)
+                assert saved[0][0]["total_changes"] == 15
+                assert saved[0][1]["additions"] is None
     
     def test_extract_commits_graphql_maps_fields_correctly(self):
         """Testa que GraphQL mapeia campos para formato REST compatível"""
@@ -492,7 +495,7 @@ class TestExtractCommits:
                     until="2024-12-31",
                     max_commits_per_repo=100,
                     page_size=25,
-                    time_chunks=5  # Nota: Este parâmetro é ignorado pelo código que tem hardcoded time_chunks=3
+                    time_chunks=5
                 )
                 
                 # Verifica parâmetros
@@ -501,6 +504,69 @@ class TestExtractCommits:
                 assert call_kwargs.get('until') == "2024-12-31"
                 assert call_kwargs.get('max_commits') == 100
                 assert call_kwargs.get('page_size') == 25
-                # O código tem time_chunks=3 hardcoded, não usa o parâmetro
-                assert call_kwargs.get('time_chunks') == 3
+                assert call_kwargs.get('time_chunks') == 5
                 assert call_kwargs.get('split_large_extractions') is True
+
+    def test_extract_commits_graphql_uses_batched_history(self, capsys):
+        """Testa que o histórico em lote evita a consulta por repositório"""
+        mock_client = MagicMock()
+        mock_config = MagicMock()
+        
+        mock_repos = [
+            {"name": "repo1", "full_name": "test-org/repo1"},
+            {"name": "repo2", "full_name": "test-org/repo2"},
+        ]
+        node = {"oid": "abc123", "committedDate": "2024-01-01T00:00:00Z", "additions": 1, "deletions": 2, "author": {}}
+        mock_client.graphql_commit_history_batch.return_value = {
+            ("test-org", "repo1"): [node],
+            ("test-org", "repo2"): None,  # failed in the batch
+        }
+        mock_client.graphql_commit_history.return_value = ([{**node, "oid": "def456"}], {})
+        
+        with patch('bronze.commits.load_json_data', return_value=mock_repos):
+            with patch('bronze.commits.save_json_data', return_value="file.json"):
+                extract_commits(mock_client, mock_config, method="graphql", page_size=25)
+        
+        repos_arg = mock_client.graphql_commit_history_batch.call_args[0][0]
+        assert repos_arg == [("test-org", "repo1"), ("test-org", "repo2")]
+        # Only the repository that failed in the batch is fetched on its own
+        assert mock_client.graphql_commit_history.call_count == 1
+        assert mock_client.graphql_commit_history.call_args[1]["repo"] == "repo2"
+        assert "Total commits extracted: 2" in capsys.readouterr().out
+
+    def test_extract_commits_incremental_uses_high_water_mark(self, tmp_path, monkeypatch):
+        """Testa extração incremental: marca por repositório, busca só commits novos e mescla"""
+        import json
+        monkeypatch.chdir(tmp_path)
+        mock_repos = [{"name": "repo1", "full_name": "test-org/repo1"}]
+        
+        def node(oid, date):
+            return {"oid": oid, "committedDate": date, "additions": 1, "deletions": 1, "author": {}}
+        
+        def run(batch_nodes):
+            client = MagicMock()
+            client.graphql_commit_history_batch.return_value = {("test-org", "repo1"): batch_nodes}
+            with patch('bronze.commits.load_json_data', return_value=mock_repos):
+                extract_commits(client, MagicMock(), method="graphql", incremental=True)
+            return client
+        
+        run([node("b", "2024-01-02T00:00:00Z"), node("a", "2024-01-01T00:00:00Z")])
+        state = json.loads((tmp_path / "data/bronze/_state/commits.json").read_text())
+        assert state["test-org/repo1"][""] == {"sha": "b", "committed_date": "2024-01-02T00:00:00Z"}
+        
+        # Next run: only newer commits are requested; the known "b" returned again is skipped
+        client = run([node("c", "2024-01-03T00:00:00Z"), node("b", "2024-01-02T00:00:00Z")])
+        kwargs = client.graphql_commit_history_batch.call_args[1]
+        assert kwargs["since_by_repo"] == {("test-org", "repo1"): "2024-01-02T00:00:00Z"}
+        
+        saved = json.loads((tmp_path / "data/bronze/commits_repo1.json").read_text())
+        assert [c["sha"] for c in saved[1:]] == ["c", "b", "a"]
+        all_saved = json.loads((tmp_path / "data/bronze/commits_all.json").read_text())
+        assert len(all_saved) == 4  # metadata + 3 commits
+        state = json.loads((tmp_path / "data/bronze/_state/commits.json").read_text())
+        assert state["test-org/repo1"][""]["sha"] == "c"
+        
+        # No new commits: no REST fallback, file kept
+        client = run([])
+        assert not client.get_paginated.called
+        assert not client.graphql_commit_history.called
@@ -249,8 +249,69 @@ class TestBronzeExtract:
                                     
                                     bronze_extract.main()
         
+        # Default (--workers 1): serial, one step after another
         assert call_order == ['repos', 'issues', 'commits', 'members']
     
+    def test_main_with_workers_runs_extractors_side_by_side(self):
+        """Testa que com --workers os extratores rodam juntos, depois dos repositórios, no mesmo scheduler"""
+        import threading
+        call_order = []
+        schedulers = []
+        # Only passes if issues, commits and members are running at the same time
+        barrier = threading.Barrier(3, timeout=5)
+        
+        def track_repos(*args, **kwargs):
+            call_order.append('repos')
+            schedulers.append(kwargs.get('scheduler'))
+            return []
+        
+        def tracker(name):
+            def track(*args, **kwargs):
+                assert call_order[0] == 'repos'
+                schedulers.append(kwargs.get('scheduler'))
+                barrier.wait()
+                call_order.append(name)
+                return []
+            return track
+        
+        with patch('sys.argv', ['bronze_extract.py', '--token', 'test-token', '--workers', '4', '--skip-structure']):
+            with patch('bronze.repositories.extract_repositories', side_effect=track_repos):
+                with patch('bronze.issues.extract_issues', side_effect=tracker('issues')):
+                    with patch('bronze.commits.extract_commits', side_effect=tracker('commits')):
+                        with patch('bronze.members.extract_members', side_effect=tracker('members')):
+                            with patch('utils.github_api.update_data_registry'):
+                                with patch('utils.github_api.GitHubAPIClient'):
+                                    from src import bronze_extract
+                                    
+                                    bronze_extract.main()
+        
+        assert call_order[0] == 'repos'
+        assert sorted(call_order[1:]) == ['commits', 'issues', 'members']
+        assert schedulers[0].max_workers == 4
+        assert all(s is schedulers[0] for s in schedulers)
+    
+    def test_main_shuts_down_scheduler_when_extractor_fails(self):
+        """Testa que o scheduler é encerrado quando um extrator falha, sem aceitar novas tarefas"""
+        schedulers = []
+        
+        def failing_issues(*args, **kwargs):
+            schedulers.append(kwargs.get('scheduler'))
+            raise RuntimeError("API Error")
+        
+        with patch('sys.argv', ['bronze_extract.py', '--token', 'test-token', '--workers', '4', '--skip-structure']):
+            with patch('bronze.repositories.extract_repositories', return_value=[]):
+                with patch('bronze.issues.extract_issues', side_effect=failing_issues):
+                    with patch('bronze.commits.extract_commits', return_value=[]):
+                        with patch('bronze.members.extract_members', return_value=[]):
+                            with patch('utils.github_api.GitHubAPIClient'):
+                                from src import bronze_extract
+                                
+                                with pytest.raises(SystemExit):
+                                    bronze_extract.main()
+        
+        with pytest.raises(RuntimeError):
+            list(schedulers[0].map(lambda repo: repo, [{"name": "a"}, {"name": "b"}]))
+    
     def test_main_displays_timestamp(self, capsys):
         """Testa que main exibe timestamp de início"""
         with patch('sys.argv', ['bronze_extract.py', '--token', 'test-token']):
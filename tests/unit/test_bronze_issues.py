@@ -29,7 +29,7 @@ class TestExtractIssues:
             }
         ]
         
-        mock_client.get_paginated.side_effect = [mock_issues, []]  # issues, events
+        mock_client.iter_paginated.side_effect = [mock_issues, []]  # issues, events
         
         with patch('bronze.issues.load_json_data', return_value=mock_repos):
             with patch('bronze.issues.save_json_data', return_value="file.json") as mock_save:
@@ -51,11 +51,11 @@ class TestExtractIssues:
             {"number": 2, "title": "PR", "pull_request": {"url": "pr_url"}}
         ]
         
-        mock_client.get_paginated.side_effect = [mock_mixed_data, []]
+        mock_client.iter_paginated.side_effect = [mock_mixed_data, []]
         
         saved_data = {}
         def capture_save(data, path):
-            saved_data[path] = data
+            saved_data[path] = list(data)  # spools are closed once extract_issues returns
             return path
         
         with patch('bronze.issues.load_json_data', return_value=mock_repos):
@@ -97,11 +97,11 @@ class TestExtractIssues:
             }
         ]
         
-        mock_client.get_paginated.side_effect = [[], mock_events]  # issues, events
+        mock_client.iter_paginated.side_effect = [[], mock_events]  # issues, events
         
         saved_data = {}
         def capture_save(data, path):
-            saved_data[path] = data
+            saved_data[path] = list(data)
             return path
         
         with patch('bronze.issues.load_json_data', return_value=mock_repos):
@@ -133,7 +133,7 @@ class TestExtractIssues:
         
         mock_repos = [{"name": "repo1", "full_name": "test-org/repo1"}]
         
-        mock_client.get_paginated.side_effect = [None, None]  # Sem issues, sem events
+        mock_client.iter_paginated.side_effect = [[], []]  # Sem issues, sem events
         
         with patch('bronze.issues.load_json_data', return_value=mock_repos):
             with patch('bronze.issues.save_json_data', return_value="file.json") as mock_save:
@@ -155,7 +155,7 @@ class TestExtractIssues:
         mock_issues = [{"number": 1, "title": "Issue"}]
         mock_events = [{"id": 1, "event": "closed", "created_at": "2024-01-01", "actor": {"login": "u"}, "issue": {"number": 1}}]
         
-        mock_client.get_paginated.side_effect = [
+        mock_client.iter_paginated.side_effect = [
             mock_issues, mock_events,  # repo1
             mock_issues, mock_events   # repo2
         ]
@@ -177,7 +177,7 @@ class TestExtractIssues:
         mock_config = MagicMock()
         
         mock_repos = [{"name": "repo1", "full_name": "test-org/repo1"}]
-        mock_client.get_paginated.return_value = []
+        mock_client.iter_paginated.return_value = []
         
         with patch('bronze.issues.load_json_data', return_value=mock_repos):
             with patch('bronze.issues.save_json_data', return_value="file.json") as mock_save:
@@ -194,14 +194,14 @@ class TestExtractIssues:
         mock_config = MagicMock()
         
         mock_repos = [{"name": "repo1", "full_name": "test-org/repo1"}]
-        mock_client.get_paginated.return_value = []
+        mock_client.iter_paginated.return_value = []
         
         with patch('bronze.issues.load_json_data', return_value=mock_repos):
             with patch('bronze.issues.save_json_data', return_value="file.json"):
                 extract_issues(mock_client, mock_config, use_cache=False)
                 
                 # Verifica que use_cache foi passado
-                for call in mock_client.get_paginated.call_args_list:
+                for call in mock_client.iter_paginated.call_args_list:
                     assert call[1].get('use_cache') is False
     
     def test_extract_issues_constructs_correct_urls(self):
@@ -210,14 +210,14 @@ class TestExtractIssues:
         mock_config = MagicMock()
         
         mock_repos = [{"name": "repo1", "full_name": "test-org/repo1"}]
-        mock_client.get_paginated.return_value = []
+        mock_client.iter_paginated.return_value = []
         
         with patch('bronze.issues.load_json_data', return_value=mock_repos):
             with patch('bronze.issues.save_json_data', return_value="file.json"):
                 extract_issues(mock_client, mock_config)
                 
                 # Verifica URLs chamadas
-                calls = [call[0][0] for call in mock_client.get_paginated.call_args_list]
+                calls = [call[0][0] for call in mock_client.iter_paginated.call_args_list]
                 assert any("/repos/test-org/repo1/issues" in c for c in calls)
                 assert any("/repos/test-org/repo1/issues/events" in c for c in calls)
     
@@ -232,7 +232,7 @@ class TestExtractIssues:
             {"name": "valid", "full_name": "test-org/valid"}
         ]
         
-        mock_client.get_paginated.return_value = []
+        mock_client.iter_paginated.return_value = []
         
         with patch('bronze.issues.load_json_data', return_value=mock_repos):
             with patch('bronze.issues.save_json_data', return_value="file.json"):
@@ -251,7 +251,7 @@ class TestExtractIssues:
             {"name": "repo1", "full_name": "test-org/repo1"}
         ]
         
-        mock_client.get_paginated.return_value = []
+        mock_client.iter_paginated.return_value = []
         
         with patch('bronze.issues.load_json_data', return_value=mock_repos):
             with patch('bronze.issues.save_json_data', return_value="file.json"):
@@ -259,7 +259,7 @@ class TestExtractIssues:
                 
                 # Deve processar apenas 1 repo (ignorando _metadata)
                 # 2 chamadas por repo (issues + events)
-                assert mock_client.get_paginated.call_count == 2
+                assert mock_client.iter_paginated.call_count == 2
     
     def test_extract_issues_adds_repo_name_to_issues(self):
         """Testa que adiciona repo_name a cada issue"""
@@ -269,11 +269,11 @@ class TestExtractIssues:
         mock_repos = [{"name": "test-repo", "full_name": "test-org/test-repo"}]
         mock_issues = [{"number": 1, "title": "Issue"}]
         
-        mock_client.get_paginated.side_effect = [mock_issues, []]
+        mock_client.iter_paginated.side_effect = [mock_issues, []]
         
         saved_data = {}
         def capture_save(data, path):
-            saved_data[path] = data
+            saved_data[path] = list(data)
             return path
         
         with patch('bronze.issues.load_json_data', return_value=mock_repos):
@@ -292,11 +292,11 @@ class TestExtractIssues:
         mock_repos = [{"name": "test-repo", "full_name": "test-org/test-repo"}]
         mock_prs = [{"number": 1, "title": "PR", "pull_request": {"url": "url"}}]
         
-        mock_client.get_paginated.side_effect = [mock_prs, []]
+        mock_client.iter_paginated.side_effect = [mock_prs, []]
         
         saved_data = {}
         def capture_save(data, path):
-            saved_data[path] = data
+            saved_data[path] = list(data)
             return path
         
         with patch('bronze.issues.load_json_data', return_value=mock_repos):
@@ -324,7 +324,7 @@ class TestExtractIssues:
             {"id": 1, "event": "closed", "created_at": "2024-01-01", "actor": {"login": "u"}, "issue": {"number": 1}}
         ]
         
-        mock_client.get_paginated.side_effect = [mock_issues, mock_events]
+        mock_client.iter_paginated.side_effect = [mock_issues, mock_events]
         
         with patch('bronze.issues.load_json_data', return_value=mock_repos):
             with patch('bronze.issues.save_json_data', return_value="file.json"):
@@ -347,11 +347,11 @@ class TestExtractIssues:
             {"id": 1, "event": "closed", "created_at": "2024-01-01", "actor": None, "issue": {"number": 1}}
         ]
         
-        mock_client.get_paginated.side_effect = [[], mock_events]
+        mock_client.iter_paginated.side_effect = [[], mock_events]
         
         saved_data = {}
         def capture_save(data, path):
-            saved_data[path] = data
+            saved_data[path] = list(data)
             return path
         
         with patch('bronze.issues.load_json_data', return_value=mock_repos):
@@ -374,11 +374,11 @@ class TestExtractIssues:
             {"id": 1, "event": "closed", "created_at": "2024-01-01", "actor": {"login": "u"}, "issue": None}
         ]
         
-        mock_client.get_paginated.side_effect = [[], mock_events]
+        mock_client.iter_paginated.side_effect = [[], mock_events]
         
         saved_data = {}
         def capture_save(data, path):
-            saved_data[path] = data
+            saved_data[path] = list(data)
             return path
         
         with patch('bronze.issues.load_json_data', return_value=mock_repos):
@@ -400,7 +400,7 @@ class TestExtractIssues:
         # Apenas issues, sem PRs
         mock_issues = [{"number": 1, "title": "Issue"}]
         
-        mock_client.get_paginated.side_effect = [mock_issues, []]
+        mock_client.iter_paginated.side_effect = [mock_issues, []]
         
         with patch('bronze.issues.load_json_data', return_value=mock_repos):
             with patch('bronze.issues.save_json_data', return_value="file.json") as mock_save:
@@ -411,3 +411,68 @@ class TestExtractIssues:
                 calls = [call[0][1] for call in mock_save.call_args_list]
                 assert any("issues_repo1" in c for c in calls)
                 assert not any("prs_repo1" in c for c in calls)
+
+    def test_extract_issues_incremental_upserts_changes(self, tmp_path, monkeypatch):
+        """Testa extração incremental: since nas issues, parada em eventos conhecidos e upsert por id"""
+        import json
+        monkeypatch.chdir(tmp_path)
+        mock_repos = [{"name": "repo1", "full_name": "test-org/repo1"}]
+        
+        def run(issues, events):
+            client = MagicMock()
+            client.iter_paginated.side_effect = [issues, events]
+            with patch('bronze.issues.load_json_data', return_value=mock_repos):
+                extract_issues(client, MagicMock(), incremental=True)
+            return client
+        
+        run(
+            [{"id": 2, "state": "open", "updated_at": "2024-01-02T00:00:00Z"},
+             {"id": 1, "state": "open", "updated_at": "2024-01-01T00:00:00Z", "pull_request": {"url": "pr_url"}}],
+            [{"id": 11, "event": "labeled"}, {"id": 10, "event": "closed"}],
+        )
+        
+        # Issue 2 closed, issue 3 opened, one new event
+        client = run(
+            [{"id": 3, "state": "open", "updated_at": "2024-01-04T00:00:00Z"},
+             {"id": 2, "state": "closed", "updated_at": "2024-01-03T00:00:00Z"}],
+            [{"id": 12, "event": "closed"}, {"id": 11, "event": "labeled"}, {"id": 10, "event": "closed"}],
+        )
+        
+        issues_url = client.iter_paginated.call_args_list[0][0][0]
+        assert issues_url.endswith("?state=all&since=2024-01-02T00:00:00Z")
+        
+        def records(name):
+            return json.loads((tmp_path / "data/bronze" / name).read_text())[1:]
+        
+        assert [(i["id"], i["state"]) for i in records("issues_repo1.json")] == [(3, "open"), (2, "closed")]
+        assert [i["id"] for i in records("prs_all.json")] == [1]  # unchanged PR file kept
+        assert [e["id"] for e in records("issue_events_all.json")] == [12, 11, 10]
+        
+        state = json.loads((tmp_path / "data/bronze/_state/issues.json").read_text())
+        assert state["test-org/repo1"] == {"updated_at": "2024-01-04T00:00:00Z", "event_id": 12}
+
+    def test_extract_issues_closes_spools_on_failure(self):
+        """Testa que os arquivos temporários (JsonSpool) são fechados mesmo quando a extração falha"""
+        from utils.github_api import JsonSpool
+        spools = []
+        
+        class TrackedSpool(JsonSpool):
+            def __init__(self):
+                super().__init__()
+                spools.append(self)
+        
+        def failing_events():
+            yield {"id": 10, "event": "closed"}
+            raise RuntimeError("connection lost")
+        
+        mock_client = MagicMock()
+        mock_client.iter_paginated.side_effect = [[{"number": 1, "title": "Issue"}], failing_events()]
+        
+        with patch('bronze.issues.load_json_data', return_value=[{"name": "repo1", "full_name": "test-org/repo1"}]):
+            with patch('bronze.issues.save_json_data', return_value="file.json"):
+                with patch('bronze.issues.JsonSpool', TrackedSpool):
+                    with pytest.raises(RuntimeError):
+                        extract_issues(mock_client, MagicMock())
+        
+        assert len(spools) == 6  # 3 agregados + 3 do repositório
+        assert all(spool._file.closed for spool in spools)
@@ -4,9 +4,11 @@ Testes unitários para o módulo bronze.members.
 Testa a extração de membros da organização.
 """
 
+import threading
 import pytest
 from unittest.mock import patch, MagicMock
 from bronze.members import extract_members
+from utils.scheduler import RepoScheduler
 
 
 class TestExtractMembers:
@@ -14,7 +16,7 @@ class TestExtractMembers:
     
     def test_extract_members_success(self, capsys):
         """Testa extração bem-sucedida de membros"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -35,7 +37,7 @@ class TestExtractMembers:
     
     def test_extract_members_empty_falls_back_to_contributors(self, capsys):
         """Testa fallback para contributors quando members API retorna vazio"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -61,6 +63,7 @@ class TestExtractMembers:
             return None
         
         mock_client.get_with_cache.side_effect = mock_get_with_cache
+        mock_client.get_paginated.side_effect = lambda url, **kwargs: mock_get_with_cache(url, True)
         
         with patch('utils.github_api.load_json_data', return_value=mock_repos):
             with patch('bronze.members.save_json_data', return_value="file.json"):
@@ -74,7 +77,7 @@ class TestExtractMembers:
     
     def test_extract_members_none_response(self, capsys):
         """Testa tratamento quando API retorna None"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -92,7 +95,7 @@ class TestExtractMembers:
     
     def test_extract_members_creates_empty_files_when_no_data(self, capsys):
         """Testa que cria arquivos vazios quando não há dados"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -112,7 +115,7 @@ class TestExtractMembers:
     
     def test_extract_members_uses_cache_flag(self):
         """Testa que respeita o flag use_cache"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -129,7 +132,7 @@ class TestExtractMembers:
     
     def test_extract_members_saves_basic_info(self):
         """Testa que salva informações básicas dos membros"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -145,7 +148,7 @@ class TestExtractMembers:
     
     def test_extract_members_saves_detailed_file(self):
         """Testa que salva arquivo de membros detalhados"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -161,7 +164,7 @@ class TestExtractMembers:
     
     def test_extract_members_constructs_correct_url(self):
         """Testa que constrói URL correta para a API"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "my-organization"
         
@@ -179,7 +182,7 @@ class TestExtractMembers:
     
     def test_extract_members_fallback_accumulates_contributions(self, capsys):
         """Testa que fallback acumula contribuições de múltiplos repos"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -199,6 +202,7 @@ class TestExtractMembers:
             return None
         
         mock_client.get_with_cache.side_effect = mock_get_with_cache
+        mock_client.get_paginated.side_effect = lambda url, **kwargs: mock_get_with_cache(url, True)
         
         with patch('utils.github_api.load_json_data', return_value=mock_repos):
             with patch('bronze.members.save_json_data', return_value="file.json"):
@@ -212,7 +216,7 @@ class TestExtractMembers:
     
     def test_extract_members_fallback_sorts_by_contributions(self, capsys):
         """Testa que fallback ordena por contribuições"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -232,6 +236,7 @@ class TestExtractMembers:
             return None
         
         mock_client.get_with_cache.side_effect = mock_get_with_cache
+        mock_client.get_paginated.side_effect = lambda url, **kwargs: mock_get_with_cache(url, True)
         
         with patch('utils.github_api.load_json_data', return_value=mock_repos):
             with patch('bronze.members.save_json_data', return_value="file.json"):
@@ -243,7 +248,7 @@ class TestExtractMembers:
     
     def test_extract_members_fallback_skips_metadata(self):
         """Testa que fallback ignora entrada _metadata"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -265,6 +270,7 @@ class TestExtractMembers:
             return None
         
         mock_client.get_with_cache.side_effect = mock_get_with_cache
+        mock_client.get_paginated.side_effect = lambda url, **kwargs: mock_get_with_cache(url, True)
         
         with patch('utils.github_api.load_json_data', return_value=mock_repos):
             with patch('bronze.members.save_json_data', return_value="file.json"):
@@ -275,7 +281,7 @@ class TestExtractMembers:
     
     def test_extract_members_fallback_handles_invalid_repos(self, capsys):
         """Testa que fallback lida com repos inválidos"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -298,6 +304,7 @@ class TestExtractMembers:
             return None
         
         mock_client.get_with_cache.side_effect = mock_get_with_cache
+        mock_client.get_paginated.side_effect = lambda url, **kwargs: mock_get_with_cache(url, True)
         
         with patch('utils.github_api.load_json_data', return_value=mock_repos):
             with patch('bronze.members.save_json_data', return_value="file.json"):
@@ -308,7 +315,7 @@ class TestExtractMembers:
     
     def test_extract_members_returns_generated_files(self):
         """Testa que retorna lista de arquivos gerados"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -329,7 +336,7 @@ class TestExtractMembers:
     
     def test_extract_members_default_cache_true(self):
         """Testa que o valor padrão de use_cache é True"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -343,3 +350,78 @@ class TestExtractMembers:
             call_args = mock_client.get_with_cache.call_args[0]
             # Segundo argumento deve ser True
             assert call_args[1] is True
+
+    def test_extract_members_fallback_pages_contributors_concurrently(self, capsys):
+        """Testa que o fallback busca todas as páginas de contribuidores, com repositórios em paralelo"""
+        mock_client = MagicMock(pool_size=4)
+        mock_config = MagicMock()
+        mock_config.org_name = "test-org"
+        
+        mock_repos = [{"full_name": f"test-org/repo{i}", "name": f"repo{i}"} for i in range(3)]
+        mock_client.get_with_cache.return_value = []
+        
+        barrier = threading.Barrier(3, timeout=5)
+        
+        def mock_get_paginated(url, **kwargs):
+            barrier.wait()  # só passa se os 3 repositórios estiverem sendo buscados ao mesmo tempo
+            # 150 contribuidores: mais de uma página de 100
+            return [{"login": f"user{i}", "type": "User", "contributions": 1} for i in range(150)]
+        
+        mock_client.get_paginated.side_effect = mock_get_paginated
+        with patch('utils.github_api.load_json_data', return_value=mock_repos):
+            with patch('bronze.members.save_json_data', return_value="file.json") as mock_save:
+                # Sem --workers: o fan-out usa o pool do cliente
+                extract_members(mock_client, mock_config, scheduler=RepoScheduler(max_workers=1))
+        
+        assert mock_client.get_paginated.call_count == 3
+        assert all(c.kwargs["per_page"] == 100 and c.kwargs["parallel"] for c in mock_client.get_paginated.call_args_list)
+        members = mock_save.call_args_list[0][0][0]
+        assert len(members) == 150
+        assert all(m["contributions_total"] == 3 and m["discovered_from_repo"] == "repo0" for m in members)
+    
+    def test_extract_members_fallback_adds_mentionable_users(self, capsys):
+        """Testa que mentionableUsers é buscado em lotes GraphQL, paginando por cursor"""
+        mock_client = MagicMock(pool_size=4)
+        mock_config = MagicMock()
+        mock_config.org_name = "test-org"
+        
+        mock_repos = [
+            {"full_name": "test-org/repo1", "name": "repo1"},
+            {"full_name": "test-org/repo2", "name": "repo2"}
+        ]
+        mock_client.get_with_cache.return_value = []
+        mock_client.get_paginated.return_value = [{"login": "dev", "type": "User", "contributions": 7}]
+        
+        rounds = []
+        
+        def graphql_repositories(repos, fields, **kwargs):
+            rounds.append({key: fields(key) for key in repos})
+            if len(rounds) == 1:
+                return {
+                    ("test-org", "repo1"): {"mentionableUsers": {
+                        "pageInfo": {"hasNextPage": True, "endCursor": "c1"},
+                        "nodes": [{"login": "dev"}, {"login": "reviewer", "url": "https://github.com/reviewer"}]
+                    }},
+                    ("test-org", "repo2"): None,
+                }
+            return {("test-org", "repo1"): {"mentionableUsers": {
+                "pageInfo": {"hasNextPage": False, "endCursor": None},
+                "nodes": [{"login": "maintainer"}]
+            }}}
+        
+        mock_client.graphql_repositories.side_effect = graphql_repositories
+        
+        with patch('utils.github_api.load_json_data', return_value=mock_repos):
+            with patch('bronze.members.save_json_data', return_value="file.json") as mock_save:
+                extract_members(mock_client, mock_config, include_mentionable=True)
+        
+        assert len(rounds) == 2
+        assert set(rounds[0]) == {("test-org", "repo1"), ("test-org", "repo2")}
+        assert list(rounds[1]) == [("test-org", "repo1")]
+        assert 'after: "c1"' in rounds[1][("test-org", "repo1")]
+        members = mock_save.call_args_list[0][0][0]
+        assert [m["login"] for m in members] == ["dev", "reviewer", "maintainer"]
+        assert members[0]["contributions_total"] == 14
+        assert members[1]["data_source"] == "mentionable_users"
+        assert "Found 2 mentionable users without contributions" in capsys.readouterr().out
+
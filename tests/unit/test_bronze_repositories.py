@@ -7,6 +7,14 @@ Testa a extração de repositórios da organização.
 import pytest
 from unittest.mock import patch, MagicMock
 from bronze.repositories import extract_repositories
+from utils.scheduler import RepoScheduler
+
+
+@pytest.fixture(autouse=True)
+def mock_save_files():
+    """Evita gravar os arquivos repo_{name}.json em data/bronze"""
+    with patch('bronze.repositories.save_json_files', side_effect=lambda files: list(files)) as mock:
+        yield mock
 
 
 class TestExtractRepositories:
@@ -14,7 +22,7 @@ class TestExtractRepositories:
     
     def test_extract_repositories_success(self, capsys):
         """Testa extração bem-sucedida de repositórios"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         mock_config.should_skip_repo.return_value = False
@@ -38,7 +46,7 @@ class TestExtractRepositories:
     
     def test_extract_repositories_with_blacklist(self, capsys):
         """Testa que filtra repositórios na blacklist"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -62,7 +70,7 @@ class TestExtractRepositories:
     
     def test_extract_repositories_empty_response(self, capsys):
         """Testa tratamento de resposta vazia"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -76,7 +84,7 @@ class TestExtractRepositories:
     
     def test_extract_repositories_none_response(self, capsys):
         """Testa tratamento de resposta None"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         
@@ -90,7 +98,7 @@ class TestExtractRepositories:
     
     def test_extract_repositories_uses_cache_flag(self):
         """Testa que respeita o flag use_cache"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         mock_config.should_skip_repo.return_value = False
@@ -109,7 +117,7 @@ class TestExtractRepositories:
     
     def test_extract_repositories_saves_raw_data(self):
         """Testa que salva dados brutos dos repositórios"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         mock_config.should_skip_repo.return_value = False
@@ -127,7 +135,7 @@ class TestExtractRepositories:
     
     def test_extract_repositories_saves_filtered_data(self):
         """Testa que salva dados filtrados dos repositórios"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         mock_config.should_skip_repo.return_value = False
@@ -145,7 +153,7 @@ class TestExtractRepositories:
     
     def test_extract_repositories_fetches_details(self):
         """Testa que busca detalhes de cada repositório"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         mock_config.should_skip_repo.return_value = False
@@ -163,9 +171,9 @@ class TestExtractRepositories:
             # Verifica que buscou detalhes para cada repo
             assert mock_client.get_with_cache.call_count == 2
     
-    def test_extract_repositories_saves_individual_files(self):
-        """Testa que salva arquivo individual para cada repositório"""
-        mock_client = MagicMock()
+    def test_extract_repositories_saves_individual_files(self, mock_save_files):
+        """Testa que salva arquivo individual para cada repositório, numa única gravação"""
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         mock_config.should_skip_repo.return_value = False
@@ -174,16 +182,17 @@ class TestExtractRepositories:
         mock_client.get_paginated.return_value = mock_repos
         mock_client.get_with_cache.return_value = {"name": "myrepo"}
         
-        with patch('bronze.repositories.save_json_data', return_value="file.json") as mock_save:
+        with patch('bronze.repositories.save_json_data', return_value="file.json"):
             extract_repositories(mock_client, mock_config)
             
             # Verifica que salvou arquivo individual
-            calls = [call[0] for call in mock_save.call_args_list]
-            assert any("repo_myrepo.json" in str(call) for call in calls)
+            mock_save_files.assert_called_once()
+            files = mock_save_files.call_args[0][0]
+            assert files == {"data/bronze/repo_myrepo.json": {"name": "myrepo"}}
     
     def test_extract_repositories_saves_detailed_collection(self):
         """Testa que salva coleção de repositórios detalhados"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         mock_config.should_skip_repo.return_value = False
@@ -201,7 +210,7 @@ class TestExtractRepositories:
     
     def test_extract_repositories_handles_missing_detail(self):
         """Testa tratamento quando detalhes do repo não estão disponíveis"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         mock_config.should_skip_repo.return_value = False
@@ -218,7 +227,7 @@ class TestExtractRepositories:
     
     def test_extract_repositories_constructs_correct_urls(self):
         """Testa que constrói URLs corretas para a API"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "my-organization"
         mock_config.should_skip_repo.return_value = False
@@ -241,7 +250,7 @@ class TestExtractRepositories:
     
     def test_extract_repositories_returns_all_generated_files(self):
         """Testa que retorna todos os arquivos gerados"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         mock_config.should_skip_repo.return_value = False
@@ -263,11 +272,12 @@ class TestExtractRepositories:
             
             # Deve ter: raw, filtered, 2x individual, detailed = 5 arquivos
             assert len(result) == 5
-            assert all("file" in f and ".json" in f for f in result)
+            assert all(".json" in f for f in result)
+            assert file_counter[0] == 3  # individuais gravados por save_json_files
     
     def test_extract_repositories_default_cache_true(self):
         """Testa que o valor padrão de use_cache é True"""
-        mock_client = MagicMock()
+        mock_client = MagicMock(pool_size=4)
         mock_config = MagicMock()
         mock_config.org_name = "test-org"
         mock_config.should_skip_repo.return_value = False
@@ -282,3 +292,27 @@ class TestExtractRepositories:
             
             call_kwargs = mock_client.get_paginated.call_args[1]
             assert call_kwargs['use_cache'] is True
+
+    def test_extract_repositories_fetches_details_concurrently(self, mock_save_files):
+        """Testa que os detalhes são buscados em paralelo (pool do cliente, sem --workers) e gravados na ordem da listagem"""
+        import threading
+        mock_client = MagicMock(pool_size=4)
+        mock_config = MagicMock()
+        mock_config.org_name = "test-org"
+        mock_config.should_skip_repo.return_value = False
+        
+        mock_client.get_paginated.return_value = [
+            {"name": f"repo{i}", "full_name": f"test-org/repo{i}"} for i in range(4)
+        ]
+        barrier = threading.Barrier(4, timeout=5)
+        
+        def get_with_cache(url, use_cache=True):
+            barrier.wait()  # só passa se as 4 buscas estiverem em andamento ao mesmo tempo
+            return {"name": url.rsplit("/", 1)[-1]}
+        
+        mock_client.get_with_cache.side_effect = get_with_cache
+        with patch('bronze.repositories.save_json_data', return_value="file.json"):
+            extract_repositories(mock_client, mock_config, scheduler=RepoScheduler(max_workers=1))
+        
+        files = mock_save_files.call_args[0][0]
+        assert list(files) == [f"data/bronze/repo_repo{i}.json" for i in range(4)]
@@ -0,0 +1,80 @@
+"""
+Unit tests for src/bronze/repository_structure.py
+Tests structure extraction, including the skip of repositories whose
+default branch head did not move since the last extraction.
+"""
+from unittest.mock import MagicMock, patch
+from bronze.repository_structure import extract_repository_structure
+
+
+REPOS = [{"name": "repo1", "full_name": "test-org/repo1", "default_branch": "main", "size": 10}]
+
+PREVIOUS = {
+    "owner": "test-org",
+    "repository": "repo1",
+    "branch": "main",
+    "sha": "c0",
+    "method": "rest",
+    "tree": [{"name": "a.py", "path": "a.py", "type": "file", "sha": "b1"}],
+    "repository_metadata": {
+        "id": None, "full_name": "test-org/repo1", "description": None, "created_at": None,
+        "updated_at": None, "language": None, "size": 10, "stars": 0, "forks": 0, "open_issues": 0,
+    },
+}
+
+
+def load(previous):
+    files = {"data/bronze/repositories_filtered.json": REPOS, "data/bronze/structure_repo1.json": previous}
+    return lambda path: files.get(path)
+
+
+class TestExtractRepositoryStructure:
+    """Tests for extract_repository_structure function"""
+
+    def test_skips_repository_when_head_unchanged(self):
+        """Testa que um repositório com o mesmo head não é buscado nem regravado"""
+        mock_client = MagicMock()
+        mock_client.graphql_repositories.return_value = {
+            ("test-org", "repo1"): {"defaultBranchRef": {"name": "main", "target": {"oid": "c0"}}}
+        }
+        mock_client.update_repository_tree.return_value = PREVIOUS
+
+        with patch('bronze.repository_structure.load_json_data', side_effect=load(PREVIOUS)):
+            with patch('bronze.repository_structure.save_json_data') as mock_save:
+                result = extract_repository_structure(mock_client, MagicMock())
+
+        assert result == ["data/bronze/structure_repo1.json"]
+        assert mock_client.update_repository_tree.call_args.kwargs["head_sha"] == "c0"
+        mock_client.get_repository_tree.assert_not_called()
+        mock_save.assert_not_called()
+
+    def test_updates_changed_repository_incrementally(self):
+        """Testa que um head novo atualiza só as subárvores alteradas e salva a estrutura"""
+        mock_client = MagicMock()
+        mock_client.graphql_repositories.return_value = {
+            ("test-org", "repo1"): {"defaultBranchRef": {"name": "main", "target": {"oid": "c1"}}}
+        }
+        updated = {**PREVIOUS, "sha": "c1", "method": "rest_incremental", "truncated": False}
+        mock_client.update_repository_tree.return_value = updated
+
+        with patch('bronze.repository_structure.load_json_data', side_effect=load(PREVIOUS)):
+            with patch('bronze.repository_structure.save_json_data', return_value="data/bronze/structure_repo1.json") as mock_save:
+                result = extract_repository_structure(mock_client, MagicMock())
+
+        assert result == ["data/bronze/structure_repo1.json"]
+        assert mock_client.update_repository_tree.call_args.kwargs["previous"] is PREVIOUS
+        mock_client.get_repository_tree.assert_not_called()
+        assert mock_save.call_args[0][0]["sha"] == "c1"
+
+    def test_full_extraction_without_previous_structure(self):
+        """Testa que sem estrutura anterior a árvore completa é buscada"""
+        mock_client = MagicMock()
+        mock_client.get_repository_tree.return_value = {**PREVIOUS, "truncated": False}
+
+        with patch('bronze.repository_structure.load_json_data', side_effect=load(None)):
+            with patch('bronze.repository_structure.save_json_data', return_value="data/bronze/structure_repo1.json"):
+                result = extract_repository_structure(mock_client, MagicMock())
+
+        assert result == ["data/bronze/structure_repo1.json"]
+        mock_client.graphql_repositories.assert_not_called()
+        mock_client.update_repository_tree.assert_not_called()
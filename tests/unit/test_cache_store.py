@@ -0,0 +1,271 @@
+"""
+Unit tests for src/utils/cache_store.py
+"""
+import os
+import json
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+from utils.cache_store import (
+    CachePolicy,
+    FlatFileCacheStore,
+    MemoryCache,
+    ShardedCacheStore,
+    SQLiteCacheStore,
+    create_cache_store,
+    parse_duration,
+    parse_size,
+)
+from utils.github_api import GitHubAPIClient
+
+
+KEY = "0123456789abcdef0123456789abcdef.json"
+
+
+@pytest.mark.parametrize("backend", ["files", "sharded", "sqlite"])
+def test_roundtrip_and_missing(tmp_path, backend):
+    """Testa gravação, leitura e chave inexistente em todos os backends"""
+    store = create_cache_store(backend, str(tmp_path))
+    data = {"texto": "ação", "items": [1, 2, 3]}
+
+    assert store.get(KEY) is None
+    store.set(KEY, data)
+    assert store.get(KEY) == data
+    store.set(KEY, [])
+    assert store.get(KEY) == []
+    store.close()
+
+
+@pytest.mark.parametrize("backend", ["files", "sharded", "sqlite"])
+def test_batch_defers_writes_but_serves_reads(tmp_path, backend):
+    """Testa que batch() adia a escrita mas mantém leituras consistentes"""
+    store = create_cache_store(backend, str(tmp_path))
+    writes = []
+    original = store._write_many
+    store._write_many = lambda items: (writes.append(list(items)), original(writes[-1]))
+
+    with store.batch():
+        with store.batch():
+            store.set("a.json", {"a": 1})
+        store.set("b.json", {"b": 2})
+        assert store.get("a.json") == {"a": 1}
+        assert writes == []
+
+    assert len(writes) == 1
+    assert sorted(k for k, _ in writes[0]) == ["a.json", "b.json"]
+    assert store.get("b.json") == {"b": 2}
+    store.close()
+
+
+@pytest.mark.parametrize("backend", ["sharded", "sqlite"])
+def test_batch_only_buffers_its_own_threads(tmp_path, backend):
+    """Testa que o batch só adia as escritas da própria thread e dos workers vinculados, com limite"""
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    store = create_cache_store(backend, str(tmp_path))
+    store.batch_max_pending = 3
+    writes = []
+    original = store._write_many
+    store._write_many = lambda items: (writes.append(list(items)), original(writes[-1]))
+
+    with store.batch() as batch:
+        # Another repository's thread: written through right away
+        other = threading.Thread(target=store.set, args=("other.json", {"o": 1}))
+        other.start()
+        other.join()
+        assert store._read("other.json")[0] == {"o": 1}
+        writes.clear()  # (SQLite writes single entries through _write_many too)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(batch.bind(lambda i: store.set(f"w{i}.json", i)), range(2)))
+        assert writes == [] and store.get("w1.json") == 1
+        store.set("w2.json", 2)  # third pending write: flushed at the cap
+        assert len(writes) == 1 and sorted(k for k, _ in writes[0]) == ["w0.json", "w1.json", "w2.json"]
+        store.set("w3.json", 3)
+
+    assert [k for k, _ in writes[1]] == ["w3.json"]
+    assert store._batches == []
+    store.close()
+
+
+def test_sharded_layout_and_legacy_fallback(tmp_path):
+    """Testa layout em shards comprimidos e leitura de arquivos no formato antigo"""
+    with open(tmp_path / KEY, "w", encoding="utf-8") as f:
+        json.dump({"legacy": True}, f, indent=2)
+
+    store = ShardedCacheStore(str(tmp_path))
+    assert store.get(KEY) == {"legacy": True}
+
+    store.set(KEY, {"legacy": False})
+    assert os.path.exists(tmp_path / "01" / (KEY + ".gz"))
+    assert not os.path.exists(tmp_path / KEY)
+    assert store.get(KEY) == {"legacy": False}
+
+
+def test_sqlite_single_file(tmp_path):
+    """Testa que o backend SQLite usa um único arquivo persistente"""
+    store = SQLiteCacheStore(str(tmp_path))
+    store.set_many([("a.json", 1), ("b.json", 2)])
+    store.close()
+
+    assert "cache.sqlite3" in os.listdir(tmp_path)
+    reopened = SQLiteCacheStore(str(tmp_path))
+    assert reopened.get("b.json") == 2
+    reopened.close()
+
+
+def test_unknown_backend(tmp_path):
+    """Testa erro para backend desconhecido"""
+    with pytest.raises(ValueError):
+        create_cache_store("redis", str(tmp_path))
+
+
+def test_client_cache_interface_uses_backend(tmp_path):
+    """Testa que _cache_get/_cache_set continuam funcionando com o backend escolhido"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path), cache_backend="sqlite")
+    client._cache_set("https://api.github.com/repos/o/r", {"id": 1})
+
+    assert isinstance(client.cache_store, SQLiteCacheStore)
+    assert client._cache_get("https://api.github.com/repos/o/r") == {"id": 1}
+    client.close()
+
+    default = GitHubAPIClient(token="test", cache_dir=str(tmp_path / "default"))
+    assert isinstance(default.cache_store, ShardedCacheStore)
+    legacy = GitHubAPIClient(token="test", cache_dir=str(tmp_path / "legacy"), cache_backend="files")
+    assert type(legacy.cache_store) is FlatFileCacheStore
+
+
+def test_policy_ttls_by_endpoint_class():
+    """Testa TTLs por classe de endpoint"""
+    policy = CachePolicy()
+    sha = "a" * 40
+
+    assert policy.ttl_for(f"https://api.github.com/repos/o/r/commits/{sha}") is None
+    assert policy.ttl_for(f"https://api.github.com/repos/o/r/git/trees/{sha}?recursive=1") is None
+    assert policy.ttl_for("https://api.github.com/repos/o/r/issues?state=all&per_page=300&page=1") == 3600
+    assert policy.ttl_for("https://api.github.com/orgs/org/members?per_page=100&page=1") == 3600
+    assert policy.ttl_for("https://api.github.com/repos/o/r/commits?per_page=50&page=2") == 3600
+    assert policy.ttl_for("https://api.github.com/repos/o/r") == 86400
+    assert policy.ttl_for("https://api.github.com/repos/o/r/issues?state=all#validators") is None
+    assert policy.is_fresh("https://api.github.com/repos/o/r", stored_at=time.time() - 10)
+    assert not policy.is_fresh("https://api.github.com/repos/o/r/issues", stored_at=time.time() - 7200)
+
+
+@pytest.mark.parametrize("backend", ["files", "sharded", "sqlite"])
+def test_prune_by_age_and_lru_budget(tmp_path, backend):
+    """Testa remoção por idade e por orçamento de bytes (LRU)"""
+    store = create_cache_store(backend, str(tmp_path))
+    payload = {"blob": "x" * 2000}
+    clock = [1000.0]
+    with patch("utils.cache_store.time.time", side_effect=lambda: clock[0]):
+        for name in ("old", "a", "b", "c"):
+            store.set(f"{name}.json", payload)
+            if backend != "sqlite":
+                os.utime(store._shard_path(f"{name}.json") if backend == "sharded" else store._path(f"{name}.json"), (clock[0], clock[0]))
+            clock[0] += 100
+        clock[0] = 5000.0
+        store.get("a.json")  # "a" becomes the most recently used entry
+        clock[0] = 5100.0
+        result = store.prune(max_age=4050)
+
+    assert result["removed"] == 1
+    assert store.get("old.json") is None
+
+    sizes = {key: size for key, size, _, _ in store._iter_entries()}
+    result = store.prune(max_bytes=sizes["a.json"] + 1)
+    assert result["removed"] == 2
+    assert store.get("a.json") == payload
+    assert store.stats()["entries"] == 1
+    store.close()
+
+
+def test_max_bytes_evicts_on_write(tmp_path):
+    """Testa que max_bytes dispara eviction automática"""
+    store = ShardedCacheStore(str(tmp_path), max_bytes=1)
+    store.evict_check_interval = 2
+    store.set("a.json", {"a": 1})
+    store.set("b.json", {"b": 2})
+    assert store.stats()["entries"] == 0
+
+
+def test_parse_size_and_duration():
+    """Testa conversão de tamanhos e durações"""
+    assert parse_size("500MB") == 500 * 1024 ** 2
+    assert parse_size("2g") == 2 * 1024 ** 3
+    assert parse_size("1024") == 1024
+    assert parse_duration("30d") == 30 * 86400
+    assert parse_duration("12h") == 43200
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_client_expired_entry_is_refetched(tmp_path):
+    """Testa que entradas expiradas são buscadas de novo com requisição condicional"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path), cache_policy=CachePolicy(rules=[], default_ttl=60))
+    url = "https://api.github.com/repos/o/r"
+    client._cache_set(url, {"id": 1})
+    client._cache_set_validators(url, {"ETag": '"v1"'})
+    not_modified = Mock(status_code=304, headers={})
+
+    with patch("utils.github_api.time.time", return_value=time.time() + 3600), \
+         patch("utils.cache_store.time.time", return_value=time.time() + 3600):
+        assert client._cache_get(url) is None
+        with patch.object(client.session, "get", return_value=not_modified) as mock_get:
+            assert client.get_with_cache(url, silent=True) == {"id": 1}
+    assert mock_get.call_args[1]["headers"]["If-None-Match"] == '"v1"'
+    # 304 refreshed the entry
+    assert client._cache_get(url) == {"id": 1}
+
+
+def test_cache_manager_cli(tmp_path, capsys):
+    """Testa os comandos stats e prune do cache_manager"""
+    import cache_manager
+    store = ShardedCacheStore(str(tmp_path))
+    store.set("a.json", {"a": 1})
+
+    with patch("sys.argv", ["cache_manager.py", "--cache-dir", str(tmp_path), "stats"]):
+        cache_manager.main()
+    assert "Entries: 1" in capsys.readouterr().out
+
+    with patch("sys.argv", ["cache_manager.py", "--cache-dir", str(tmp_path), "prune", "--max-size", "0"]):
+        cache_manager.main()
+    assert "Removed 1 entries" in capsys.readouterr().out
+
+
+def test_memory_cache_lru_and_counters():
+    """Testa o LRU em memória e os contadores de hit/miss"""
+    memory = MemoryCache(max_entries=2)
+    memory.set("a", {"a": 1}, stored_at=10.0)
+    memory.set("b", {"b": 2})
+    assert memory.get("a") == ({"a": 1}, 10.0)
+    memory.set("c", {"c": 3})  # evicts "b", the least recently used
+
+    assert memory.get("b") is None
+    assert memory.get("c")[0] == {"c": 3}
+    stats = memory.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (2, 1, 1, 2)
+
+
+def test_client_memory_tier_avoids_disk_reads(tmp_path):
+    """Testa que leituras repetidas são servidas da memória sem acessar o disco"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    url = "https://api.github.com/repos/o/r"
+    client._cache_set(url, {"id": 1})
+
+    with patch.object(client.cache_store, "get_entry", wraps=client.cache_store.get_entry) as disk_get:
+        assert client._cache_get(url) == {"id": 1}
+        assert client._cache_get(url) == {"id": 1}
+    disk_get.assert_not_called()
+    assert client.cache_stats()["memory"]["hits"] == 2
+
+    # A fresh client (new process) reads the disk once, then memory
+    other = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    with patch.object(other.cache_store, "get_entry", wraps=other.cache_store.get_entry) as disk_get:
+        other._cache_get(url)
+        other._cache_get(url)
+    assert disk_get.call_count == 1
+
+    disabled = GitHubAPIClient(token="test", cache_dir=str(tmp_path), memory_cache_size=0)
+    disabled._cache_get(url)
+    assert disabled.cache_stats()["memory"]["entries"] == 0
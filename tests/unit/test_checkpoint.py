@@ -0,0 +1,134 @@
+"""
+Unit tests for src/utils/checkpoint.py and resumable graphql_commit_history
+"""
+import pytest
+
+from utils.checkpoint import HistoryCheckpoint
+from utils.github_api import GitHubAPIClient
+
+
+def test_checkpoint_roundtrip_and_torn_line(tmp_path):
+    """Testa gravação incremental, leitura e linha final truncada"""
+    path = str(tmp_path / "cp" / "commits_r.jsonl")
+    checkpoint = HistoryCheckpoint(path, {"repo": "r"})
+    checkpoint.record({"branch": 0, "period": 0, "cursor": "c1"}, [{"oid": "a"}])
+    checkpoint.record({"branch": 0, "period": 0, "cursor": "c2"}, [{"oid": "b"}])
+    with open(path, "a") as f:
+        f.write('{"position": {"cursor": "c3"}, "nod')  # crash mid-write
+
+    nodes, position = HistoryCheckpoint(path, {"repo": "r"}).load()
+    assert list(nodes) == ["a", "b"]
+    assert position["cursor"] == "c2"
+
+    # Other parameters: start over
+    assert HistoryCheckpoint(path, {"repo": "other"}).load() == ({}, None)
+
+    checkpoint.clear()
+    assert HistoryCheckpoint(path, {"repo": "r"}).load() == ({}, None)
+
+
+def _history_page(oids, cursor, has_next):
+    return {"data": {"repository": {"defaultBranchRef": {"target": {"history": {
+        "pageInfo": {"hasNextPage": has_next, "endCursor": cursor},
+        "nodes": [{"oid": oid, "additions": 1, "deletions": 1} for oid in oids],
+    }}}}}}
+
+
+def test_commit_history_resumes_from_checkpoint(tmp_path):
+    """Testa que uma execução interrompida continua do último cursor salvo"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    path = str(tmp_path / "checkpoints" / "commits_r.jsonl")
+    pages = {None: _history_page(["a", "b"], "c1", True), "c1": _history_page(["c"], "c2", True)}
+    cursors = []
+
+    def crashing_graphql(query, variables, use_cache=True, timeout=4, **kwargs):
+        cursors.append(variables["cursor"])
+        if variables["cursor"] == "c2":
+            raise KeyboardInterrupt  # run killed on the third page
+        return pages[variables["cursor"]]
+
+    client.graphql = crashing_graphql
+    with pytest.raises(KeyboardInterrupt):
+        client.graphql_commit_history("o", "r", page_size=2, checkpoint_path=path)
+    assert cursors == [None, "c1", "c2"]
+
+    cursors.clear()
+    pages["c2"] = _history_page(["d"], None, False)
+    client.graphql = lambda query, variables, use_cache=True, timeout=4, **kwargs: cursors.append(variables["cursor"]) or pages[variables["cursor"]]
+    commits, _ = client.graphql_commit_history("o", "r", page_size=2, checkpoint_path=path)
+
+    assert cursors == ["c2"]  # only the missing page is fetched
+    assert [c["oid"] for c in commits] == ["a", "b", "c", "d"]
+    assert not (tmp_path / "checkpoints" / "commits_r.jsonl").exists()  # completed walk
+
+
+def test_commit_history_resume_skips_finished_periods(tmp_path):
+    """Testa que períodos de tempo já concluídos não são buscados de novo"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    client.history_window_max_commits = None  # equal periods, no density probes
+    path = str(tmp_path / "commits_r.jsonl")
+    kwargs = dict(page_size=50, since="2024-01-01T00:00:00Z", until="2024-04-01T00:00:00Z", time_chunks=3, checkpoint_path=path)
+    periods = []
+
+    def graphql(query, variables, use_cache=True, timeout=4, **kwargs):
+        periods.append(variables["since"])
+        if len(periods) == 2:
+            raise KeyboardInterrupt
+        return _history_page([variables["since"]], None, False)
+
+    client.graphql = graphql
+    with pytest.raises(KeyboardInterrupt):
+        client.graphql_commit_history("o", "r", **kwargs)
+
+    periods.clear()
+    client.graphql = lambda query, variables, use_cache=True, timeout=4, **kwargs: periods.append(variables["since"]) or _history_page([variables["since"]], None, False)
+    commits, _ = client.graphql_commit_history("o", "r", **kwargs)
+
+    assert len(periods) == 2  # periods 2 and 3
+    assert len(commits) == 3
+
+
+def test_commit_history_resume_reuses_planned_periods(tmp_path):
+    """Testa que --since sem --until retoma com os períodos salvos, sem replanejar"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    client.history_window_max_commits = None
+    path = str(tmp_path / "commits_r.jsonl")
+    kwargs = dict(page_size=50, since="2024-01-01T00:00:00Z", time_chunks=3, checkpoint_path=path)
+    periods = []
+
+    def graphql(query, variables, use_cache=True, timeout=4, **kwargs):
+        periods.append((variables["since"], variables["until"]))
+        if len(periods) == 2:
+            raise KeyboardInterrupt
+        return _history_page([variables["since"]], None, False)
+
+    client.graphql = graphql
+    with pytest.raises(KeyboardInterrupt):
+        client.graphql_commit_history("o", "r", **kwargs)
+    interrupted = periods[1]
+
+    # The open end ("now") moved since the first run: the stored periods must be used
+    periods.clear()
+    client._plan_history_windows = lambda *args, **kw: pytest.fail("periods should come from the checkpoint")
+    client.graphql = lambda query, variables, use_cache=True, timeout=4, **kwargs: periods.append((variables["since"], variables["until"])) or _history_page([variables["since"]], None, False)
+    commits, _ = client.graphql_commit_history("o", "r", **kwargs)
+
+    assert periods[0] == interrupted
+    assert len(periods) == 2
+    assert len(commits) == 3
+
+
+def test_commit_history_stops_at_known_commit(tmp_path):
+    """Testa que a extração incremental para no primeiro commit já conhecido"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    pages = {None: _history_page(["new1", "new2"], "c1", True), "c1": _history_page(["known", "older"], "c2", True)}
+    cursors = []
+    client.graphql = lambda query, variables, use_cache=True, timeout=4, **kwargs: cursors.append(variables["cursor"]) or pages[variables["cursor"]]
+    heads = {}
+
+    commits, _ = client.graphql_commit_history("o", "r", page_size=2, stop_at={"known"}, heads=heads)
+
+    # The rest of the page is kept (merged branches interleave by date), but paging stops
+    assert [c["oid"] for c in commits] == ["new1", "new2", "older"]
+    assert cursors == [None, "c1"]
+    assert heads[""]["oid"] == "new1"
@@ -0,0 +1,46 @@
+"""
+Unit tests for src/utils/extraction_state.py
+"""
+import json
+
+from utils.extraction_state import ExtractionState, load_records, merge_records
+
+
+def test_state_roundtrip(tmp_path):
+    """Testa gravação e leitura das marcas de extração"""
+    path = str(tmp_path / "_state" / "commits.json")
+    state = ExtractionState(path)
+    assert state.get("org/repo") is None
+
+    state.set("org/repo", {"": {"sha": "abc", "committed_date": "2024-01-01T00:00:00Z"}})
+    state.save()
+
+    assert ExtractionState(path).get("org/repo")[""]["sha"] == "abc"
+    assert [p.name for p in (tmp_path / "_state").iterdir()] == ["commits.json"]  # no temp files left
+
+
+def test_state_ignores_corrupt_file(tmp_path):
+    """Testa que um arquivo de estado corrompido leva a uma extração completa"""
+    path = tmp_path / "commits.json"
+    path.write_text("{not json")
+    assert ExtractionState(str(path)).marks == {}
+
+
+def test_load_records_skips_metadata(tmp_path):
+    """Testa leitura de arquivo bronze sem a entrada _metadata"""
+    path = tmp_path / "commits_r.json"
+    path.write_text(json.dumps([{"_metadata": {"record_count": 1}}, {"sha": "a"}]))
+    assert load_records(str(path)) == [{"sha": "a"}]
+    assert load_records(str(tmp_path / "missing.json")) == []
+
+
+def test_merge_records_upserts_by_key():
+    """Testa upsert: alterados no lugar, novos no início"""
+    existing = [{"id": 2, "state": "open"}, {"id": 1, "state": "open"}]
+    updates = [{"id": 3, "state": "open"}, {"id": 1, "state": "closed"}]
+
+    assert merge_records(existing, updates, key="id") == [
+        {"id": 3, "state": "open"},
+        {"id": 2, "state": "open"},
+        {"id": 1, "state": "closed"},
+    ]
@@ -385,7 +385,7 @@ class TestGetWithCacheReturnHeaders:
         """Testa retorno de headers da API"""
         client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
         
-        with patch('requests.get') as mock_get:
+        with patch.object(client.session, 'get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"data": "test"}
@@ -69,7 +69,7 @@ def test_get_with_cache_api_call(tmp_path):
     test_url = "https://api.github.com/test"
     api_response = {"from_api": True}
     
-    with patch('requests.get') as mock_get:
+    with patch.object(client.session, 'get') as mock_get:
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = api_response
@@ -89,7 +89,7 @@ def test_get_with_cache_404(tmp_path, capsys):
     cache_dir = str(tmp_path / "cache")
     client = GitHubAPIClient(token="test", cache_dir=cache_dir)
     
-    with patch('requests.get') as mock_get:
+    with patch.object(client.session, 'get') as mock_get:
         mock_response = Mock()
         mock_response.status_code = 404
         mock_get.return_value = mock_response
@@ -105,7 +105,7 @@ def test_get_with_cache_403_forbidden(tmp_path, capsys):
     cache_dir = str(tmp_path / "cache")
     client = GitHubAPIClient(token="test", cache_dir=cache_dir)
     
-    with patch('requests.get') as mock_get:
+    with patch.object(client.session, 'get') as mock_get:
         mock_response = Mock()
         mock_response.status_code = 403
         mock_response.text = "Access forbidden - private resource"
@@ -123,7 +123,7 @@ def test_get_with_cache_retry_on_500(mock_sleep, tmp_path):
     cache_dir = str(tmp_path / "cache")
     client = GitHubAPIClient(token="test", cache_dir=cache_dir)
     
-    with patch('requests.get') as mock_get:
+    with patch.object(client.session, 'get') as mock_get:
         mock_response_fail = Mock()
         mock_response_fail.status_code = 500
         
@@ -149,7 +149,7 @@ def test_get_with_cache_timeout_retry(mock_sleep, tmp_path):
     cache_dir = str(tmp_path / "cache")
     client = GitHubAPIClient(token="test", cache_dir=cache_dir)
     
-    with patch('requests.get') as mock_get:
+    with patch.object(client.session, 'get') as mock_get:
         import requests
         
         mock_response_success = Mock()
@@ -178,7 +178,7 @@ def test_get_with_cache_exhausted_retries(tmp_path, capsys):
     client = GitHubAPIClient(token="test", cache_dir=cache_dir)
     
     with patch('time.sleep'):
-        with patch('requests.get') as mock_get:
+        with patch.object(client.session, 'get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 500
             mock_get.return_value = mock_response
@@ -232,6 +232,108 @@ def test_get_paginated_non_list_response(tmp_path):
         assert results == []
         assert mock_get.call_count == 1
 
+def test_parse_last_page():
+    """Testa leitura do rel="last" no cabeçalho Link"""
+    link = ('<https://api.github.com/repositories/1/issues?state=all&per_page=300&page=2>; rel="next", '
+            '<https://api.github.com/repositories/1/issues?state=all&per_page=300&page=7>; rel="last"')
+    assert GitHubAPIClient._parse_last_page(link) == 7
+    assert GitHubAPIClient._parse_last_page('<https://x?page=2>; rel="next"') is None
+    assert GitHubAPIClient._parse_last_page(None) is None
+
+def test_get_paginated_parallel_uses_link_header(tmp_path):
+    """Testa busca paralela das páginas restantes, mantendo ordem e URLs de cache"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path), pool_size=4)
+    base = "https://api.github.com/repos/o/r/issues?state=all"
+    requested = []
+    
+    def fake_get(url, use_cache=True, return_headers=False, silent=False, **kwargs):
+        requested.append(url)
+        page = int(url.rsplit("page=", 1)[1])
+        data = [{"id": page * 100 + i} for i in range(100 if page < 4 else 10)]
+        if return_headers:
+            return data, {"Link": f'<{base}&per_page=300&page=4>; rel="last"'}
+        return data
+    
+    with patch.object(client, 'get_with_cache', side_effect=fake_get):
+        results = client.get_paginated(base, per_page=300, parallel=True)
+    
+    assert len(results) == 310
+    assert [r["id"] for r in results] == sorted(r["id"] for r in results)
+    assert sorted(requested) == sorted(f"{base}&per_page=300&page={p}" for p in range(1, 5))
+
+def test_get_paginated_parallel_single_page(tmp_path):
+    """Testa que sem Link header apenas uma página é buscada"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    
+    with patch.object(client, 'get_with_cache', return_value=([{"id": 1}], {})) as mock_get:
+        results = client.get_paginated("https://api.github.com/test", parallel=True)
+    
+    assert results == [{"id": 1}]
+    assert mock_get.call_count == 1
+
+def test_get_paginated_parallel_respects_max_pages(tmp_path):
+    """Testa limite de páginas no modo paralelo"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    
+    def fake_get(url, use_cache=True, return_headers=False, **kwargs):
+        data = [{"url": url}] * 50
+        return (data, {"Link": '<https://api.github.com/test?per_page=50&page=9>; rel="last"'}) if return_headers else data
+    
+    with patch.object(client, 'get_with_cache', side_effect=fake_get) as mock_get:
+        results = client.get_paginated("https://api.github.com/test", per_page=50, max_pages=3, parallel=True)
+    
+    assert mock_get.call_count == 3
+    assert len(results) == 150
+
+def test_get_paginated_parallel_from_cache_walks_sequentially(tmp_path):
+    """Testa que com página 1 em cache (sem headers) a paginação segue sequencial"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    base = "https://api.github.com/test"
+    client._cache_set(f"{base}?per_page=300&page=1", [{"id": i} for i in range(100)])
+    client._cache_set(f"{base}?per_page=300&page=2", [{"id": i} for i in range(100, 130)])
+    
+    results = client.get_paginated(base, per_page=300, parallel=True)
+    
+    assert len(results) == 130
+
+def test_iter_paginated_follows_link_next(tmp_path):
+    """Testa que iter_paginated segue rel="next" e entrega itens página a página"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    base = "https://api.github.com/test"
+    pages = {
+        1: ([{"id": 1}, {"id": 2}], {"Link": f'<{base}?page=2>; rel="next", <{base}?page=2>; rel="last"'}),
+        2: ([{"id": 3}, {"id": 4}], {"Link": f'<{base}?page=1>; rel="prev"'}),
+    }
+    
+    def fake_get(url, use_cache=True, return_headers=False, **kwargs):
+        return pages[int(url.rsplit("page=", 1)[1])]
+    
+    with patch.object(client, 'get_with_cache', side_effect=fake_get) as mock_get:
+        stream = client.iter_paginated(base, per_page=2)
+        assert next(stream) == {"id": 1}
+        assert mock_get.call_count == 1
+        assert [item["id"] for item in stream] == [2, 3, 4]
+    
+    assert mock_get.call_count == 2
+
+def test_iter_paginated_pages_from_cache(tmp_path):
+    """Testa modo pages=True com páginas em cache (sem headers)"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    base = "https://api.github.com/test"
+    client._cache_set(f"{base}?per_page=300&page=1", [{"id": i} for i in range(100)])
+    client._cache_set(f"{base}?per_page=300&page=2", [{"id": 100}])
+    
+    pages = list(client.iter_paginated(base, per_page=300, pages=True))
+    
+    assert [len(p) for p in pages] == [100, 1]
+
+def test_iter_paginated_stops_on_error(tmp_path):
+    """Testa que iter_paginated para quando a requisição falha"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    
+    with patch.object(client, 'get_with_cache', return_value=None):
+        assert list(client.iter_paginated("https://api.github.com/test")) == []
+
 def test_organization_config():
     """Testa configuração de organização"""
     config = OrganizationConfig("test-org")
@@ -283,7 +385,7 @@ def test_graphql_with_cache(tmp_path):
     
     query = "query { viewer { login } }"
     
-    with patch('requests.post') as mock_post:
+    with patch.object(client.session, 'post') as mock_post:
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"data": {"viewer": {"login": "test"}}}
@@ -302,7 +404,7 @@ def test_graphql_errors(tmp_path, capsys):
     cache_dir = str(tmp_path / "cache")
     client = GitHubAPIClient(token="test", cache_dir=cache_dir)
     
-    with patch('requests.post') as mock_post:
+    with patch.object(client.session, 'post') as mock_post:
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {
@@ -321,7 +423,7 @@ def test_graphql_service_unavailable(tmp_path, capsys):
     cache_dir = str(tmp_path / "cache")
     client = GitHubAPIClient(token="test", cache_dir=cache_dir)
     
-    with patch('requests.post') as mock_post:
+    with patch.object(client.session, 'post') as mock_post:
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {
@@ -345,7 +447,7 @@ def test_graphql_timeout(mock_sleep, tmp_path, capsys):
     cache_dir = str(tmp_path / "cache")
     client = GitHubAPIClient(token="test", cache_dir=cache_dir)
     
-    with patch('requests.post') as mock_post:
+    with patch.object(client.session, 'post') as mock_post:
         import requests
         mock_post.side_effect = requests.exceptions.Timeout()
         
@@ -360,7 +462,7 @@ def test_graphql_403(tmp_path, capsys):
     cache_dir = str(tmp_path / "cache")
     client = GitHubAPIClient(token="test", cache_dir=cache_dir)
     
-    with patch('requests.post') as mock_post:
+    with patch.object(client.session, 'post') as mock_post:
         mock_response = Mock()
         mock_response.status_code = 403
         mock_response.text = "Forbidden"
@@ -377,7 +479,7 @@ def test_get_with_cache_rate_limit_display(tmp_path, capsys):
     cache_dir = str(tmp_path / "cache")
     client = GitHubAPIClient(token="test", cache_dir=cache_dir)
     
-    with patch('requests.get') as mock_get:
+    with patch.object(client.session, 'get') as mock_get:
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"data": "test"}
@@ -418,4 +520,517 @@ def test_split_time_range_invalid_format():
     client = GitHubAPIClient(token="test")
     ranges = client._split_time_range("invalid", "also-invalid", chunks=3)
     # Deve retornar (None, None) quando parsing falha para indicar datas inválidas
-    assert ranges == [(None, None)]
\ No newline at end of file
+    assert ranges == [(None, None)]
+def test_client_uses_pooled_session(tmp_path):
+    """Testa que o cliente mantém uma sessão com pool do tamanho configurado"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path), pool_size=8)
+    
+    adapter = client.session.get_adapter("https://api.github.com/graphql")
+    assert client.pool_size == 8
+    assert adapter._pool_maxsize == 8
+    assert adapter._pool_block is True
+    client.close()
+
+def test_get_and_graphql_share_session(tmp_path):
+    """Testa que REST e GraphQL reutilizam a mesma sessão HTTP"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    
+    ok = Mock()
+    ok.status_code = 200
+    ok.json.return_value = {"data": {}}
+    ok.headers = {}
+    
+    with patch.object(client.session, 'get', return_value=ok) as mock_get, \
+         patch.object(client.session, 'post', return_value=ok) as mock_post:
+        client.get_with_cache("https://api.github.com/a", use_cache=False, silent=True)
+        client.get_with_cache("https://api.github.com/b", use_cache=False, silent=True)
+        client.graphql("query { viewer { login } }", use_cache=False)
+    
+    assert mock_get.call_count == 2
+    assert mock_post.call_count == 1
+    assert mock_get.call_args[1]["headers"]["Authorization"] == "Bearer test"
+
+def test_parallel_fetch_defaults_to_pool_size(tmp_path):
+    """Testa que o fallback REST paralelo usa pool_size como número de workers"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path), pool_size=3)
+    
+    with patch('concurrent.futures.ThreadPoolExecutor') as mock_executor:
+        mock_executor.return_value.__enter__.return_value = MagicMock()
+        client._fetch_rest_commit_details_parallel([], "owner", "repo", use_cache=False)
+    
+    mock_executor.assert_called_once_with(max_workers=3)
+
+def test_get_with_cache_stores_validators(tmp_path):
+    """Testa que ETag/Last-Modified são salvos junto com a resposta"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    url = "https://api.github.com/repos/o/r"
+    ok = Mock(status_code=200, headers={"ETag": 'W/"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    ok.json.return_value = {"id": 1}
+    
+    with patch.object(client.session, 'get', return_value=ok):
+        client.get_with_cache(url, silent=True)
+    
+    assert client._cache_get(url) == {"id": 1}
+    assert client._cache_get_validators(url) == {"etag": 'W/"abc"', "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+def test_get_with_cache_revalidates_with_etag(tmp_path):
+    """Testa requisição condicional e reuso do cache em 304"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path), revalidate=True)
+    url = "https://api.github.com/repos/o/r/issues?state=all&per_page=100&page=1"
+    client._cache_set(url, [{"id": 1}])
+    client._cache_set_validators(url, {"ETag": '"v1"', "Link": '<https://api.github.com/x?page=2>; rel="next"'})
+    not_modified = Mock(status_code=304, headers={"X-RateLimit-Remaining": "4999"})
+    
+    with patch.object(client.session, 'get', return_value=not_modified) as mock_get:
+        data, headers = client.get_with_cache(url, return_headers=True, silent=True)
+    
+    assert data == [{"id": 1}]
+    assert mock_get.call_args[1]["headers"]["If-None-Match"] == '"v1"'
+    assert mock_get.call_args[1]["headers"]["Authorization"] == "Bearer test"
+    # Link header is restored from the cache so pagination keeps going
+    assert 'rel="next"' in headers["link"]
+
+def test_get_with_cache_revalidate_refreshes_changed_entry(tmp_path):
+    """Testa que 200 numa revalidação substitui o corpo e os validadores"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path), revalidate=True)
+    url = "https://api.github.com/repos/o/r"
+    client._cache_set(url, {"id": 1, "stars": 1})
+    client._cache_set_validators(url, {"ETag": '"v1"'})
+    changed = Mock(status_code=200, headers={"ETag": '"v2"'})
+    changed.json.return_value = {"id": 1, "stars": 2}
+    
+    with patch.object(client.session, 'get', return_value=changed):
+        assert client.get_with_cache(url, silent=True) == {"id": 1, "stars": 2}
+    
+    assert client._cache_get(url)["stars"] == 2
+    assert client._cache_get_validators(url)["etag"] == '"v2"'
+
+def test_get_with_cache_without_revalidate_skips_request(tmp_path):
+    """Testa que sem revalidate o cache é servido sem requisição"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    url = "https://api.github.com/repos/o/r"
+    client._cache_set(url, {"id": 1})
+    client._cache_set_validators(url, {"ETag": '"v1"'})
+    
+    with patch.object(client.session, 'get') as mock_get:
+        assert client.get_with_cache(url, silent=True) == {"id": 1}
+    
+    mock_get.assert_not_called()
+
+def test_concurrent_identical_requests_are_coalesced(tmp_path):
+    """Testa single-flight: chamadas simultâneas à mesma URL compartilham uma requisição"""
+    import threading
+    import time as _time
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    release = threading.Event()
+    ok = Mock(status_code=200, headers={})
+    ok.json.return_value = {"sha": "abc"}
+    
+    def slow_get(*args, **kwargs):
+        release.wait(5)
+        return ok
+    
+    results = []
+    with patch.object(client.session, 'get', side_effect=slow_get) as mock_get:
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                client.get_with_cache("https://api.github.com/repos/o/r/commits/abc", silent=True)))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        deadline = _time.time() + 5
+        while client.coalesced_requests < 4 and _time.time() < deadline:
+            _time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+    
+    assert mock_get.call_count == 1
+    assert results == [{"sha": "abc"}] * 5
+    assert client.cache_stats()["coalesced_requests"] == 4
+    assert client._inflight == {}
+
+def test_coalesced_graphql_followers_share_failure_kind(tmp_path):
+    """Testa que consultas GraphQL coalescidas recebem o mesmo tipo de falha do líder (timeout)"""
+    import threading
+    import time as _time
+    import requests
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    release = threading.Event()
+    
+    def slow_timeout(*args, **kwargs):
+        release.wait(5)
+        raise requests.exceptions.Timeout()
+    
+    outcomes = [{}, {}]
+    results = []
+    with patch.object(client.session, 'post', side_effect=slow_timeout) as mock_post:
+        threads = [
+            threading.Thread(target=lambda o=o: results.append(client.graphql("query { viewer { login } }", outcome=o)))
+            for o in outcomes
+        ]
+        for t in threads:
+            t.start()
+        deadline = _time.time() + 5
+        while client.coalesced_requests < 1 and _time.time() < deadline:
+            _time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+    
+    assert mock_post.call_count == 1
+    assert results == [None, None]
+    assert [o.get('failure') for o in outcomes] == ['timeout', 'timeout']
+
+def test_single_flight_shares_exceptions_and_resets(tmp_path):
+    """Testa que erros são repassados aos que aguardam e a chave é liberada"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    
+    def boom():
+        raise ValueError("boom")
+    
+    with pytest.raises(ValueError):
+        client._single_flight("k", boom)
+    assert client._single_flight("k", lambda: 42) == 42
+    assert client._inflight == {}
+
+def _batch_response(query, repo_payloads, errors=None):
+    """Monta resposta aliased (r0, r1, ...) na ordem em que os repositórios aparecem na query"""
+    import re
+    names = re.findall(r'(r\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\)', query)
+    data = {alias: repo_payloads.get(f"{owner}/{name}") for alias, owner, name in names}
+    response = {"data": data}
+    if errors:
+        response["errors"] = errors
+    return response
+
+def test_graphql_repositories_packs_aliases_and_splits_results(tmp_path):
+    """Testa que vários repositórios vão numa só query com aliases e voltam separados"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    payloads = {"o/a": {"name": "a"}, "o/b": {"name": "b"}, "o/c": {"name": "c"}}
+    queries = []
+    
+    def fake_graphql(query, variables=None, use_cache=True, timeout=4, allow_partial=False):
+        queries.append(query)
+        errors = [{"type": "NOT_FOUND", "path": ["r2"]}] if len(queries) == 1 else None
+        return _batch_response(query, payloads, errors)
+    
+    repos = [("o", "a"), ("o", "b"), ("o", "c"), ("o", "d")]
+    with patch.object(client, 'graphql', side_effect=fake_graphql):
+        result = client.graphql_repositories(repos, "name", node_cost=client.graphql_batch_node_budget // 3)
+    
+    # 3 repositories fit in the node budget: 2 requests for 4 repositories
+    assert len(queries) == 2
+    assert 'r2: repository(owner: "o", name: "c")' in queries[0]
+    assert result[("o", "a")] == {"name": "a"}
+    assert result[("o", "c")] is None  # error reported for its alias
+    assert result[("o", "d")] is None  # missing from payloads
+
+def test_graphql_repositories_splits_failed_batch(tmp_path):
+    """Testa que um lote que falha (timeout) é dividido ao meio"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    payloads = {"o/a": {"name": "a"}, "o/b": {"name": "b"}, "o/c": {"name": "c"}}
+    
+    def fake_graphql(query, variables=None, use_cache=True, timeout=4, allow_partial=False):
+        if query.count("repository(") > 1 or '"c"' in query:
+            return None
+        return _batch_response(query, payloads)
+    
+    with patch.object(client, 'graphql', side_effect=fake_graphql) as mock_graphql:
+        result = client.graphql_repositories([("o", "a"), ("o", "b"), ("o", "c")], "name")
+    
+    assert result == {("o", "a"): {"name": "a"}, ("o", "b"): {"name": "b"}, ("o", "c"): None}
+    assert mock_graphql.call_count == 5  # [a,b,c] -> [a] + [b,c] -> [b] + [c]
+
+def test_graphql_commit_history_batch_paginates_per_repository(tmp_path):
+    """Testa paginação com cursor próprio por repositório dentro do lote"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    
+    def history(oids, has_next, cursor=None):
+        nodes = [{"oid": oid, "additions": None, "deletions": 2} for oid in oids]
+        return {"defaultBranchRef": {"target": {"history": {
+            "pageInfo": {"hasNextPage": has_next, "endCursor": cursor}, "nodes": nodes}}}}
+    
+    def fake_graphql(query, variables=None, use_cache=True, timeout=4, allow_partial=False):
+        if 'after: "c1"' in query:
+            return _batch_response(query, {"o/big": history(["b2"], False)})
+        return _batch_response(query, {
+            "o/small": history(["s1"], False),
+            "o/big": history(["b1"], True, "c1"),
+            "o/empty": {"defaultBranchRef": None},
+        })
+    
+    with patch.object(client, 'graphql', side_effect=fake_graphql) as mock_graphql:
+        result = client.graphql_commit_history_batch([("o", "small"), ("o", "big"), ("o", "empty")], page_size=50)
+    
+    assert mock_graphql.call_count == 2
+    assert mock_graphql.call_args[0][0].count("repository(") == 1
+    assert [n["oid"] for n in result[("o", "big")]] == ["b1", "b2"]
+    assert result[("o", "small")][0]["additions"] == 0
+    assert result[("o", "empty")] == []
+    
+    # Longer histories are handed back to the per-repository path
+    with patch.object(client, 'graphql', side_effect=fake_graphql):
+        result = client.graphql_commit_history_batch([("o", "small"), ("o", "big")], page_size=50, max_pages=1)
+    assert result[("o", "big")] is None
+    assert len(result[("o", "small")]) == 1
+
+def _stats_response(query, unavailable=()):
+    """Resposta aliased (c0, c1, ...) para object(oid:) com stats indisponíveis para alguns SHAs"""
+    import re
+    data, errors = {}, []
+    for alias, sha in re.findall(r'(c\d+): object\(oid: "([^"]+)"\)', query):
+        if sha in unavailable:
+            data[alias] = {"additions": None, "deletions": None}
+            errors.append({"type": "SERVICE_UNAVAILABLE", "path": ["repository", alias, "additions"]})
+        else:
+            data[alias] = {"additions": len(sha), "deletions": 1}
+    response = {"data": {"repository": data}}
+    if errors:
+        response["errors"] = errors
+    return response
+
+def test_get_commit_stats_shrinks_batches_and_falls_back_to_rest(tmp_path):
+    """Testa lotes de stats via GraphQL, redução em SERVICE_UNAVAILABLE e REST só para o que falhar"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    shas = [f"sha{i}" for i in range(8)]
+    sizes = []
+    
+    def fake_graphql(query, variables=None, use_cache=True, timeout=4, allow_partial=False):
+        sizes.append(query.count("object(oid:"))
+        # sha3 never has stats; sha5 only when asked in a small batch
+        return _stats_response(query, unavailable={"sha3"} | ({"sha5"} if sizes[-1] > 2 else set()))
+    
+    with patch.object(client, 'graphql', side_effect=fake_graphql), \
+         patch.object(client, 'get_with_cache', return_value={"stats": {"additions": 7, "deletions": 3, "total": 10}}) as mock_get:
+        stats = client.get_commit_stats("o", "r", shas, batch_size=4)
+    
+    assert sizes[0] == 4 and sizes.count(4) == 2  # two batches of 4, retries are smaller
+    assert stats["sha0"] == {"additions": 4, "deletions": 1, "total": 5}
+    assert stats["sha5"]["additions"] == 4  # resolved after shrinking
+    assert stats["sha3"] == {"additions": 7, "deletions": 3, "total": 10}  # REST fallback
+    mock_get.assert_called_once()
+    assert mock_get.call_args[0][0].endswith("/repos/o/r/commits/sha3")
+
+def test_get_commit_stats_stops_graphql_when_unavailable(tmp_path):
+    """Testa que, com GraphQL fora do ar, os SHAs vão direto para REST sem repetir tentativas"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    
+    with patch.object(client, 'graphql', return_value=None) as mock_graphql, \
+         patch.object(client, 'get_with_cache', return_value={"stats": {"additions": 1, "deletions": 1, "total": 2}}) as mock_get:
+        stats = client.get_commit_stats("o", "r", [f"sha{i}" for i in range(50)], batch_size=8)
+    
+    assert len(stats) == 50
+    assert mock_get.call_count == 50
+    assert mock_graphql.call_count == 4  # 8 -> 4 -> 2 -> 1, then GraphQL is skipped
+    
+    assert client.get_commit_stats("o", "r", ["x"], rest_fallback=False) == {}
+
+
+def test_commit_history_bisects_dense_windows(tmp_path):
+    """Testa que janelas com muitos commits são divididas e percorridas em paralelo"""
+    import re
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    client.history_window_max_commits = 4
+    # Burst in the first days of January, nothing in the rest of the quarter
+    dates = [f"2024-01-0{day}T12:00:00Z" for day in range(1, 10)] + ["2024-03-15T12:00:00Z"]
+    probes = []
+
+    def in_window(date, since, until):
+        return (not since or date >= since) and (not until or date <= until)
+
+    def graphql(query, variables, use_cache=True, timeout=4, **kwargs):
+        if "totalCount" in query:
+            windows = re.findall(r'(w\d+): history\(first: 1, since: "([^"]+)", until: "([^"]+)"\)', query)
+            probes.append(len(windows))
+            target = {alias: {"totalCount": sum(in_window(d, s, u) for d in dates)} for alias, s, u in windows}
+            return {"data": {"repository": {"defaultBranchRef": {"target": target}}}}
+        nodes = [
+            {"oid": d, "committedDate": d, "additions": 1, "deletions": 1}
+            for d in dates if in_window(d, variables["since"], variables["until"])
+        ]
+        return {"data": {"repository": {"defaultBranchRef": {"target": {"history": {
+            "pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": nodes,
+        }}}}}}
+
+    client.graphql = graphql
+    windows = client._plan_history_windows("o", "r", None, "2024-01-01T00:00:00Z", "2024-04-01T00:00:00Z", chunks=3)
+
+    assert probes[0] == 3 and len(probes) > 1  # January (9 commits) was bisected
+    assert all(sum(in_window(d, s, u) for d in dates) <= 4 for s, u in windows)
+    assert not any(s.startswith("2024-02") for s, _ in windows)  # empty February is dropped
+
+    heads = {}
+    commits, _ = client.graphql_commit_history(
+        "o", "r", page_size=50, since="2024-01-01T00:00:00Z", until="2024-04-01T00:00:00Z", heads=heads
+    )
+    assert sorted(c["oid"] for c in commits) == sorted(dates)
+    assert heads[""]["oid"] == "2024-03-15T12:00:00Z"
+
+
+def test_commit_history_branches_stop_at_default_branch(tmp_path):
+    """Testa que branches ativas param ao alcançar commits da branch padrão"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    main = ["m3", "m2", "m1"]
+    feature = {"feature": ["f2", "f1", "m2", "m1"], "hotfix": ["h1", "m3", "m2", "m1"]}
+    calls = []
+
+    def page(oids, cursor, has_next, branch):
+        history = {"history": {
+            "pageInfo": {"hasNextPage": has_next, "endCursor": cursor},
+            "nodes": [{"oid": oid, "committedDate": f"2024-01-0{i + 1}", "additions": 1, "deletions": 1}
+                      for i, oid in enumerate(reversed(oids))][::-1],
+        }}
+        key = "ref" if branch else "defaultBranchRef"
+        return {"data": {"repository": {key: {"target": history}}}}
+
+    def graphql(query, variables, use_cache=True, timeout=4, **kwargs):
+        branch = variables.get("branch", "").replace("refs/heads/", "")
+        calls.append((branch, variables["cursor"]))
+        oids = feature[branch] if branch else main
+        size = variables["pageSize"]
+        start = int(variables["cursor"] or 0)
+        return page(oids[start:start + size], str(start + size), start + size < len(oids), branch)
+
+    client.graphql = graphql
+    client.get_with_cache = lambda url, use_cache=True, **kw: (
+        {"default_branch": "main"} if url.endswith("/o/r") else {"merge_base_commit": {"sha": "m2"}}
+    )
+    heads = {}
+    commits, _ = client.graphql_commit_history("o", "r", page_size=2, branches=["feature", "hotfix"], heads=heads)
+
+    assert sorted(c["oid"] for c in commits) == ["f1", "f2", "h1", "m1", "m2", "m3"]
+    # Each branch stops at its first page holding a default-branch commit
+    assert [c for c in calls if c[0] == "feature"] == [("feature", None), ("feature", "2")]
+    assert [c for c in calls if c[0] == "hotfix"] == [("hotfix", None)]
+    assert heads["feature"]["oid"] == "f2" and heads[""]["oid"] == "m3"
+
+
+def test_graphql_repository_tree_walks_levels_in_batches(tmp_path):
+    """Testa a árvore via GraphQL por níveis, com vários diretórios por requisição e sem limite"""
+    import re
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    client.tree_batch_max_dirs = 10
+    # 30 top-level directories, each with one file and one subdirectory holding a file
+    dirs = {"": [("tree", f"d{i}") for i in range(30)] + [("blob", "README.md")]}
+    for i in range(30):
+        dirs[f"d{i}"] = [("blob", f"d{i}/a.py"), ("tree", f"d{i}/sub")]
+        dirs[f"d{i}/sub"] = [("blob", f"d{i}/sub/b.py")]
+    requests_per_level = []
+
+    def graphql(query, variables, use_cache=True, timeout=4, allow_partial=False):
+        aliases = re.findall(r'(d\d+): object\(expression: "main:([^"]*)"\)', query)
+        requests_per_level.append(len(aliases))
+        repository = {}
+        for alias, path in aliases:
+            repository[alias] = {"entries": [
+                {"name": p.rsplit("/", 1)[-1], "path": p, "type": t, "extension": ".py",
+                 "object": {"byteSize": 1, "isBinary": False, "oid": p} if t == "blob" else {}}
+                for t, p in dirs[path]
+            ]}
+        return {"data": {"repository": repository}}
+
+    client.graphql = graphql
+    result = client.graphql_repository_tree("o", "r", branch="main")
+
+    def count(nodes):
+        return sum(1 + count(n.get("children", [])) for n in nodes)
+
+    assert count(result["tree"]) == 1 + 30 * 4  # README + (dir, file, subdir, file) per directory
+    assert len(requests_per_level) == 1 + 3 + 3  # root, then 30 directories per level in batches of 10
+    assert max(requests_per_level) == 10
+
+
+def test_get_repository_tree_completes_truncated_subtrees(tmp_path):
+    """Testa que a árvore truncada é completada com subárvores por SHA, sem GraphQL"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    base = "https://api.github.com/repos/o/r"
+    responses = {
+        f"{base}/branches/main": {"commit": {"sha": "c0"}},
+        # Listing cut right after "b": b's content and the root's r.md are missing
+        f"{base}/git/trees/c0?recursive=1": {"truncated": True, "tree": [
+            {"path": "a", "type": "tree", "sha": "ta"},
+            {"path": "a/x.py", "type": "blob", "sha": "bx", "size": 1},
+            {"path": "a/y.py", "type": "blob", "sha": "by", "size": 1},
+            {"path": "b", "type": "tree", "sha": "tb"},
+        ]},
+        f"{base}/git/trees/c0": {"tree": [
+            {"path": "a", "type": "tree", "sha": "ta"},
+            {"path": "b", "type": "tree", "sha": "tb"},
+            {"path": "r.md", "type": "blob", "sha": "br", "size": 1},
+        ]},
+        f"{base}/git/trees/tb": {"tree": [{"path": "c", "type": "tree", "sha": "tc"}]},
+        f"{base}/git/trees/tb?recursive=1": {"truncated": False, "tree": [
+            {"path": "c", "type": "tree", "sha": "tc"},
+            {"path": "c/z.py", "type": "blob", "sha": "bz", "size": 1},
+        ]},
+        f"{base}/git/trees/tc?recursive=1": {"truncated": False, "tree": [
+            {"path": "z.py", "type": "blob", "sha": "bz", "size": 1},
+        ]},
+    }
+    requested = []
+
+    def get_with_cache(url, use_cache=True, **kwargs):
+        requested.append(url)
+        return responses.get(url)
+
+    client.get_with_cache = get_with_cache
+    client.graphql = Mock(side_effect=AssertionError("GraphQL fallback should not run"))
+    result = client.get_repository_tree("o", "r", branch="main")
+
+    assert result["truncated"] is False
+    assert result["method"] == "rest_subtrees"
+    assert sorted(n["path"] for n in result["tree"]) == ["a", "a/x.py", "a/y.py", "b", "b/c", "b/c/z.py", "r.md"]
+    assert f"{base}/git/trees/ta?recursive=1" not in requested  # complete subtree is kept
+    # "b" was cut with no children: fetched whole once, never relisted, and "b/c" not fetched again
+    assert f"{base}/git/trees/tb" not in requested
+    assert f"{base}/git/trees/tc?recursive=1" not in requested
+    assert len(requested) == len(set(requested))
+
+
+def test_update_repository_tree_fetches_only_changed_subtrees(tmp_path):
+    """Testa que a atualização reaproveita diretórios com o mesmo SHA e desce só nos alterados"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    base = "https://api.github.com/repos/o/r"
+    previous = {"sha": "c0", "method": "rest", "tree": [
+        client._standardize_tree_node(item) for item in [
+            {"path": "a", "type": "tree", "sha": "ta"},
+            {"path": "a/x.py", "type": "blob", "sha": "bx", "size": 1},
+            {"path": "b", "type": "tree", "sha": "tb"},
+            {"path": "b/old.py", "type": "blob", "sha": "bo", "size": 1},
+            {"path": "r.md", "type": "blob", "sha": "br", "size": 1},
+        ]
+    ]}
+    responses = {
+        # "a" unchanged, "b" changed, "n" is new
+        f"{base}/git/trees/c1": {"tree": [
+            {"path": "a", "type": "tree", "sha": "ta"},
+            {"path": "b", "type": "tree", "sha": "tb2"},
+            {"path": "n", "type": "tree", "sha": "tn"},
+            {"path": "r.md", "type": "blob", "sha": "br", "size": 1},
+        ]},
+        f"{base}/git/trees/tb2": {"tree": [{"path": "new.py", "type": "blob", "sha": "bn", "size": 2}]},
+        f"{base}/git/trees/tn?recursive=1": {"truncated": False, "tree": [
+            {"path": "m", "type": "tree", "sha": "tm"},
+            {"path": "m/z.py", "type": "blob", "sha": "bz", "size": 1},
+        ]},
+    }
+    requested = []
+
+    def get_with_cache(url, use_cache=True, **kwargs):
+        requested.append(url)
+        return responses.get(url)
+
+    client.get_with_cache = get_with_cache
+    result = client.update_repository_tree("o", "r", "main", previous, head_sha="c1")
+
+    assert result["sha"] == "c1"
+    assert result["method"] == "rest_incremental"
+    assert [n["path"] for n in result["tree"]] == ["a", "a/x.py", "b", "b/new.py", "n", "n/m", "n/m/z.py", "r.md"]
+    assert sorted(requested) == sorted(responses)  # nothing under "a" is fetched
+
+    # Same head: the previous structure is returned without any request
+    requested.clear()
+    assert client.update_repository_tree("o", "r", "main", previous, head_sha="c0") is previous
+    assert requested == []
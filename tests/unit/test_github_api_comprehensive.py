@@ -60,7 +60,7 @@ class TestGraphQLCommitHistory:
         client = GitHubAPIClient("test_token")
         
         call_count = [0]
-        def mock_graphql(query, variables, use_cache, timeout):
+        def mock_graphql(query, variables, use_cache, timeout, **kwargs):
             call_count[0] += 1
             
             # First call is for default branch
@@ -127,7 +127,7 @@ class TestGraphQLCommitHistory:
         client = GitHubAPIClient("test_token")
         
         graphql_calls = [0]
-        def mock_graphql(query, variables, use_cache, timeout):
+        def mock_graphql(query, variables, use_cache, timeout, allow_partial=False, **kwargs):
             graphql_calls[0] += 1
             return None  # Simulate GraphQL failure
         
@@ -165,9 +165,10 @@ class TestGraphQLCommitHistory:
     def test_time_range_splitting(self, monkeypatch):
         """Test splitting extraction into time chunks"""
         client = GitHubAPIClient("test_token")
+        client.history_window_max_commits = None  # equal chunks, no density probes
         
         graphql_calls = [0]
-        def mock_graphql(query, variables, use_cache, timeout):
+        def mock_graphql(query, variables, use_cache, timeout, **kwargs):
             graphql_calls[0] += 1
             return {
                 "data": {
@@ -203,7 +204,7 @@ class TestGraphQLCommitHistory:
         """Test when branch doesn't exist"""
         client = GitHubAPIClient("test_token")
         
-        def mock_graphql(query, variables, use_cache, timeout):
+        def mock_graphql(query, variables, use_cache, timeout, **kwargs):
             return {
                 "data": {
                     "repository": {}  # No ref data
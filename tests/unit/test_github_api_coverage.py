@@ -16,7 +16,7 @@ class TestGetWithCacheErrorPaths:
         """Test that silent=True suppresses output"""
         client = GitHubAPIClient(token="test_token", cache_dir=str(tmp_path))
         
-        with patch('requests.get') as mock_get:
+        with patch.object(client.session, 'get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"test": "data"}
@@ -31,7 +31,7 @@ class TestGetWithCacheErrorPaths:
         """Test return_headers=True returns tuple with headers"""
         client = GitHubAPIClient(token="test_token", cache_dir=str(tmp_path))
         
-        with patch('requests.get') as mock_get:
+        with patch.object(client.session, 'get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"data": "value"}
@@ -49,7 +49,7 @@ class TestGetWithCacheErrorPaths:
         """Test 403 response with rate limit message"""
         client = GitHubAPIClient(token="test_token", cache_dir=str(tmp_path))
         
-        with patch('requests.get') as mock_get:
+        with patch.object(client.session, 'get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 403
             mock_response.text = "API rate limit exceeded"
@@ -67,7 +67,7 @@ class TestGetWithCacheErrorPaths:
         """Test 403 response without rate limit (private resource)"""
         client = GitHubAPIClient(token="test_token", cache_dir=str(tmp_path))
         
-        with patch('requests.get') as mock_get:
+        with patch.object(client.session, 'get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 403
             mock_response.text = "Resource private or forbidden"
@@ -84,7 +84,7 @@ class TestGetWithCacheErrorPaths:
         """Test 500 error triggers retry with exponential backoff"""
         client = GitHubAPIClient(token="test_token", cache_dir=str(tmp_path))
         
-        with patch('requests.get') as mock_get:
+        with patch.object(client.session, 'get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 500
             mock_response.text = "Internal Server Error"
@@ -101,7 +101,7 @@ class TestGetWithCacheErrorPaths:
         """Test timeout exception triggers retry"""
         client = GitHubAPIClient(token="test_token", cache_dir=str(tmp_path))
         
-        with patch('requests.get') as mock_get:
+        with patch.object(client.session, 'get') as mock_get:
             mock_get.side_effect = requests.exceptions.Timeout("Connection timeout")
             
             with patch('time.sleep'):  # Don't actually sleep
@@ -114,7 +114,7 @@ class TestGetWithCacheErrorPaths:
         """Test generic RequestException is caught"""
         client = GitHubAPIClient(token="test_token", cache_dir=str(tmp_path))
         
-        with patch('requests.get') as mock_get:
+        with patch.object(client.session, 'get') as mock_get:
             mock_get.side_effect = requests.exceptions.RequestException("Connection error")
             
             result = client.get_with_cache("https://api.github.com/test", use_cache=False)
@@ -128,7 +128,7 @@ class TestGetWithCacheErrorPaths:
         """Test exhausted retries message"""
         client = GitHubAPIClient(token="test_token", cache_dir=str(tmp_path))
         
-        with patch('requests.get') as mock_get:
+        with patch.object(client.session, 'get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 502
             mock_response.text = "Bad Gateway"
@@ -149,7 +149,7 @@ class TestGraphQLErrorPaths:
         """Test GraphQL 403 with rate limit"""
         client = GitHubAPIClient(token="test_token", cache_dir=str(tmp_path))
         
-        with patch('requests.post') as mock_post:
+        with patch.object(client.session, 'post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 403
             mock_response.text = "rate limit exceeded"
@@ -165,7 +165,7 @@ class TestGraphQLErrorPaths:
         """Test GraphQL 403 without rate limit"""
         client = GitHubAPIClient(token="test_token", cache_dir=str(tmp_path))
         
-        with patch('requests.post') as mock_post:
+        with patch.object(client.session, 'post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 403
             mock_response.text = "Forbidden"
@@ -181,7 +181,7 @@ class TestGraphQLErrorPaths:
         """Test GraphQL 502 error"""
         client = GitHubAPIClient(token="test_token", cache_dir=str(tmp_path))
         
-        with patch('requests.post') as mock_post:
+        with patch.object(client.session, 'post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 502
             mock_response.text = "Bad Gateway"
@@ -198,7 +198,7 @@ class TestGraphQLErrorPaths:
         client = GitHubAPIClient(token="test_token", cache_dir=str(tmp_path))
         
         for status in [500, 503]:
-            with patch('requests.post') as mock_post:
+            with patch.object(client.session, 'post') as mock_post:
                 mock_response = Mock()
                 mock_response.status_code = status
                 mock_response.text = "Server Error"
@@ -214,7 +214,7 @@ class TestGraphQLErrorPaths:
         """Test GraphQL timeout exception"""
         client = GitHubAPIClient(token="test_token", cache_dir=str(tmp_path))
         
-        with patch('requests.post') as mock_post:
+        with patch.object(client.session, 'post') as mock_post:
             mock_post.side_effect = requests.exceptions.Timeout("Timeout")
             
             result = client.graphql("query { viewer { login } }", use_cache=False)
@@ -227,7 +227,7 @@ class TestGraphQLErrorPaths:
         """Test GraphQL generic request exception"""
         client = GitHubAPIClient(token="test_token", cache_dir=str(tmp_path))
         
-        with patch('requests.post') as mock_post:
+        with patch.object(client.session, 'post') as mock_post:
             mock_post.side_effect = requests.exceptions.RequestException("Connection error")
             
             result = client.graphql("query { viewer { login } }", use_cache=False)
@@ -240,7 +240,7 @@ class TestGraphQLErrorPaths:
         """Test GraphQL other unexpected status codes"""
         client = GitHubAPIClient(token="test_token", cache_dir=str(tmp_path))
         
-        with patch('requests.post') as mock_post:
+        with patch.object(client.session, 'post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 400
             mock_response.text = "Bad Request"
@@ -260,7 +260,7 @@ class TestGraphQLErrorPaths:
         class NonSerializable:
             pass
         
-        with patch('requests.post') as mock_post:
+        with patch.object(client.session, 'post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"data": {"viewer": {"login": "test"}}}
@@ -17,7 +17,7 @@ class TestGetWithCacheErrorPaths:
         def mock_get(*args, **kwargs):
             raise requests.exceptions.RequestException("Network error")
         
-        monkeypatch.setattr(requests, "get", mock_get)
+        monkeypatch.setattr(client.session, "get", mock_get)
         
         result = client.get_with_cache("https://api.github.com/test", use_cache=False)
         assert result is None
@@ -33,7 +33,7 @@ class TestGetWithCacheErrorPaths:
         def mock_get(*args, **kwargs):
             return mock_response
         
-        monkeypatch.setattr(requests, "get", mock_get)
+        monkeypatch.setattr(client.session, "get", mock_get)
         
         result = client.get_with_cache("https://api.github.com/test", use_cache=False, silent=True)
         assert result is None
@@ -51,7 +51,7 @@ class TestGetWithCacheErrorPaths:
             call_count[0] += 1
             return mock_response
         
-        monkeypatch.setattr(requests, "get", mock_get)
+        monkeypatch.setattr(client.session, "get", mock_get)
         
         result = client.get_with_cache("https://api.github.com/test", use_cache=False, retries=2, backoff_base=0.01)
         assert result is None
@@ -68,7 +68,7 @@ class TestGetWithCacheErrorPaths:
         def mock_get(*args, **kwargs):
             return mock_response
         
-        monkeypatch.setattr(requests, "get", mock_get)
+        monkeypatch.setattr(client.session, "get", mock_get)
         
         result = client.get_with_cache("https://api.github.com/test", use_cache=False, silent=True)
         assert result is None
@@ -91,7 +91,7 @@ class TestGraphQLErrorPaths:
         def mock_post(*args, **kwargs):
             return mock_response
         
-        monkeypatch.setattr(requests, "post", mock_post)
+        monkeypatch.setattr(client.session, "post", mock_post)
         
         # Should handle serialization error gracefully
         result = client.graphql("query { test }", variables=variables, use_cache=True)
@@ -116,7 +116,7 @@ class TestGraphQLErrorPaths:
         def mock_post(*args, **kwargs):
             return mock_response
         
-        monkeypatch.setattr(requests, "post", mock_post)
+        monkeypatch.setattr(client.session, "post", mock_post)
         
         result = client.graphql("query { test }")
         assert result is None
@@ -139,7 +139,7 @@ class TestGraphQLErrorPaths:
         def mock_post(*args, **kwargs):
             return mock_response
         
-        monkeypatch.setattr(requests, "post", mock_post)
+        monkeypatch.setattr(client.session, "post", mock_post)
         
         result = client.graphql("query { test }")
         assert result is None
@@ -155,7 +155,7 @@ class TestGraphQLErrorPaths:
         def mock_post(*args, **kwargs):
             return mock_response
         
-        monkeypatch.setattr(requests, "post", mock_post)
+        monkeypatch.setattr(client.session, "post", mock_post)
         
         result = client.graphql("query { test }")
         assert result is None
@@ -171,7 +171,7 @@ class TestGraphQLErrorPaths:
         def mock_post(*args, **kwargs):
             return mock_response
         
-        monkeypatch.setattr(requests, "post", mock_post)
+        monkeypatch.setattr(client.session, "post", mock_post)
         
         result = client.graphql("query { test }")
         assert result is None
@@ -187,7 +187,7 @@ class TestGraphQLErrorPaths:
         def mock_post(*args, **kwargs):
             return mock_response
         
-        monkeypatch.setattr(requests, "post", mock_post)
+        monkeypatch.setattr(client.session, "post", mock_post)
         
         result = client.graphql("query { test }")
         assert result is None
@@ -203,7 +203,7 @@ class TestGraphQLErrorPaths:
         def mock_post(*args, **kwargs):
             return mock_response
         
-        monkeypatch.setattr(requests, "post", mock_post)
+        monkeypatch.setattr(client.session, "post", mock_post)
         
         result = client.graphql("query { test }")
         assert result is None
@@ -215,7 +215,7 @@ class TestGraphQLErrorPaths:
         def mock_post(*args, **kwargs):
             raise requests.exceptions.RequestException("Connection error")
         
-        monkeypatch.setattr(requests, "post", mock_post)
+        monkeypatch.setattr(client.session, "post", mock_post)
         
         result = client.graphql("query { test }")
         assert result is None
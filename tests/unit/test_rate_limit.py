@@ -0,0 +1,245 @@
+"""
+Unit tests for src/utils/rate_limit.py
+"""
+import time
+from unittest.mock import Mock, patch
+
+from utils.rate_limit import AdaptivePageSize, RateLimitGovernor
+from utils.github_api import GitHubAPIClient
+
+
+class TestRateLimitGovernor:
+    """Testes para RateLimitGovernor"""
+
+    def test_no_wait_when_quota_unknown_or_plentiful(self):
+        """Testa que não há espera sem informação de quota ou com quota alta"""
+        governor = RateLimitGovernor()
+        assert governor.reserve("core") == 0
+
+        governor.update_from_headers({
+            "X-RateLimit-Remaining": "4000",
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Reset": str(int(time.time()) + 3600),
+        })
+        assert governor.reserve("core") == 0
+        assert governor.metrics()["core"]["remaining"] == 3999
+
+    def test_paces_evenly_until_reset_when_low(self):
+        """Testa que requisições são espaçadas até o reset quando a quota está baixa"""
+        governor = RateLimitGovernor(pace_threshold=0.2)
+        governor.update_from_headers({
+            "X-RateLimit-Remaining": "100",
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Reset": str(int(time.time()) + 100),
+        })
+
+        first = governor.reserve("core")
+        second = governor.reserve("core")
+        third = governor.reserve("core")
+
+        assert first == 0
+        # ~100s / 99 tokens restantes ≈ 1s entre requisições
+        assert 0.5 < second < 1.5
+        assert second < third < 3.0
+        assert governor.metrics()["core"]["pacing"] is True
+
+    def test_paces_across_whole_window_by_default(self):
+        """Testa que, por padrão, a quota restante é distribuída por toda a janela"""
+        governor = RateLimitGovernor()
+        governor.update_from_headers({
+            "X-RateLimit-Remaining": "4000",
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Reset": str(int(time.time()) + 400),
+        })
+
+        assert governor.reserve("core") == 0
+        # ~400s / 3999 tokens restantes ≈ 0.1s entre requisições
+        assert 0.05 < governor.reserve("core") < 0.15
+        assert governor.metrics()["core"]["pacing"] is True
+
+    def test_waits_for_reset_when_exhausted(self):
+        """Testa espera até o reset quando a quota acaba"""
+        governor = RateLimitGovernor()
+        governor.update_from_headers({
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Reset": str(int(time.time()) + 30),
+        })
+        wait = governor.reserve("core")
+        assert 29 <= wait <= 32
+
+    def test_retry_after_blocks_resource(self):
+        """Testa que Retry-After bloqueia apenas o recurso afetado"""
+        governor = RateLimitGovernor()
+        blocked = governor.penalize("core", {"Retry-After": "5"})
+
+        assert 4 <= blocked <= 5
+        assert 4 <= governor.reserve("core") <= 5
+        assert governor.reserve("graphql") == 0
+
+    def test_penalize_without_headers_uses_default(self):
+        """Testa penalidade padrão sem cabeçalhos de rate limit"""
+        governor = RateLimitGovernor(default_penalty=60)
+        assert 59 <= governor.penalize("core", None) <= 60
+
+    def test_graphql_rate_limit_block(self):
+        """Testa leitura do bloco rateLimit do GraphQL"""
+        governor = RateLimitGovernor()
+        governor.update_from_graphql({
+            "remaining": 3,
+            "limit": 5000,
+            "cost": 2,
+            "resetAt": "2999-01-01T00:00:00Z",
+        })
+
+        assert governor.reserve("graphql") == 0
+        snapshot = governor.metrics()["graphql"]
+        assert snapshot["last_cost"] == 2
+        assert snapshot["remaining"] == 1
+        # Next query (cost 2) no longer fits in the bucket: wait for resetAt
+        assert governor.reserve("graphql") > 3600
+
+    def test_header_resource_overrides_default(self):
+        """Testa que X-RateLimit-Resource direciona para o bucket correto"""
+        governor = RateLimitGovernor()
+        governor.update_from_headers({"X-RateLimit-Resource": "search", "X-RateLimit-Remaining": "9", "X-RateLimit-Limit": "30"})
+        assert governor.metrics()["search"]["remaining"] == 9
+
+    def test_ignores_malformed_headers(self):
+        """Testa que cabeçalhos inválidos são ignorados"""
+        governor = RateLimitGovernor()
+        governor.update_from_headers(Mock())
+        governor.update_from_headers(None)
+        assert governor.reserve("core") == 0
+
+    @patch('utils.rate_limit.time.sleep')
+    def test_acquire_sleeps_reserved_time(self, mock_sleep):
+        """Testa que acquire dorme o tempo reservado"""
+        governor = RateLimitGovernor()
+        governor.penalize("core", {"Retry-After": "3"})
+        governor.acquire("core")
+        assert mock_sleep.call_count == 1
+        assert 2 <= mock_sleep.call_args[0][0] <= 3
+
+
+class TestClientGovernorIntegration:
+    """Testes da integração do governor com GitHubAPIClient"""
+
+    def test_rest_headers_update_governor(self, tmp_path):
+        """Testa que cabeçalhos REST alimentam o governor"""
+        client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+        response = Mock(status_code=200, headers={"X-RateLimit-Remaining": "42", "X-RateLimit-Limit": "5000"})
+        response.json.return_value = {"ok": True}
+
+        with patch.object(client.session, 'get', return_value=response):
+            client.get_with_cache("https://api.github.com/x", use_cache=False, silent=True)
+
+        assert client.rate_governor.metrics()["core"]["remaining"] == 42
+
+    def test_graphql_rate_limit_updates_governor(self, tmp_path):
+        """Testa que o bloco rateLimit do GraphQL alimenta o governor"""
+        client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+        response = Mock(status_code=200, headers={})
+        response.json.return_value = {"data": {"rateLimit": {"remaining": 4321, "limit": 5000, "cost": 1, "resetAt": "2999-01-01T00:00:00Z"}}}
+
+        with patch.object(client.session, 'post', return_value=response):
+            client.graphql("query { rateLimit { remaining } }", use_cache=False)
+
+        assert client.rate_governor.metrics()["graphql"]["remaining"] == 4321
+
+    @patch('utils.rate_limit.time.sleep')
+    def test_rate_limited_403_retries_after_governor_wait(self, mock_sleep, tmp_path):
+        """Testa que 403 por rate limit espera pelo governor e tenta novamente"""
+        client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+        limited = Mock(status_code=403, text="API rate limit exceeded", headers={"Retry-After": "7"})
+        ok = Mock(status_code=200, headers={})
+        ok.json.return_value = {"ok": True}
+
+        with patch.object(client.session, 'get', side_effect=[limited, ok]):
+            result = client.get_with_cache("https://api.github.com/x", use_cache=False, silent=True)
+
+        assert result == {"ok": True}
+        assert 6 <= mock_sleep.call_args[0][0] <= 7
+
+
+def test_adaptive_page_size_grows_and_halves():
+    """Testa aumento aditivo em respostas rápidas e redução multiplicativa em falhas"""
+    pager = AdaptivePageSize(50, step=10, fast_seconds=5.0)
+    assert pager.success(1.0) == 60
+    assert pager.success(20.0) == 60  # slow page: no growth
+    for _ in range(10):
+        pager.success(0.5)
+    assert pager.size == 100
+
+    assert pager.failure() is False and pager.size == 50
+    assert pager.failure() is False and pager.size == 25
+    assert pager.failure() is False and pager.size == 12
+    assert pager.failure() is False and pager.size == 10
+    assert pager.failure() is True  # already at the minimum
+
+
+def test_commit_history_shrinks_page_before_rest_fallback(tmp_path):
+    """Testa que falhas reduzem a página em vez de ir direto para o REST"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    sizes = []
+
+    def graphql(query, variables, use_cache=True, timeout=4, **kwargs):
+        sizes.append(variables["pageSize"])
+        if variables["pageSize"] > 20:
+            return None  # heavy page times out
+        return {"data": {"repository": {"defaultBranchRef": {"target": {"history": {
+            "pageInfo": {"hasNextPage": False, "endCursor": None},
+            "nodes": [{"oid": "a", "additions": 1, "deletions": 1}],
+        }}}}}}
+
+    client.graphql = graphql
+    client.get_with_cache = Mock(side_effect=AssertionError("REST fallback should not run"))
+    commits, _ = client.graphql_commit_history("o", "r", page_size=50)
+
+    assert sizes == [50, 25, 12]
+    assert [c["oid"] for c in commits] == ["a"]
+
+
+def test_commit_history_rate_limit_does_not_shrink_page(tmp_path):
+    """Testa que rate limit (não sobrecarga) vai para o REST sem reduzir a página"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    sizes = []
+
+    def graphql(query, variables, use_cache=True, timeout=4, outcome=None, **kwargs):
+        sizes.append(variables["pageSize"])
+        outcome["failure"] = "rate_limited"
+        return None
+
+    client.graphql = graphql
+    client.get_with_cache = Mock(return_value=[])
+    client.graphql_commit_history("o", "r", page_size=50)
+
+    assert sizes == [50]
+    assert "/repos/o/r/commits" in client.get_with_cache.call_args[0][0]
+
+
+def test_commit_history_rerun_replays_cached_pages(tmp_path):
+    """Testa que uma nova execução com cache não muda o tamanho da página nem perde o cache"""
+    client = GitHubAPIClient(token="test", cache_dir=str(tmp_path))
+    posted = []
+
+    def post(payload, cache_key, timeout, allow_partial=False, outcome=None):
+        variables = payload["variables"]
+        posted.append(variables["pageSize"])
+        start = int(variables["cursor"] or 0)
+        data = {"data": {"repository": {"defaultBranchRef": {"target": {"history": {
+            "pageInfo": {"hasNextPage": start < 200, "endCursor": str(start + variables["pageSize"])},
+            "nodes": [{"oid": f"c{start + i}", "additions": 1, "deletions": 1} for i in range(variables["pageSize"])],
+        }}}}}}
+        if cache_key:
+            client._cache_set(cache_key, data)
+        return data
+
+    client._post_graphql = post
+    first, _ = client.graphql_commit_history("o", "r", page_size=50)
+    assert posted[:2] == [50, 60]  # fast round trips grow the page
+
+    posted.clear()
+    again, _ = client.graphql_commit_history("o", "r", page_size=50)
+    assert posted == []  # every page served from cache
+    assert [c["oid"] for c in again] == [c["oid"] for c in first]
@@ -62,6 +62,17 @@ class TestScanDataDirectory:
                 assert len(result) == 1
                 assert result[0].endswith('data.json')
     
+    def test_scan_skips_extraction_state(self, tmp_path):
+        """Testa que os arquivos de estado da extração incremental (_state) não são listados"""
+        (tmp_path / "_state").mkdir()
+        (tmp_path / "_state" / "commits.json").write_text("{}")
+        (tmp_path / "_state" / "issues.json").write_text("{}")
+        (tmp_path / "commits_repo1.json").write_text("[]")
+        
+        result = scan_data_directory(str(tmp_path))
+        
+        assert result == [str(tmp_path / "commits_repo1.json")]
+    
     def test_scan_empty_directory(self):
         """Testa que retorna lista vazia para diretório vazio"""
         with patch('os.path.exists', return_value=True):
@@ -1,6 +1,6 @@
 import json
 import os
-from utils.github_api import save_json_data, load_json_data
+from utils.github_api import JsonSpool, save_json_data, save_json_files, load_json_data
 
 def test_save_json_data_list_metadata(tmp_path):
     file = tmp_path / "data.json"
@@ -17,4 +17,53 @@ def test_save_json_data_dict_metadata(tmp_path):
     save_json_data({"a": 1}, str(file))
     data = load_json_data(str(file))
     assert data.get("_metadata")
-    assert data["a"] == 1
\ No newline at end of file
+    assert data["a"] == 1
+
+def test_save_json_data_spool_matches_list_output(tmp_path):
+    records = [{"a": 1, "nested": {"b": [1, 2]}}, {"text": "linha\nnova ç"}]
+    spool = JsonSpool()
+    spool.extend(records)
+    assert len(spool) == 2
+    assert spool[1] == records[1]
+    assert list(spool) == records
+
+    spool_file = tmp_path / "spool.json"
+    list_file = tmp_path / "list.json"
+    save_json_data(spool, str(spool_file), timestamp=False)
+    save_json_data(list(records), str(list_file), timestamp=False)
+    assert spool_file.read_text(encoding="utf-8") == list_file.read_text(encoding="utf-8")
+    spool.close()
+
+def test_save_json_data_spool_metadata_and_empty(tmp_path):
+    spool = JsonSpool()
+    spool.append({"a": 1})
+    file = tmp_path / "spool.json"
+    save_json_data(spool, str(file))
+    data = load_json_data(str(file))
+    assert data[0]["_metadata"]["record_count"] == 1
+    assert data[1] == {"a": 1}
+
+    empty = tmp_path / "empty.json"
+    save_json_data(JsonSpool(), str(empty))
+    assert load_json_data(str(empty)) == []
+
+def test_json_spool_context_manager_closes_file():
+    with JsonSpool() as spool:
+        spool.append({"a": 1})
+        assert list(spool) == [{"a": 1}]
+    assert spool._file.closed
+
+def test_save_json_files_matches_save_json_data(tmp_path):
+    files = {
+        str(tmp_path / "batch" / "repo_a.json"): {"name": "a"},
+        str(tmp_path / "batch" / "repo_b.json"): [{"name": "b"}],
+    }
+    written = save_json_files(files)
+    assert written == list(files)
+    for path, data in files.items():
+        single = tmp_path / "single.json"
+        save_json_data(data, str(single), timestamp=False)
+        saved = load_json_data(path)
+        metadata = saved.pop("_metadata") if isinstance(saved, dict) else saved.pop(0)["_metadata"]
+        assert metadata["file_path"] == path
+        assert saved == json.loads(single.read_text(encoding="utf-8"))
@@ -0,0 +1,105 @@
+"""
+Unit tests for src/utils/scheduler.py
+"""
+import threading
+import time
+
+import pytest
+
+from utils.scheduler import RepoScheduler, fanout_scheduler
+
+
+def test_map_keeps_input_order_and_queues_largest_first():
+    """Testa que resultados saem na ordem de entrada e os repositórios maiores começam primeiro"""
+    scheduler = RepoScheduler(max_workers=1)
+    repos = [{"name": "small", "size": 1}, {"name": "huge", "size": 900}, {"name": "medium", "size": 50}]
+    assert list(scheduler.map(lambda r: r["name"], repos)) == ["small", "huge", "medium"]
+
+    started = []
+    gate = threading.Event()
+    scheduler = RepoScheduler(max_workers=2)
+
+    def task(repo):
+        started.append(repo["name"])
+        gate.wait(1)
+        return repo["name"]
+
+    results = scheduler.map(task, repos)
+    first = next(results)  # blocks until "small" is done
+    gate.set()
+    assert [first] + list(results) == ["small", "huge", "medium"]
+    assert started[0] == "huge"
+    scheduler.shutdown()
+
+
+def test_map_runs_repositories_concurrently():
+    """Testa que um repositório lento não bloqueia os demais"""
+    scheduler = RepoScheduler(max_workers=4)
+    done = []
+
+    def task(repo):
+        time.sleep(0.3 if repo["name"] == "slow" else 0)
+        done.append(repo["name"])
+        return repo["name"]
+
+    repos = [{"name": "slow"}] + [{"name": f"r{i}"} for i in range(6)]
+    assert list(scheduler.map(task, repos))[0] == "slow"
+    assert done[-1] == "slow"  # every small repository finished first
+    scheduler.shutdown()
+
+
+def test_map_and_run_propagate_errors():
+    """Testa que exceções das tarefas chegam a quem consome os resultados"""
+    scheduler = RepoScheduler(max_workers=2)
+
+    def task(repo):
+        if repo["name"] == "bad":
+            raise RuntimeError("API Error")
+        return repo["name"]
+
+    with pytest.raises(RuntimeError):
+        list(scheduler.map(task, [{"name": "ok"}, {"name": "bad"}]))
+
+    future = scheduler.run(lambda: list(scheduler.map(task, [{"name": "bad"}])))
+    with pytest.raises(RuntimeError):
+        future.result(timeout=5)
+    scheduler.shutdown()
+
+
+def test_fanout_scheduler_reuses_wide_scheduler_or_owns_a_pool():
+    """Testa que o fan-out usa o scheduler compartilhado só se for largo o bastante"""
+    shared = RepoScheduler(max_workers=8)
+    with fanout_scheduler(shared, 4) as scheduler:
+        assert scheduler is shared
+
+    with fanout_scheduler(RepoScheduler(max_workers=1), 4) as scheduler:
+        assert scheduler.max_workers == 4
+        assert sorted(scheduler.map(lambda repo: repo["name"], [{"name": "a"}, {"name": "b"}])) == ["a", "b"]
+    assert scheduler._executor is None  # own pool is shut down on exit
+    shared.shutdown()
+
+
+def test_map_window_bounds_pending_results():
+    """Testa que com window no máximo esse número de tarefas fica pendente de consumo"""
+    scheduler = RepoScheduler(max_workers=4)
+    lock = threading.Lock()
+    pending = []
+    peak = [0]
+
+    def task(repo):
+        with lock:
+            pending.append(repo["name"])
+            peak[0] = max(peak[0], len(pending))
+        return repo["name"]
+
+    repos = [{"name": f"r{i}", "size": i} for i in range(20)]
+    results = []
+    for name in scheduler.map(task, repos, window=3):
+        time.sleep(0.01)  # consumidor lento: as tarefas terminadas esperam por ele
+        with lock:
+            pending.remove(name)
+        results.append(name)
+
+    assert results == [f"r{i}" for i in range(20)]
+    assert peak[0] <= 3
+    scheduler.shutdown()
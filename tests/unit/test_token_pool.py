@@ -0,0 +1,134 @@
+"""
+Unit tests for src/utils/token_pool.py
+"""
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+from utils.token_pool import TokenPool, load_tokens
+from utils.github_api import GitHubAPIClient
+
+
+def _headers(remaining, limit=5000, reset_in=3600):
+    return {
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Reset": str(int(time.time()) + reset_in),
+    }
+
+
+class TestTokenPool:
+    """Testes para TokenPool"""
+
+    def test_routes_to_token_with_most_remaining_quota(self):
+        """Testa que a requisição vai para o token com mais quota"""
+        pool = TokenPool(["a", "b", "c"])
+        pool.governor("a").update_from_headers(_headers(100))
+        pool.governor("b").update_from_headers(_headers(4000))
+        pool.governor("c").update_from_headers(_headers(2500))
+
+        assert pool.select("core") == "b"
+
+    def test_unknown_quota_counts_as_full(self):
+        """Testa que tokens ainda não usados são preferidos"""
+        pool = TokenPool(["a", "b"])
+        pool.governor("a").update_from_headers(_headers(4999))
+        assert pool.select("core") == "b"
+
+    def test_fails_over_when_token_is_rate_limited(self):
+        """Testa failover quando um token é bloqueado"""
+        pool = TokenPool(["a", "b"])
+        pool.governor("a").update_from_headers(_headers(4000))
+        pool.governor("b").update_from_headers(_headers(3000))
+        pool.governor("a").penalize("core", {"Retry-After": "60"})
+
+        token, wait = pool.reserve("core")
+        assert token == "b"
+        assert wait == 0
+
+    def test_skips_revoked_tokens(self):
+        """Testa que tokens revogados (401) não são mais usados"""
+        pool = TokenPool(["a", "b"])
+        assert pool.mark_revoked("a") is True
+        assert pool.select("core") == "b"
+        assert pool.mark_revoked("b") is False
+        # All revoked: keep using the pool rather than failing locally
+        assert pool.select("core") in ("a", "b")
+
+    def test_requires_a_token(self):
+        """Testa erro sem tokens"""
+        with pytest.raises(ValueError):
+            TokenPool([])
+
+    def test_load_tokens_from_args_env_and_secrets(self, tmp_path, monkeypatch):
+        """Testa coleta de tokens de argumentos, variáveis de ambiente e .secrets"""
+        secrets = tmp_path / ".secrets"
+        secrets.write_text("# tokens\nGITHUB_TOKEN=t-secret\nGEMINI_API_KEY=x\nGITHUB_TOKEN_2=t1\n")
+        for name in ("GITHUB_TOKEN", "GITHUB_TOKENS"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setenv("GITHUB_TOKENS", "t2, t3")
+        monkeypatch.setenv("GITHUB_TOKEN_10", "t10")
+        monkeypatch.setenv("GITHUB_TOKEN_2", "t4")
+
+        tokens = load_tokens("t1,t2", secrets_file=str(secrets))
+
+        assert tokens == ["t1", "t2", "t3", "t4", "t10", "t-secret"]
+
+
+class TestClientTokenPool:
+    """Testes da integração do pool de tokens com GitHubAPIClient"""
+
+    def test_single_token_keeps_primary_headers(self, tmp_path):
+        """Testa compatibilidade com um único token"""
+        client = GitHubAPIClient(token="only", cache_dir=str(tmp_path))
+        assert client.token == "only"
+        assert len(client.token_pool) == 1
+        assert client.rate_governor is client.token_pool.governor("only")
+
+    def test_requests_spread_over_tokens(self, tmp_path):
+        """Testa que as requisições usam o token mais saudável"""
+        client = GitHubAPIClient(token=["t1", "t2"], cache_dir=str(tmp_path))
+        used = []
+
+        def fake_get(url, headers=None, timeout=None):
+            token = headers["Authorization"].split()[-1]
+            used.append(token)
+            response = Mock(status_code=200, headers=_headers(4000 if token == "t1" else 100))
+            response.json.return_value = {"url": url}
+            return response
+
+        with patch.object(client.session, "get", side_effect=fake_get):
+            for i in range(4):
+                client.get_with_cache(f"https://api.github.com/x/{i}", use_cache=False, silent=True)
+
+        # t1 first (primary), t2 next (unknown quota), then t1 (more remaining than t2)
+        assert used == ["t1", "t2", "t1", "t1"]
+
+    def test_revoked_token_fails_over(self, tmp_path):
+        """Testa que 401 marca o token como revogado e repete com outro"""
+        client = GitHubAPIClient(token=["bad", "good"], cache_dir=str(tmp_path))
+        unauthorized = Mock(status_code=401, text="Bad credentials", headers={})
+        ok = Mock(status_code=200, headers={})
+        ok.json.return_value = {"ok": True}
+
+        with patch.object(client.session, "get", side_effect=[unauthorized, ok]) as mock_get:
+            result = client.get_with_cache("https://api.github.com/x", use_cache=False, silent=True)
+
+        assert result == {"ok": True}
+        assert mock_get.call_args_list[1][1]["headers"]["Authorization"] == "Bearer good"
+        assert client.token_pool.metrics()[0]["revoked"] is True
+
+    @patch("utils.rate_limit.time.sleep")
+    def test_rate_limited_token_fails_over_without_waiting(self, mock_sleep, tmp_path):
+        """Testa failover sem espera quando outro token tem quota"""
+        client = GitHubAPIClient(token=["t1", "t2"], cache_dir=str(tmp_path))
+        limited = Mock(status_code=403, text="API rate limit exceeded", headers={"Retry-After": "600"})
+        ok = Mock(status_code=200, headers={})
+        ok.json.return_value = {"ok": True}
+
+        with patch.object(client.session, "get", side_effect=[limited, ok]) as mock_get:
+            result = client.get_with_cache("https://api.github.com/x", use_cache=False, silent=True)
+
+        assert result == {"ok": True}
+        assert mock_get.call_args_list[1][1]["headers"]["Authorization"] == "Bearer t2"
+        mock_sleep.assert_not_called()